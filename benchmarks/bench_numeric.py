@@ -0,0 +1,64 @@
+"""
+Times SineWave/MultiSineWave.data and get_shape through the numeric policy, with
+Fraction and float inputs, against the former Fraction object-array arithmetic.
+
+Run: python -m benchmarks.bench_numeric
+"""
+import timeit
+from fractions import Fraction
+
+import numpy as np
+
+from fourier import numeric
+from fourier.actors import MultiSineWave, SineWave
+from fourier.cache import data_cache
+from fourier.fourier import get_shape
+
+
+def object_array_shape(waves, winding_frequency, a, b, step):
+    """
+    The arithmetic before the numeric policy: Fraction amplitudes and winding
+    frequency multiplied into numpy arrays give object arrays.
+    """
+    l = np.arange(a, b + step, step)
+    y = sum(wave.amplitude * np.sin(wave.angular_velocity * (l + wave.x0) + wave.y0) for wave in waves)
+    omega = 2 * np.pi * winding_frequency
+    return y * np.sin(omega * l), y * np.cos(omega * l)
+
+
+def waves(kind):
+    """
+    Returns: MultiSineWave with Fraction or float parameters.
+    """
+    convert = Fraction if kind == 'fraction' else float
+    return MultiSineWave(SineWave.init_frequency(convert(freq), amplitude=convert(Fraction(1, freq)))
+                         for freq in range(1, 6))
+
+
+def best_ms(func, repeat, number):
+    # the data cache is cleared before every run so that the kernels are really executed
+    return min(timeit.repeat(func, setup=data_cache.clear, repeat=repeat, number=number)) / number * 1000
+
+
+def run(repeat=5, number=1, step=0.001):
+    fraction_waves = waves('fraction')
+    float_waves = waves('float')
+    cases = [
+        ('object arrays', lambda: object_array_shape(fraction_waves, Fraction(5, 2), 0, 10, step)),
+        ('fraction data', lambda: fraction_waves.data(0, 10, step)),
+        ('fraction shape', lambda: get_shape(fraction_waves, Fraction(5, 2), 0, 10, step=step)),
+        ('float64 data', lambda: float_waves.data(0, 10, step)),
+        ('float64 shape', lambda: get_shape(float_waves, 2.5, 0, 10, step=step)),
+    ]
+    for name, func in cases:
+        print("{:<16} {:10.3f} ms".format(name, best_ms(func, repeat, number)))
+
+    numeric.set_default_dtype(np.float32)
+    try:
+        print("{:<16} {:10.3f} ms".format('float32 shape', best_ms(cases[-1][1], repeat, number)))
+    finally:
+        numeric.set_default_dtype(np.float64)
+
+
+if __name__ == '__main__':
+    run()
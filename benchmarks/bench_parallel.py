@@ -0,0 +1,37 @@
+"""
+Scaling of fourier.parallel.parallel_sweep with the number of workers, against the
+serial fourier.sweep.sweep.
+
+Run: python -m benchmarks.bench_parallel [max_workers]
+"""
+import os
+import sys
+import timeit
+
+from fourier.actors import MultiSineWave, SineWave
+from fourier.parallel import executors, parallel_sweep
+from fourier.sweep import frequency_range, sweep
+
+
+def best_ms(func, repeat, number):
+    return min(timeit.repeat(func, repeat=repeat, number=number)) / number * 1000
+
+
+def run(max_workers=None, repeat=3, number=1, step=0.001):
+    max_workers = max_workers or os.cpu_count() or 1
+    waves = MultiSineWave(SineWave.init_frequency(freq, amplitude=1 / freq) for freq in range(1, 6))
+    frequencies = frequency_range(1, 10, step)
+    # smaller blocks than the default, so that there are enough parts for all workers
+    block = 2 ** 22
+    serial = best_ms(lambda: sweep(waves, frequencies, 0, 10, step=0.01, max_block_bytes=block),
+                     repeat, number)
+    print("{:<8} {:>7} {:10.3f} ms".format('serial', 1, serial))
+    for executor in executors:
+        for workers in range(1, max_workers + 1):
+            ms = best_ms(lambda: parallel_sweep(waves, frequencies, 0, 10, step=0.01, executor=executor,
+                                                workers=workers, max_block_bytes=block), repeat, number)
+            print("{:<8} {:>7} {:10.3f} ms  x{:.2f}".format(executor, workers, ms, serial / ms))
+
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else None)
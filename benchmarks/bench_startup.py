@@ -0,0 +1,98 @@
+"""
+Startup time of the fourier modules and the GUI, measured in fresh interpreters
+against a budget (the GUI stages need a display and are skipped without one).
+
+Run: python -m benchmarks.bench_startup [--repeat N]
+
+Exits with 1 if a stage is over its budget.
+"""
+import argparse
+import subprocess
+import sys
+
+
+# seconds from the start of the measured code to the end of the stage
+budgets = {
+    'import fourier.actors': 0.5,
+    'import fourier.fourier': 0.5,
+    'import fourier.batch': 0.75,
+    'import fourier.gui_start': 0.2,
+    'first paint': 0.5,
+    'window ready': 3.0,
+}
+
+stages = {
+    'import fourier.actors': 'import fourier.actors',
+    'import fourier.fourier': 'import fourier.fourier',
+    'import fourier.batch': 'import fourier.batch',
+    'import fourier.gui_start': 'import fourier.gui_start',
+    'first paint': 'from fourier.gui_start import create_window\n'
+                   'tk_root, loading = create_window()',
+    'window ready': 'from fourier.gui_start import build, create_window\n'
+                    'tk_root, loading = create_window()\n'
+                    'build(tk_root, loading)\n'
+                    'tk_root.update()',
+}
+
+_template = '''import time
+start = time.perf_counter()
+{}
+print(time.perf_counter() - start)
+'''
+
+
+def measure(code):
+    """
+    Runs code in a fresh interpreter.
+
+    Returns: Seconds taken by the code or None if it failed (e.g. there is no display).
+    """
+    process = subprocess.run([sys.executable, '-c', _template.format(code)], capture_output=True, text=True)
+    if process.returncode:
+        return None
+    return float(process.stdout.split()[-1])
+
+
+def run(selected=None, repeat=3):
+    """
+    Returns: Dictionary of stage names and the best time of repeat runs in seconds
+        (None for skipped stages).
+    """
+    results = {}
+    for name, code in stages.items():
+        if selected is not None and name not in selected:
+            continue
+        times = [measure(code) for _ in range(repeat)]
+        results[name] = None if None in times else min(times)
+        if results[name] is None:
+            print("{:<28} {:>12} (budget {:.0f} ms)".format(name, 'skipped', budgets[name] * 1000))
+        else:
+            print("{:<28} {:9.1f} ms (budget {:.0f} ms)".format(name, results[name] * 1000, budgets[name] * 1000))
+    return results
+
+
+def over_budget(results):
+    """
+    Returns: List of the names of the measured stages that took longer than their budget.
+    """
+    return [name for name, seconds in results.items() if seconds is not None and seconds > budgets[name]]
+
+
+def main(argv=None):
+    """
+    Command line interface, see the module documentation.
+
+    Returns: Exit status.
+    """
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.bench_startup',
+                                     description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args(argv)
+    slow = over_budget(run(repeat=args.repeat))
+    for name in slow:
+        print("OVER BUDGET {}".format(name))
+    return 1 if slow else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
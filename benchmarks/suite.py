@@ -0,0 +1,238 @@
+"""
+Benchmark suite of the actors, the fourier kernels and the GUI update paths.
+
+The update paths are measured headless on an Agg canvas with the renderer and LOD lines
+of fourier.plot_manager (PlotManager itself needs Tk widgets).
+
+Run:
+    python -m benchmarks.suite                       # print the timings
+    python -m benchmarks.suite --save                # store them as the baseline
+    python -m benchmarks.suite --compare             # flag regressions against the baseline
+    python -m benchmarks.suite --filter sweep --quick
+
+Every case is called often enough for about --min-time seconds per measurement, so
+that fast cases are not dominated by timer noise. Timings only compare on the same
+machine: record a baseline with --save before changing the code (benchmarks/baseline.json
+is not part of the repository).
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import timeit
+
+import matplotlib
+matplotlib.use('Agg')
+
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from fourier.actors import Circle, MultiSineWave, SineWave
+from fourier.jobs import compute_shape, compute_spectrum
+from fourier.cache import data_cache
+from fourier.fourier import average_point_location, get_shape
+from fourier.lod import LODLine
+from fourier.rendering import BlitRenderer
+from fourier.sweep import sweep
+
+
+default_baseline = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+
+def waves(components):
+    """
+    Returns: MultiSineWave of components waves with frequencies 1, 2, ...
+    """
+    return MultiSineWave(SineWave.init_frequency(freq, amplitude=1 / freq) for freq in range(1, components + 1))
+
+
+def update_paths():
+    """
+    Headless counterparts of PlotManager._set_fourier_graphs and _set_shape_avg_point_graphs.
+
+    Returns: Tuple(spectrum update function, shape update function) taking the signal.
+    """
+    figure = Figure(figsize=(8, 6), dpi=100)
+    canvas = FigureCanvasAgg(figure)
+    circle_axes = figure.add_subplot(211)
+    freq_axes = figure.add_subplot(212)
+    renderer = BlitRenderer(canvas)
+    circle_axes.plot(*Circle(radius=1).data())
+    shape_graph = renderer.add(circle_axes.plot([0], [0])[0])
+    avg_point = renderer.add(circle_axes.plot([0], [0], 'ro')[0])
+    lines = [LODLine(renderer.add(freq_axes.plot([0], [0])[0])) for _ in range(2)]
+    canvas.draw()
+
+    def spectrum(signal):
+        x, y1, y2, _ = compute_spectrum(signal, 1, 10, 'direct', False)
+        lines[0].set_data(x, y1)
+        lines[1].set_data(x, y2)
+        renderer.autoscale(freq_axes)
+        # a full draw when the limits changed (Agg draws in draw_idle), a blit otherwise
+        renderer.update()
+
+    def shape(signal):
+        (x, y), point = compute_shape(signal, 2.5)
+        shape_graph.set_data(x, y)
+        avg_point.set_data([point[0]], [point[1]])
+        renderer.autoscale(circle_axes)
+        renderer.update()
+
+    return spectrum, shape
+
+
+def cases(quick=False):
+    """
+    Returns: List of (name, function) of all benchmarks.
+    """
+    components = (1, 8) if quick else (1, 8, 64)
+    intervals = (10,) if quick else (10, 100)
+    steps = (0.01,) if quick else (0.01, 0.001)
+    grids = (100,) if quick else (100, 1000)
+    result = []
+    for step in (0.1, 0.001):
+        result.append(('circle_data[step={}]'.format(step), lambda step=step: Circle(radius=1).data(step)))
+    for interval in intervals:
+        for step in steps:
+            sine_wave = SineWave.init_frequency(2)
+            result.append(('sine_wave_data[interval={},step={}]'.format(interval, step),
+                           lambda sine_wave=sine_wave, interval=interval, step=step: sine_wave.data(0, interval, step)))
+            for count in components:
+                signal = waves(count)
+                suffix = '[components={},interval={},step={}]'.format(count, interval, step)
+                result.append(('multi_sine_wave_data' + suffix,
+                               lambda signal=signal, interval=interval, step=step: signal.data(0, interval, step)))
+                result.append(('get_shape' + suffix,
+                               lambda signal=signal, interval=interval, step=step: get_shape(signal, 2.5, 0, interval, step)))
+    for size in (10 ** 4, 10 ** 6):
+        x = np.random.default_rng(0).random(size)
+        result.append(('average_point_location[n={}]'.format(size), lambda x=x: average_point_location(x, x)))
+    for count in components:
+        signal = waves(count)
+        for size in grids:
+            frequencies = np.linspace(1, 10, size)
+            for backend in ('direct', 'czt'):
+                result.append(('sweep[components={},frequencies={},backend={}]'.format(count, size, backend),
+                               lambda signal=signal, frequencies=frequencies, backend=backend:
+                               sweep(signal, frequencies, 0, 10, step=0.01, backend=backend)))
+    spectrum, shape = update_paths()
+    for count in components:
+        signal = waves(count)
+        result.append(('update_spectrum[components={}]'.format(count), lambda signal=signal: spectrum(signal)))
+        result.append(('update_shape[components={}]'.format(count), lambda signal=signal: shape(signal)))
+    return result
+
+
+def calls_per_measurement(timer, min_time=0.2):
+    """
+    Returns: Smallest power of two of calls that take at least min_time seconds (at least 1).
+    """
+    number = 1
+    while timer.timeit(number) < min_time:
+        number *= 2
+    return number
+
+
+def run(selected, repeat=5, min_time=0.2):
+    """
+    Args:
+        selected: List of (name, function), see cases.
+        (optional)
+        repeat: Number of measurements.
+        min_time: Seconds of one measurement, see calls_per_measurement.
+
+    Returns: Dictionary of benchmark names and the best time of one call in seconds.
+    """
+    results = {}
+    for name, function in selected:
+        def call(function=function):
+            # the data cache is cleared before every call so that the kernels are really executed
+            data_cache.clear()
+            function()
+        timer = timeit.Timer(call)
+        number = calls_per_measurement(timer, min_time)
+        results[name] = min(timer.repeat(repeat=repeat, number=number)) / number
+        print("{:<64} {:12.3f} ms ({} calls)".format(name, results[name] * 1000, number))
+    return results
+
+
+def environment():
+    """
+    Returns: Dictionary describing the machine of the results.
+    """
+    return {
+        'machine': platform.machine(),
+        'processor': platform.processor(),
+        'system': platform.platform(),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'cpus': os.cpu_count(),
+    }
+
+
+def compare(results, baseline, tolerance=0.2):
+    """
+    Args:
+        results: Dictionary of benchmark names and seconds.
+        baseline: Dictionary of benchmark names and seconds.
+        (optional)
+        tolerance: Allowed relative slowdown.
+
+    Returns: List of (name, baseline seconds, seconds) of the regressions.
+    """
+    return [(name, baseline[name], seconds) for name, seconds in sorted(results.items())
+            if name in baseline and seconds > baseline[name] * (1 + tolerance)]
+
+
+def main(argv=None):
+    """
+    Command line interface, see the module documentation.
+
+    Returns: Exit status (1 if there are regressions).
+    """
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.suite', description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--save', nargs='?', const=default_baseline, help='store the results as baseline')
+    parser.add_argument('--compare', nargs='?', const=default_baseline, help='compare with a baseline')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='allowed relative slowdown')
+    parser.add_argument('--filter', default='', help='run only benchmarks containing this text')
+    parser.add_argument('--quick', action='store_true', help='fewer parameter combinations')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--min-time', type=float, default=0.2, help='seconds of one measurement')
+    args = parser.parse_args(argv)
+
+    baseline = None
+    if args.compare:
+        try:
+            with open(args.compare) as file:
+                data = json.load(file)
+        except (OSError, ValueError) as error:
+            print('error: cannot read the baseline ({}), record one with --save'.format(error), file=sys.stderr)
+            return 2
+        baseline = data['results']
+        if data.get('environment') != environment():
+            print('warning: the baseline was recorded on another machine or software version', file=sys.stderr)
+
+    # computed spectra must not come from the disk cache
+    os.environ['FOURIER_CACHE_DIR'] = ''
+    results = run([case for case in cases(args.quick) if args.filter in case[0]], args.repeat, args.min_time)
+
+    status = 0
+    if baseline is not None:
+        regressions = compare(results, baseline, args.tolerance)
+        for name, before, after in regressions:
+            print("REGRESSION {:<53} {:10.3f} ms -> {:10.3f} ms ({:+.0%})".format(
+                name, before * 1000, after * 1000, after / before - 1))
+        print("{} regressions in {} compared benchmarks".format(
+            len(regressions), len(set(results) & set(baseline))))
+        status = 1 if regressions else 0
+    if args.save:
+        with open(args.save, 'w') as file:
+            json.dump({'environment': environment(), 'results': results}, file, indent=2, sort_keys=True)
+            file.write('\n')
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,4 +1,11 @@
 
 if __name__ == '__main__':  # pragma: no cover
+    import sys
+    if sys.argv[1:2] == ['batch']:
+        import fourier.batch
+        sys.exit(fourier.batch.main(sys.argv[2:]))
+    if sys.argv[1:2] == ['export']:
+        import fourier.export
+        sys.exit(fourier.export.main(sys.argv[2:]))
     import fourier.gui_start
     fourier.gui_start.run()
@@ -1,9 +1,77 @@
 import numpy as np
 
+from fourier import audio, numeric
+from fourier.cache import data_cache
+from fourier.grid import SampleGrid, as_grid
+from fourier.memory import profiler
+from fourier.numeric import as_array, as_exact, as_float, block_rows
+
 
 default_step = 0.1
 
 
+def _sine_centroid(angular_velocity, amplitude, x0, y0, winding_frequency, a, b):
+    """
+    Exact average point of amplitude * sin(angular_velocity * (x + x0) + y0) wound
+    around a circle (see fourier.fourier.get_shape) over the continuous interval [a, b].
+
+    The parameters broadcast against each other, so components can be passed as
+    columns and winding frequencies as a row.
+
+    Returns: Tuple(x_avg, y_avg).
+    """
+    phase = angular_velocity * x0 + y0
+    omega = 2 * np.pi * winding_frequency
+    middle = (a + b) / 2
+    length = b - a
+    plus = np.exp(1j * (phase + (omega + angular_velocity) * middle)) \
+        * np.sinc((omega + angular_velocity) * length / (2 * np.pi))
+    minus = np.exp(1j * (-phase + (omega - angular_velocity) * middle)) \
+        * np.sinc((omega - angular_velocity) * length / (2 * np.pi))
+    avg = amplitude * (plus - minus) / 2j
+    return avg.imag, avg.real
+
+
+def _sine_sum(x, angular_velocities, amplitudes, x0, y0, max_block_bytes=None):
+    """
+    Sum of sine waves evaluated as one (components x samples) computation.
+    The components are processed in tiles that fit into max_block_bytes; when a single
+    component is larger, the samples are processed in chunks too.
+
+    Args:
+        x: Sample locations.
+        angular_velocities, amplitudes, x0, y0: Parallel arrays of wave parameters.
+        (optional)
+        max_block_bytes: See fourier.numeric.block_rows.
+
+    Returns: Instance of numpy.ndarray.
+    """
+    columns = block_rows(len(x), 1, x.itemsize, max_block_bytes=max_block_bytes)
+    rows = block_rows(len(amplitudes), columns, x.itemsize, max_block_bytes=max_block_bytes)
+    total = np.zeros(len(x), dtype=np.result_type(x, amplitudes))
+    for j in range(0, len(x), columns):
+        chunk = slice(j, j + columns)
+        for i in range(0, len(amplitudes), rows):
+            block = slice(i, i + rows)
+            values = amplitudes[block, None] * np.sin(
+                angular_velocities[block, None] * (x[chunk] + x0[block, None]) + y0[block, None])
+            profiler.track(values)
+            total[chunk] += values.sum(axis=0)
+    return total
+
+
+def _check_centroid_arguments(winding_frequency, a, b):
+    """
+    Raises:
+        ValueError: Winding Frequency must be positive.
+        ValueError: The following condition must be true: a < b.
+    """
+    if np.any(np.asarray(winding_frequency) <= 0):
+        raise ValueError("Winding Frequency must be positive.")
+    if a >= b:
+        raise ValueError("The following condition must be true: a < b.")
+
+
 class Circle:
     """
     Representation of a circle that calculates its points for plotting.
@@ -33,7 +101,8 @@ class Circle:
 
         Returns: Tuple of two numpy arrays.
         """
-        l = np.arange(0, 2 * np.pi + step, step)
+        # one step past 2 pi, so that the circle is closed
+        l = SampleGrid(0, 2 * np.pi + step, step).values
         return np.cos(l), np.sin(l)
 
     @property
@@ -92,6 +161,10 @@ class SineWave:
     Representation of an infinite sine wave.
     """
 
+    # counts changes of existing waves, see MultiSineWave.parameters
+    _revision = 0
+    _parameter_attributes = frozenset(('_angular_velocity', 'amplitude', 'x0', 'y0'))
+
     @classmethod
     def init_period(klass, period, amplitude=1, x0=0, y0=0):
         """
@@ -144,47 +217,67 @@ class SineWave:
         self.amplitude = amplitude
         self.x0 = x0
         self.y0 = y0
-        self._set_last_calc(None, None)
+        self._initialized = True
+
+    def __setattr__(self, name, value):
+        super().__setattr__(name, value)
+        if name in self._parameter_attributes and self.__dict__.get('_initialized'):
+            SineWave._revision += 1
 
     def __repr__(self):  # pragma: no cover
         return "SineWave(angular_frequency={}, amplitude={}, x0={}, y0={})".format(self.angular_velocity, self.amplitude, self.x0, self.y0)
 
-    def data(self, x1, x2, step=default_step):
+    def data(self, x1, x2=None, step=default_step, cache=True):
         """
         Calculate sine wave between two values x1 and x2.
 
         Args:
-            x1: Left boundary.
-            x2: Right boundary.
+            x1: Left boundary or an instance of fourier.grid.SampleGrid.
+            x2: Right boundary (not used with a SampleGrid).
             (optional)
-            step: Step of calculations.
+            step: Step of calculations (not used with a SampleGrid).
+            cache: Keep the result in fourier.cache.data_cache (False for one-off
+                reads such as the chunks of fourier.fourier.iter_chunks).
         
         Returns: Tuple(x_values, y_values).
         
         Raises:
             ValueError: The left boundary is greater than the right boundary.
         """
-        if x1 > x2:
-            raise ValueError("The left boundary is greater than the right boundary.")
-        l = np.arange(x1, x2 + step, step)
-        current_vals = (x1, x2, self.angular_velocity, self.amplitude, self.x0, self.y0)
-        if self.last_calc is not None:
-            if current_vals == self.last_values:
-                return self.last_calc
-        self._set_last_calc((l, self.amplitude * np.sin(self.angular_velocity * (l + self.x0) + self.y0)), current_vals)
-        return self.last_calc
-    
-    @property
-    def last_calc(self):
-        return self._last_calc
-    
-    @property
-    def last_values(self):
-        return self._last_values
-    
-    def _set_last_calc(self, last_calc, input_values):
-        self._last_values = input_values
-        self._last_calc = last_calc
+        grid = as_grid(x1, x2, step)
+        params = (self.angular_velocity, self.amplitude, self.x0, self.y0)
+        if not cache:
+            return self._data(params, grid)
+        key = (SineWave, params, grid, numeric.default_dtype)
+        return data_cache.get_or_compute(key, lambda: self._data(params, grid))
+
+    @staticmethod
+    @profiler.profiled('SineWave.data')
+    def _data(params, grid):
+        l = grid.values
+        return l, _sine_sum(l, *(as_array([value], dtype=l.dtype) for value in params))
+
+    def centroid(self, winding_frequency, a, b):
+        """
+        Exact average point of the sine wave wound around a circle over [a, b],
+        without sampling (the continuous counterpart of fourier.fourier.get_shape
+        followed by average_point_location).
+
+        Args:
+            winding_frequency: Winding frequency or an array of them.
+            a: Left boundary.
+            b: Right boundary.
+
+        Returns: Tuple(x_avg, y_avg).
+
+        Raises:
+            ValueError: Winding Frequency must be positive.
+            ValueError: The following condition must be true: a < b.
+        """
+        _check_centroid_arguments(winding_frequency, a, b)
+        return _sine_centroid(as_float(self.angular_velocity), as_float(self.amplitude),
+                              as_float(self.x0), as_float(self.y0),
+                              as_array(winding_frequency, dtype=float), as_float(a), as_float(b))
 
     @property
     def angular_velocity(self):
@@ -385,28 +478,324 @@ class LineAxes:
         self._y_lim2 = value
 
 
+def _invalidating(name):
+    """
+    Wraps the list method name so that it drops the cached parameter arrays.
+    """
+    method = getattr(list, name)
+
+    def wrapper(self, *args, **kwargs):
+        result = method(self, *args, **kwargs)
+        self._arrays = None
+        return result
+    wrapper.__name__ = name
+    wrapper.__doc__ = method.__doc__
+    return wrapper
+
+
 class MultiSineWave(list):
+    """
+    List of SineWave instances that are evaluated together.
+
+    The wave parameters are kept in parallel arrays (see parameters) which are rebuilt
+    only after the list or one of the waves changed.
+    """
+
+    def __init__(self, waves=()):
+        super().__init__(waves)
+        self._arrays = None
+
+    append = _invalidating('append')
+    extend = _invalidating('extend')
+    insert = _invalidating('insert')
+    pop = _invalidating('pop')
+    remove = _invalidating('remove')
+    clear = _invalidating('clear')
+    sort = _invalidating('sort')
+    reverse = _invalidating('reverse')
+    __setitem__ = _invalidating('__setitem__')
+    __delitem__ = _invalidating('__delitem__')
+    __iadd__ = _invalidating('__iadd__')
+    __imul__ = _invalidating('__imul__')
+
+    @classmethod
+    def from_arrays(klass, angular_velocities, amplitudes=None, x0=None, y0=None):
+        """
+        Initialize from parallel arrays of wave parameters.
+        The arrays are used as the parameter arrays directly.
 
-    def data(self, x1, x2, step=default_step):
+        Args:
+            angular_velocities: Angular velocities.
+            (optional)
+            amplitudes: Amplitudes (ones by default).
+            x0: X shifts (zeros by default).
+            y0: Y shifts (zeros by default).
+
+        Returns: Instance of MultiSineWave.
+        """
+        angular_velocities = as_array(angular_velocities, dtype=float)
+        count = len(angular_velocities)
+        amplitudes = np.ones(count) if amplitudes is None else as_array(amplitudes, dtype=float)
+        x0 = np.zeros(count) if x0 is None else as_array(x0, dtype=float)
+        y0 = np.zeros(count) if y0 is None else as_array(y0, dtype=float)
+        # SineWave objects are still needed for the list API
+        multi_sine_wave = klass(SineWave(*params) for params in zip(
+            angular_velocities.tolist(), amplitudes.tolist(), x0.tolist(), y0.tolist()))
+        multi_sine_wave._set_arrays(np.stack((angular_velocities, amplitudes, x0, y0)))
+        return multi_sine_wave
+
+    @staticmethod
+    def parse_components(text):
+        """
+        Parses the 'freq,amp;freq,amp' syntax of the GUI. Pairs without exactly one comma
+        are skipped.
+
+        Returns: List of exact (frequency, amplitude) Fractions.
+
+        Raises:
+            ValueError: A frequency or an amplitude is not a rational number.
+        """
+        components = []
+        for pair in text.split(';'):
+            values = pair.split(',')
+            if len(values) == 2:
+                components.append((as_exact(values[0]), as_exact(values[1])))
+        return components
+
+    @classmethod
+    def from_components(klass, components):
+        """
+        Initialize from (frequency, amplitude) pairs.
+
+        Returns: Instance of MultiSineWave.
+        """
+        return klass(SineWave.init_frequency(as_float(freq), amplitude=as_float(amplitude))
+                     for freq, amplitude in components)
+
+    @classmethod
+    def parse(klass, text):
+        """
+        Initialize from the 'freq,amp;freq,amp' syntax (see parse_components).
+
+        Returns: Instance of MultiSineWave.
+        """
+        return klass.from_components(klass.parse_components(text))
+
+    def parameters(self, dtype=None):
+        """
+        Parameters of all waves as parallel (read-only) arrays.
+
+        Args:
+            (optional)
+            dtype: See fourier.numeric.as_array.
+
+        Returns: Tuple(angular_velocities, amplitudes, x0, y0).
+        """
+        arrays = self._parameter_arrays()[0]
+        if dtype is not None and np.dtype(dtype) != arrays.dtype:
+            arrays = as_array(arrays, dtype=dtype)
+        return tuple(arrays)
+
+    def _parameter_arrays(self):
+        """
+        Returns: Tuple(4 x components array of parameters, its hashable key).
+        """
+        if self._arrays is None or self._revision != SineWave._revision:
+            params = [(wave.angular_velocity, wave.amplitude, wave.x0, wave.y0) for wave in self]
+            self._set_arrays(np.array(params, dtype=float).reshape(-1, 4).T.copy())
+        return self._arrays
+
+    def _set_arrays(self, arrays):
+        arrays.flags.writeable = False
+        self._arrays = arrays, arrays.tobytes()
+        self._revision = SineWave._revision
+
+    def data(self, x1, x2=None, step=default_step, cache=True):
         """
         Combine sine wave values
 
         Args:
-            x1: Left boundary.
-            x2: Right boundary.
+            x1: Left boundary or an instance of fourier.grid.SampleGrid.
+            x2: Right boundary (not used with a SampleGrid).
             (optional)
-            step: Step of calculations.
+            step: Step of calculations (not used with a SampleGrid).
+            cache: Keep the result in fourier.cache.data_cache, see SineWave.data.
         
         Returns: Tuple(x_values, y_values).
         
         Raises:
             ValueError: The left boundary is greater than the right boundary.
         """
-        if x1 > x2:
-            raise ValueError("The left boundary is greater than the right boundary.")
+        grid = as_grid(x1, x2, step)
+        if self and not cache:
+            return self._data(grid)
         if self:
-            l = np.arange(x1, x2 + step, step)
-            data_gen = (wave.data(x1, x2, step)[1] for wave in self)
-            return l, sum(data_gen)
+            key = (MultiSineWave, self._parameter_arrays()[1], grid, numeric.default_dtype)
+            return data_cache.get_or_compute(key, lambda: self._data(grid))
         else:
             return [], []
+
+    @profiler.profiled('MultiSineWave.data')
+    def _data(self, grid):
+        l = grid.values
+        return l, _sine_sum(l, *self.parameters(dtype=l.dtype))
+
+    def centroid(self, winding_frequency, a, b):
+        """
+        Exact average point of the combined wave wound around a circle over [a, b].
+        Costs O(number of waves) per winding frequency.
+
+        Args:
+            winding_frequency: Winding frequency or an array of them.
+            a: Left boundary.
+            b: Right boundary.
+
+        Returns: Tuple(x_avg, y_avg).
+
+        Raises:
+            ValueError: Winding Frequency must be positive.
+            ValueError: The following condition must be true: a < b.
+        """
+        _check_centroid_arguments(winding_frequency, a, b)
+        winding_frequency = as_array(winding_frequency, dtype=float)
+        x_avg = np.zeros(winding_frequency.shape)
+        y_avg = np.zeros(winding_frequency.shape)
+        if not self:
+            return x_avg, y_avg
+        flat = winding_frequency.reshape(-1)
+        angular_velocities, amplitudes, x0, y0 = (param[:, None] for param in self.parameters(dtype=float))
+        # complex exponentials of plus and minus terms are alive at the same time
+        rows = block_rows(len(amplitudes), len(flat), 16, arrays=4)
+        for i in range(0, len(amplitudes), rows):
+            block = slice(i, i + rows)
+            block_x_avg, block_y_avg = _sine_centroid(angular_velocities[block], amplitudes[block],
+                                                      x0[block], y0[block], flat, as_float(a), as_float(b))
+            x_avg += block_x_avg.sum(axis=0).reshape(winding_frequency.shape)
+            y_avg += block_y_avg.sum(axis=0).reshape(winding_frequency.shape)
+        return x_avg, y_avg
+
+
+class SampledSignal:
+    """
+    Recorded signal, e.g. a WAV file, with the data contract of SineWave and MultiSineWave.
+
+    The samples are usually a numpy.memmap, so opening a large file reads nothing and
+    data reads only the requested time window. A window on the sample times of the
+    recording is returned as a view of the samples (when they need no normalization);
+    other steps are resampled by linear interpolation, which reads and normalizes only
+    the two samples around every point. The signal is zero outside the recording.
+    """
+
+    def __init__(self, samples, rate, offset=0, scale=1):
+        """
+        Args:
+            samples: 1-d array of samples; sample i is at time i / rate.
+            rate: Samples per second.
+            (optional)
+            offset: The values are (samples - offset) * scale.
+            scale: See offset.
+
+        Raises:
+            ValueError: Rate has to be positive.
+        """
+        if rate <= 0:
+            raise ValueError("Rate has to be positive: {}".format(rate))
+        self.samples = samples
+        self.rate = rate
+        self.offset = offset
+        self.scale = scale
+
+    @classmethod
+    def from_wav(klass, path, channel=0, normalize=True):
+        """
+        Initialize from a WAV file (8, 16 or 32 bit PCM, 32 or 64 bit float) without reading it.
+
+        Args:
+            path: Path of the file.
+            (optional)
+            channel: Index of the channel.
+            normalize: Scale integer samples to [-1, 1).
+
+        Returns: Instance of SampledSignal.
+
+        Raises:
+            ValueError: The file is not a WAV file or its sample format is not supported.
+        """
+        wav_format = audio.read_wav_format(path)
+        samples = audio.map_samples(path, wav_format.dtype, wav_format.channels, wav_format.data_offset,
+                                    wav_format.frames)
+        offset, scale = audio.normalization(wav_format.dtype) if normalize else (0, 1)
+        return klass(samples[:, channel], wav_format.rate, offset, scale)
+
+    @classmethod
+    def from_raw(klass, path, rate, dtype='<i2', channels=1, channel=0, header_bytes=0, normalize=True):
+        """
+        Initialize from a file of raw interleaved PCM samples without reading it.
+
+        Args:
+            path: Path of the file.
+            rate: Samples per second.
+            (optional)
+            dtype: numpy data type of the samples.
+            channels: Number of interleaved channels.
+            channel: Index of the channel.
+            header_bytes: Bytes before the first sample.
+            normalize: Scale integer samples to [-1, 1).
+
+        Returns: Instance of SampledSignal.
+        """
+        samples = audio.map_samples(path, dtype, channels, header_bytes)
+        offset, scale = audio.normalization(dtype) if normalize else (0, 1)
+        return klass(samples[:, channel], rate, offset, scale)
+
+    def __repr__(self):  # pragma: no cover
+        return "SampledSignal(samples={}, rate={})".format(len(self.samples), self.rate)
+
+    @property
+    def duration(self):
+        """
+        Returns: Time of the recording.
+        """
+        return len(self.samples) / self.rate
+
+    def data(self, x1, x2=None, step=None, cache=True):
+        """
+        Signal values between two times x1 and x2.
+
+        Args:
+            x1: Left boundary or an instance of fourier.grid.SampleGrid.
+            x2: Right boundary (not used with a SampleGrid).
+            (optional)
+            step: Step of calculations (not used with a SampleGrid), 1 / rate by default.
+            cache: Not used; the samples are read from the recording every time.
+
+        Returns: Tuple(x_values, y_values).
+
+        Raises:
+            ValueError: The left boundary is greater than the right boundary.
+        """
+        grid = as_grid(x1, x2, 1 / self.rate if step is None else step)
+        first = grid.start * self.rate
+        index = int(round(first))
+        if (np.isclose(grid.step * self.rate, 1, rtol=1e-9, atol=0) and np.isclose(first, index, atol=1e-6)
+                and index >= 0 and index + len(grid) <= len(self.samples)):
+            return grid.values, self._values(self.samples[index:index + len(grid)])
+
+        x = grid.values
+        y = np.zeros(len(x))
+        positions = x * self.rate
+        inside = np.flatnonzero((positions >= 0) & (positions <= len(self.samples) - 1))
+        if len(inside):
+            # linear interpolation that reads and normalizes only the two neighbours of every point
+            positions = positions[inside]
+            left = np.floor(positions).astype(np.intp)
+            right = np.minimum(left + 1, len(self.samples) - 1)
+            fraction = positions - left
+            y[inside] = (self._values(self.samples[left], float) * (1 - fraction)
+                         + self._values(self.samples[right], float) * fraction)
+        return x, y
+
+    def _values(self, samples, dtype=None):
+        if self.offset == 0 and self.scale == 1:
+            return samples if dtype is None else samples.astype(dtype)
+        return (samples - self.offset) * self.scale
@@ -0,0 +1,86 @@
+import struct
+from collections import namedtuple
+
+import numpy as np
+
+
+WavFormat = namedtuple('WavFormat', ['channels', 'rate', 'bits', 'dtype', 'data_offset', 'frames'])
+
+_PCM = 1
+_IEEE_FLOAT = 3
+_EXTENSIBLE = 0xFFFE
+
+_dtypes = {
+    (_PCM, 8): np.dtype('u1'),
+    (_PCM, 16): np.dtype('<i2'),
+    (_PCM, 32): np.dtype('<i4'),
+    (_IEEE_FLOAT, 32): np.dtype('<f4'),
+    (_IEEE_FLOAT, 64): np.dtype('<f8'),
+}
+
+
+def read_wav_format(path):
+    """
+    Reads the RIFF chunks of a WAV file up to its data chunk (the samples are not read).
+
+    Returns: WavFormat.
+
+    Raises:
+        ValueError: The file is not a WAV file or its sample format is not supported.
+    """
+    with open(path, 'rb') as file:
+        riff, _, wave = struct.unpack('<4sI4s', _read(file, 12))
+        if riff != b'RIFF' or wave != b'WAVE':
+            raise ValueError("Not a WAV file: {}".format(path))
+        audio_format = None
+        while True:
+            chunk_id, size = struct.unpack('<4sI', _read(file, 8))
+            if chunk_id == b'fmt ':
+                fmt = _read(file, size)
+                audio_format, channels, rate, _, block_align, bits = struct.unpack('<HHIIHH', fmt[:16])
+                if audio_format == _EXTENSIBLE and size >= 26:
+                    # the sub format GUID starts with the format code
+                    audio_format = struct.unpack('<H', fmt[24:26])[0]
+            elif chunk_id == b'data':
+                if audio_format is None:
+                    raise ValueError("WAV file without format chunk: {}".format(path))
+                dtype = _dtypes.get((audio_format, bits))
+                if dtype is None:
+                    raise ValueError("Unsupported WAV sample format {} with {} bits: {}".format(
+                        audio_format, bits, path))
+                return WavFormat(channels, rate, bits, dtype, file.tell(), size // block_align)
+            else:
+                file.seek(size, 1)
+            # chunks are padded to an even size
+            if size % 2:
+                file.seek(1, 1)
+
+
+def _read(file, size):
+    data = file.read(size)
+    if len(data) < size:
+        raise ValueError("Truncated WAV file: {}".format(file.name))
+    return data
+
+
+def normalization(dtype):
+    """
+    Returns: Tuple(offset, scale) that map samples of dtype to [-1, 1) by (value - offset) * scale.
+    """
+    dtype = np.dtype(dtype)
+    if dtype.kind == 'u':
+        half = 2 ** (8 * dtype.itemsize - 1)
+        return half, 1 / half
+    if dtype.kind == 'i':
+        return 0, 1 / 2 ** (8 * dtype.itemsize - 1)
+    return 0, 1
+
+
+def map_samples(path, dtype, channels=1, offset=0, frames=None):
+    """
+    Memory-maps interleaved samples; nothing is read until the samples are used.
+
+    Returns: Read-only numpy.memmap shaped (frames, channels).
+    """
+    return np.memmap(path, dtype=dtype, mode='r', offset=offset,
+                     shape=None if frames is None else (frames, channels)).reshape(-1, channels)
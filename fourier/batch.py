@@ -0,0 +1,202 @@
+"""
+Headless computation of the sound signal, wound shape and spectrum of many signals.
+
+Run: python -m fourier batch specs.txt [-o output] [--format npz|csv] [--workers N]
+                             [--memory] [--memory-budget BYTES]
+
+Every non-empty line of the specs file (except '#' comments) is one signal in the
+'freq,amp;freq,amp' syntax of the GUI.
+"""
+import argparse
+import csv
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from fourier import numeric
+from fourier.actors import MultiSineWave
+from fourier.jobs import compute_all
+from fourier.memory import profiler
+from fourier.sweep import backends
+
+
+formats = ('npz', 'csv')
+
+
+def read_specs(path):
+    """
+    Reads and parses a specs file.
+
+    Returns: List of (spec text, components) (see MultiSineWave.parse_components).
+
+    Raises:
+        ValueError: A line is not a valid spec.
+    """
+    specs = []
+    with open(path) as file:
+        for number, line in enumerate(file, 1):
+            text = line.split('#', 1)[0].strip()
+            if not text:
+                continue
+            try:
+                components = MultiSineWave.parse_components(text)
+            except ValueError as error:
+                raise ValueError("{}:{}: {}".format(path, number, error))
+            if not components:
+                raise ValueError("{}:{}: No 'freq,amp' pair: {}".format(path, number, text))
+            if any(freq <= 0 for freq, amplitude in components):
+                raise ValueError("{}:{}: Frequencies have to be positive: {}".format(path, number, text))
+            specs.append((text, components))
+    return specs
+
+
+def run_spec(index, components, output, output_format, winding_frequency, start, end, backend, adaptive):
+    """
+    Computes one spec and writes its arrays into the output directory.
+
+    Returns: Number of written bytes.
+    """
+    multi_sine_wave = MultiSineWave.from_components(components)
+    sound, (shape, avg_point), spectrum = compute_all(multi_sine_wave, winding_frequency, start, end,
+                                                      backend, False, adaptive)
+    arrays = {
+        'sound': np.stack(sound),
+        'shape': np.stack(shape),
+        'avg_point': np.array(avg_point),
+        'spectrum': np.stack(spectrum[:3]),
+    }
+    name = os.path.join(output, '{:05d}'.format(index))
+    if output_format == 'npz':
+        np.savez(name + '.npz', **arrays)
+        return os.path.getsize(name + '.npz')
+    headers = {'sound': 'x,y', 'shape': 'x,y', 'avg_point': 'x,y', 'spectrum': 'frequency,x_avg,y_avg'}
+    written = 0
+    for key, values in arrays.items():
+        path = '{}_{}.csv'.format(name, key)
+        np.savetxt(path, np.atleast_2d(values.T), delimiter=',', header=headers[key], comments='')
+        written += os.path.getsize(path)
+    return written
+
+
+def _init_worker(profile_memory, memory_budget):
+    """
+    Applies the memory settings of run in a worker (or the current) process.
+    """
+    # also resets a profiler that was copied from the parent process
+    profiler.enabled = False
+    profiler.enabled = profile_memory
+    if profile_memory:
+        profiler.reset()
+    if memory_budget is not None:
+        numeric.set_memory_budget(memory_budget)
+
+
+def _run_job(job):
+    """
+    Returns: Tuple(number of written bytes, memory stats of the job).
+    """
+    written = run_spec(*job)
+    if not profiler.enabled:
+        return written, {}
+    stats = profiler.stats()
+    profiler.reset()
+    return written, stats
+
+
+def run(specs, output, output_format='npz', winding_frequency=1, start=1, end=10, backend='direct',
+        adaptive=False, workers=None, profile_memory=False, memory_budget=None):
+    """
+    Computes all specs, in a process pool unless workers is 1.
+
+    Args:
+        specs: List of (spec text, components), see read_specs.
+        output: Output directory (created if needed).
+        (optional)
+        output_format: 'npz' (one file per spec) or 'csv' (one file per spec and array).
+        winding_frequency: Winding frequency of the shapes.
+        start: First frequency of the spectra.
+        end: Last frequency of the spectra.
+        backend: Backend of the spectra, see fourier.sweep.sweep.
+        adaptive: Use fourier.sweep.adaptive_sweep.
+        workers: Number of processes (os.cpu_count() by default).
+        profile_memory: Record the memory use of the kernels; fourier.memory.profiler holds
+            the stats of all specs afterwards.
+        memory_budget: See fourier.numeric.set_memory_budget (current budget by default).
+
+    Returns: Tuple(number of specs, written bytes, seconds).
+
+    Raises:
+        ValueError: Unknown output format.
+        ValueError: Unknown backend.
+    """
+    if output_format not in formats:
+        raise ValueError("Unknown output format: {}".format(output_format))
+    if backend not in backends:
+        raise ValueError("Unknown backend: {}".format(backend))
+    os.makedirs(output, exist_ok=True)
+    with open(os.path.join(output, 'index.csv'), 'w', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(['index', 'spec'])
+        writer.writerows(enumerate(text for text, components in specs))
+
+    jobs = [(index, components, output, output_format, winding_frequency, start, end, backend, adaptive)
+            for index, (text, components) in enumerate(specs)]
+    settings = (profile_memory, memory_budget)
+    begin = time.perf_counter()
+    if workers == 1:
+        previous = profiler.enabled, numeric.default_max_block_bytes
+        try:
+            _init_worker(*settings)
+            results = [_run_job(job) for job in jobs]
+        finally:
+            profiler.enabled = previous[0]
+            numeric.set_memory_budget(previous[1])
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=settings) as executor:
+            results = list(executor.map(_run_job, jobs, chunksize=max(len(jobs) // 64, 1)))
+    seconds = time.perf_counter() - begin
+    if profile_memory:
+        profiler.reset()
+        for written, stats in results:
+            profiler.merge(stats)
+    return len(jobs), sum(written for written, stats in results), seconds
+
+
+def main(argv=None):
+    """
+    Command line interface, see the module documentation.
+
+    Returns: Exit status.
+    """
+    parser = argparse.ArgumentParser(prog='python -m fourier batch', description=__doc__.strip().splitlines()[0])
+    parser.add_argument('specs', help="file with one 'freq,amp;freq,amp' signal per line")
+    parser.add_argument('-o', '--output', default='batch_output', help='output directory')
+    parser.add_argument('--format', choices=formats, default='npz', dest='output_format')
+    parser.add_argument('--winding-frequency', type=float, default=1)
+    parser.add_argument('--start', type=float, default=1, help='first frequency of the spectrum')
+    parser.add_argument('--end', type=float, default=10, help='last frequency of the spectrum')
+    parser.add_argument('--backend', choices=sorted(backends), default='direct')
+    parser.add_argument('--adaptive', action='store_true', help='adaptive frequency sweep')
+    parser.add_argument('--workers', type=int, default=None, help='number of processes')
+    parser.add_argument('--memory', action='store_true', help='report the memory use of the kernels')
+    parser.add_argument('--memory-budget', type=int, default=None,
+                        help='bytes of temporary arrays per kernel block before chunking')
+    args = parser.parse_args(argv)
+
+    try:
+        specs = read_specs(args.specs)
+        count, written, seconds = run(specs, args.output, args.output_format, args.winding_frequency,
+                                      args.start, args.end, args.backend, args.adaptive, args.workers,
+                                      args.memory, args.memory_budget)
+    except (OSError, ValueError) as error:
+        print('error: {}'.format(error), file=sys.stderr)
+        return 1
+    print('{} specs in {:.3f} s ({:.1f} specs/s, {:.2f} MB/s) -> {}'.format(
+        count, seconds, count / seconds if seconds else 0, written / seconds / 1e6 if seconds else 0,
+        args.output))
+    if args.memory:
+        print(profiler.report())
+    return 0
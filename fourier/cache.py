@@ -0,0 +1,147 @@
+import threading
+from collections import OrderedDict, namedtuple
+
+import numpy as np
+
+
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'maxsize', 'currsize', 'nbytes', 'max_bytes'])
+
+
+def _nbytes(value):
+    """
+    Returns: Bytes of the numpy arrays in value (an array or a tuple of them).
+    """
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (tuple, list)):
+        return sum(_nbytes(item) for item in value)
+    return 0
+
+
+def _freeze(value):
+    """
+    Marks the cached arrays read-only, so that a caller cannot change the cached result.
+    """
+    if isinstance(value, np.ndarray):
+        value.flags.writeable = False
+    elif isinstance(value, (tuple, list)):
+        for item in value:
+            _freeze(item)
+    return value
+
+
+class LRUCache:
+    """
+    Thread-safe least recently used cache of computation results.
+    """
+
+    def __init__(self, maxsize=64, max_bytes=2 ** 27):
+        """
+        Args:
+            (optional)
+            maxsize: Maximum number of entries.
+            max_bytes: Maximum bytes of the cached arrays (None for no limit).
+        """
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.resize(maxsize, max_bytes)
+
+    def __repr__(self):  # pragma: no cover
+        return "LRUCache(maxsize={}, max_bytes={})".format(self.maxsize, self.max_bytes)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get(self, key, default=None):
+        """
+        Returns: The cached value (marked as most recently used) or default.
+        """
+        with self._lock:
+            try:
+                value = self._entries[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        """
+        Stores a value. Arrays in the value are made read-only.
+        Least recently used entries are evicted when the cache is full.
+
+        Returns: The value.
+        """
+        size = _nbytes(value)
+        with self._lock:
+            if key in self._entries:
+                self._nbytes -= _nbytes(self._entries.pop(key))
+            if self.max_bytes is not None and size > self.max_bytes:
+                return value
+            self._entries[key] = _freeze(value)
+            self._nbytes += size
+            self._evict()
+        return value
+
+    def get_or_compute(self, key, compute):
+        """
+        Returns: The cached value or the result of compute() which gets cached.
+        """
+        value = self.get(key)
+        if value is None:
+            value = self.put(key, compute())
+        return value
+
+    def resize(self, maxsize=None, max_bytes=None):
+        """
+        Changes the limits and evicts entries that do not fit.
+
+        Args:
+            maxsize: Maximum number of entries (at least 0).
+            max_bytes: Maximum bytes of the cached arrays (None for no limit).
+
+        Raises:
+            ValueError: maxsize cannot be negative.
+        """
+        if maxsize is not None and maxsize < 0:
+            raise ValueError("maxsize cannot be negative: {}".format(maxsize))
+        with self._lock:
+            self.maxsize = maxsize
+            self.max_bytes = max_bytes
+            self._evict()
+
+    def clear(self):
+        """
+        Removes all entries and resets the statistics.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._nbytes = 0
+            self.hits = 0
+            self.misses = 0
+
+    def info(self):
+        """
+        Returns: CacheInfo with hit/miss statistics and current size.
+        """
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self._entries), self._nbytes, self.max_bytes)
+
+    def _evict(self):
+        while self._entries and (
+                (self.maxsize is not None and len(self._entries) > self.maxsize)
+                or (self.max_bytes is not None and self._nbytes > self.max_bytes)):
+            _, value = self._entries.popitem(last=False)
+            self._nbytes -= _nbytes(value)
+
+
+data_cache = LRUCache()
+"""
+Cache of actor data shared by SineWave and MultiSineWave.
+"""
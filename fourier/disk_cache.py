@@ -0,0 +1,197 @@
+import hashlib
+import os
+import tempfile
+from fractions import Fraction
+
+import numpy as np
+
+
+def default_directory():
+    """
+    Returns: Directory of the disk cache, $FOURIER_CACHE_DIR or ~/.cache/fourier
+        (None when FOURIER_CACHE_DIR is empty, which disables the cache).
+    """
+    directory = os.environ.get('FOURIER_CACHE_DIR')
+    if directory is None:
+        return os.path.join(os.path.expanduser('~'), '.cache', 'fourier')
+    return directory or None
+
+
+def _normalize(value):
+    """
+    Returns: Text representation of value that is equal for equal numbers (2, 2.0, Fraction(2))
+        and independent of the Python session.
+    """
+    if isinstance(value, np.ndarray):
+        value = np.ascontiguousarray(value)
+        return 'array({},{},{})'.format(value.dtype.str, value.shape, hashlib.sha256(value.tobytes()).hexdigest())
+    if isinstance(value, (tuple, list)):
+        return '({})'.format(','.join(_normalize(item) for item in value))
+    if isinstance(value, str):
+        return repr(value)
+    if isinstance(value, (bool, type(None))):
+        return repr(value)
+    if isinstance(value, (int, float, Fraction, np.number)):
+        return float(value).hex()
+    raise TypeError("Cannot make a cache key of: {!r}".format(value))
+
+
+def cache_key(*parts):
+    """
+    Returns: Stable sha256 hex digest of parts (strings, numbers, arrays and tuples of them).
+
+    Raises:
+        TypeError: A part has an unsupported type.
+    """
+    return hashlib.sha256(_normalize(parts).encode()).hexdigest()
+
+
+class DiskCache:
+    """
+    Content-addressed cache of computed arrays in a directory, shared between sessions.
+
+    An entry is a tuple of equally long 1-d arrays stored as the rows of one .npy file
+    named by its key (see cache_key). Files are written to a temporary file and renamed,
+    so readers never see partial entries. Hits are memory-mapped read-only and mark the
+    file as recently used by its modification time; the least recently used files are
+    removed when the directory holds more than max_bytes.
+    """
+
+    def __init__(self, directory=None, max_bytes=2 ** 28):
+        """
+        Args:
+            (optional)
+            directory: Directory of the cache files (default_directory() by default,
+                resolved when the cache is used).
+            max_bytes: Maximum bytes of the cache files.
+        """
+        self._directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    def __repr__(self):  # pragma: no cover
+        return "DiskCache(directory={!r}, max_bytes={})".format(self.directory, self.max_bytes)
+
+    @property
+    def directory(self):
+        """
+        Returns: Directory of the cache files (None if the cache is disabled).
+        """
+        return self._directory if self._directory is not None else default_directory()
+
+    def path(self, key):
+        """
+        Returns: Path of the file of the key.
+        """
+        return os.path.join(self.directory, key + '.npy')
+
+    def get(self, key):
+        """
+        Returns: Tuple of read-only memory-mapped arrays or None.
+        """
+        if self.directory is None:
+            return None
+        path = self.path(key)
+        try:
+            rows = np.load(path, mmap_mode='r', allow_pickle=False)
+            os.utime(path)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except (OSError, ValueError):
+            # damaged file, e.g. written by another version
+            self._remove(path)
+            self.misses += 1
+            return None
+        self.hits += 1
+        return tuple(rows)
+
+    def put(self, key, arrays):
+        """
+        Stores equally long 1-d arrays. Failing writes are ignored.
+
+        Returns: arrays.
+        """
+        directory = self.directory
+        if directory is None:
+            return arrays
+        try:
+            os.makedirs(directory, exist_ok=True)
+            handle, temporary = tempfile.mkstemp(suffix='.tmp', dir=directory)
+            try:
+                with os.fdopen(handle, 'wb') as file:
+                    np.save(file, np.stack([np.asarray(array, dtype=float) for array in arrays]))
+                os.replace(temporary, self.path(key))
+            except BaseException:
+                self._remove(temporary)
+                raise
+        except OSError:
+            return arrays
+        self._evict()
+        return arrays
+
+    def get_or_compute(self, key, compute):
+        """
+        Returns: The cached arrays or the result of compute() which gets cached.
+        """
+        arrays = self.get(key)
+        if arrays is None:
+            arrays = self.put(key, compute())
+        return arrays
+
+    def clear(self):
+        """
+        Removes all cache files and resets the statistics.
+        """
+        for path, _, _ in self._files():
+            self._remove(path)
+        self.hits = 0
+        self.misses = 0
+
+    def nbytes(self):
+        """
+        Returns: Bytes of the cache files.
+        """
+        return sum(size for _, _, size in self._files())
+
+    def _files(self):
+        """
+        Returns: List of (path, modification time, size) of the cache files.
+        """
+        directory = self.directory
+        files = []
+        if directory is None or not os.path.isdir(directory):
+            return files
+        for entry in os.scandir(directory):
+            if entry.name.endswith('.npy'):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                files.append((entry.path, stat.st_mtime, stat.st_size))
+        return files
+
+    def _evict(self):
+        if self.max_bytes is None:
+            return
+        files = sorted(self._files(), key=lambda file: file[1])
+        total = sum(size for _, _, size in files)
+        for path, _, size in files:
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+spectrum_cache = DiskCache()
+"""
+Disk cache of spectra shared by plot_manager and main_window.
+"""
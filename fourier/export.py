@@ -0,0 +1,424 @@
+"""
+Headless export of the winding animation (the sweep of main_window) as a PNG sequence or a video.
+
+Run: python -m fourier export output [--signal 'freq,amp;freq,amp'] [--start F] [--end F]
+                                     [--frequency-step F] [--stops F F ...] [--pause S] [--fps N]
+                                     [--workers N]
+
+The output is a directory of numbered PNG files, a GIF (Pillow, at most
+max_gif_frames distinct frames) or a video (.mp4, .webm, .mkv, .avi; needs ffmpeg on the PATH). The wound shapes of batches of
+frames are computed as one (frames x samples) array and rasterized on Agg figures in a
+process pool. Pauses at the stop frequencies are repeated frames, so the output
+plays at the same speed as it was planned, independent of the rendering time.
+"""
+import argparse
+import io
+import os
+import shutil
+import subprocess
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from PIL import Image
+
+from fourier.actors import Circle, LineAxes, MultiSineWave
+from fourier.fourier import sample_signal
+from fourier.sweep import frequency_range, sweep
+
+
+video_formats = ('.mp4', '.webm', '.mkv', '.avi')
+
+# Distinct frames of a GIF, which is written from memory (about 1 MB per 1280x720 frame).
+max_gif_frames = 500
+
+
+def frame_plan(start_frequency, end_frequency, frequency_step, stop_frequencies=(), pause=0, fps=30):
+    """
+    Winding frequencies of the distinct frames of a sweep and how often each frame is shown.
+
+    Args:
+        start_frequency: Winding frequency of the first frame.
+        end_frequency: Winding frequency of the last frame (included when it is on the step grid).
+        frequency_step: Difference of the winding frequencies of two following frames.
+        (optional)
+        stop_frequencies: Frequencies where the sweep pauses (the nearest frame is held).
+        pause: Seconds of a pause.
+        fps: Frames per second of the output.
+
+    Returns: Tuple(frequencies, repeats) - arrays of the distinct frames.
+
+    Raises:
+        ValueError: Frequency step has to be positive.
+        ValueError: The following condition must be true: start_frequency <= end_frequency.
+        ValueError: Winding Frequency must be positive.
+    """
+    if frequency_step <= 0:
+        raise ValueError("Frequency step has to be positive: {}".format(frequency_step))
+    if start_frequency > end_frequency:
+        raise ValueError("The following condition must be true: start_frequency <= end_frequency.")
+    if start_frequency <= 0:
+        raise ValueError("Winding Frequency must be positive.")
+    count = int(np.floor((end_frequency - start_frequency) / frequency_step + 1e-9)) + 1
+    frequencies = start_frequency + np.arange(count) * frequency_step
+    repeats = np.ones(count, dtype=int)
+    for stop in stop_frequencies:
+        index = int(round((stop - start_frequency) / frequency_step))
+        if 0 <= index < count:
+            repeats[index] += int(round(pause * fps))
+    return frequencies, repeats
+
+
+def wound_shapes(x, y, frequencies):
+    """
+    get_shape for a batch of winding frequencies as one computation.
+
+    Returns: Tuple(x values, y values, x_avg, y_avg); the values are (frequencies x samples) arrays.
+    """
+    phase = np.multiply.outer(2 * np.pi * np.asarray(frequencies, dtype=float), x)
+    shape_x = y * np.sin(phase)
+    shape_y = y * np.cos(phase)
+    return shape_x, shape_y, shape_x.mean(axis=1), shape_y.mean(axis=1)
+
+
+class FrameRenderer:
+    """
+    Agg figure of the winding animation: the wound shape with its average point, the sound
+    and the spectrum with a marker at the winding frequency.
+
+    The static parts are rendered once; a frame restores them and draws only the
+    animated artists (blitting, as fourier.rendering.BlitRenderer does on screen).
+    """
+
+    def __init__(self, scene):
+        """
+        Args:
+            scene: Dictionary of the static data, see make_scene.
+        """
+        self.scene = scene
+        self.figure = Figure(figsize=scene['size'], dpi=scene['dpi'])
+        self.canvas = FigureCanvasAgg(self.figure)
+        self.figure.subplots_adjust(left=0.045, right=1 - 0.045, top=0.95, bottom=0.06, wspace=0.15)
+        grid = self.figure.add_gridspec(4, 10)
+        circle_axes = self.figure.add_subplot(grid[0:4, 0:5])
+        sound_axes = self.figure.add_subplot(grid[0:2, 5:10])
+        freq_axes = self.figure.add_subplot(grid[2:4, 5:10])
+
+        limit = scene['limit']
+        circle_axes.plot(*LineAxes(x_lim1=-limit, x_lim2=limit, y_lim1=-limit, y_lim2=limit).data())
+        circle_axes.plot(*Circle(radius=1).data())
+        circle_axes.set_xlim(-limit, limit)
+        circle_axes.set_ylim(-limit, limit)
+        circle_axes.set_aspect('equal')
+        sound_axes.plot(scene['x'], scene['y'])
+        frequencies, x_avg, y_avg = scene['spectrum']
+        freq_axes.plot(frequencies, x_avg)
+        freq_axes.plot(frequencies, y_avg)
+
+        self.shape = circle_axes.plot([], [])[0]
+        self.avg_point = circle_axes.plot([], [], 'or')[0]
+        self.marker = freq_axes.axvline(frequencies[0], color='k', linewidth=0.8)
+        self.title = circle_axes.set_title('')
+        self.artists = (self.shape, self.avg_point, self.marker, self.title)
+        for artist in self.artists:
+            artist.set_animated(True)
+        self.canvas.draw()
+        self.background = self.canvas.copy_from_bbox(self.figure.bbox)
+
+    def draw(self, frequency, shape_x, shape_y, x_avg, y_avg):
+        """
+        Draws one frame.
+        """
+        self.shape.set_data(shape_x, shape_y)
+        self.avg_point.set_data([x_avg], [y_avg])
+        self.marker.set_xdata([frequency, frequency])
+        self.title.set_text('winding frequency {:.3f}'.format(frequency))
+        self.canvas.restore_region(self.background)
+        for artist in self.artists:
+            self.figure.draw_artist(artist)
+
+    def png(self):
+        """
+        Returns: The last drawn frame as PNG bytes (fast, low compression).
+        """
+        buffer = io.BytesIO()
+        image = Image.frombuffer('RGBA', self.size, self.canvas.buffer_rgba(), 'raw', 'RGBA', 0, 1)
+        image.save(buffer, 'png', compress_level=1)
+        return buffer.getvalue()
+
+    def rgba(self):
+        """
+        Returns: The last drawn frame as raw RGBA bytes (see size).
+        """
+        return bytes(self.canvas.buffer_rgba())
+
+    @property
+    def size(self):
+        """
+        Returns: Tuple(width, height) of a frame in pixels.
+        """
+        return self.canvas.get_width_height()
+
+
+def make_scene(signal, a=0, b=3, step=0.0025, spectrum_range=(1, 10), size=(12.8, 7.2), dpi=100):
+    """
+    Static data of the frames, sent once to every worker.
+
+    Args:
+        signal: Any actor with data(x1, x2, step), e.g. fourier.actors.MultiSineWave.
+        (optional)
+        a: Left boundary of the wound part of the signal.
+        b: Right boundary of the wound part of the signal.
+        step: Step of the samples.
+        spectrum_range: Tuple(first, last) frequency of the spectrum.
+        size: Figure size in inches.
+        dpi: Pixels per inch.
+
+    Returns: Dictionary.
+    """
+    x, y = sample_signal(signal, a, b, step)
+    spectrum = sweep(signal, frequency_range(spectrum_range[0], spectrum_range[1], 0.01), a, b, step=step,
+                     backend='czt')
+    return {'x': x, 'y': y, 'spectrum': spectrum, 'limit': max(1.1, 1.1 * float(np.abs(y).max())),
+            'size': size, 'dpi': dpi}
+
+
+_renderer = None
+
+
+def _init_worker(scene):
+    """
+    Creates the figure of a worker (or the current) process.
+    """
+    global _renderer
+    _renderer = FrameRenderer(scene)
+
+
+def _render_batch(frequencies, starts, repeats, pattern):
+    """
+    Renders a batch of distinct frames.
+
+    Args:
+        frequencies: Winding frequencies of the frames.
+        starts: Output index of the first copy of every frame.
+        repeats: Number of copies of every frame.
+        pattern: PNG file name pattern with the output index, None to return the RGBA frames.
+
+    Returns: Number of written files or a list of RGBA bytes.
+    """
+    shape_x, shape_y, x_avg, y_avg = wound_shapes(_renderer.scene['x'], _renderer.scene['y'], frequencies)
+    images = []
+    written = 0
+    for i, frequency in enumerate(frequencies):
+        _renderer.draw(frequency, shape_x[i], shape_y[i], x_avg[i], y_avg[i])
+        if pattern is None:
+            images.append(_renderer.rgba())
+            continue
+        png = _renderer.png()
+        for index in range(starts[i], starts[i] + repeats[i]):
+            with open(pattern.format(index), 'wb') as file:
+                file.write(png)
+        written += repeats[i]
+    return images if pattern is None else written
+
+
+def _results(tasks, scene, workers, max_pending):
+    """
+    Yields: Results of _render_batch for the tasks, in order.
+    """
+    if workers == 1:
+        _init_worker(scene)
+        for task in tasks:
+            yield _render_batch(*task)
+        return
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(scene,)) as executor:
+        # only a few batches are in flight, so the frames of long exports are not all kept in memory
+        pending = deque()
+        for task in tasks:
+            pending.append(executor.submit(_render_batch, *task))
+            if len(pending) >= max_pending:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+class _FFmpegWriter:
+    """
+    Pipes raw RGBA frames into ffmpeg.
+    """
+
+    def __init__(self, path, fps, size):
+        executable = shutil.which('ffmpeg')
+        if executable is None:
+            raise OSError("ffmpeg not found, needed for {}".format(path))
+        self._frame_bytes = size[0] * size[1] * 4
+        # yuv420p needs an even width and height, odd sizes get a one pixel border
+        self._process = subprocess.Popen(
+            [executable, '-y', '-loglevel', 'error', '-f', 'rawvideo', '-pix_fmt', 'rgba',
+             '-s', '{}x{}'.format(*size), '-r', str(fps), '-i', '-',
+             '-vf', 'pad=ceil(iw/2)*2:ceil(ih/2)*2', '-pix_fmt', 'yuv420p', path],
+            stdin=subprocess.PIPE)
+
+    def write(self, frame, count=1):
+        """
+        Writes a frame count times.
+        """
+        if len(frame) != self._frame_bytes:
+            raise ValueError("Frame has {} bytes instead of {}".format(len(frame), self._frame_bytes))
+        try:
+            for _ in range(count):
+                self._process.stdin.write(frame)
+        except BrokenPipeError:
+            raise OSError("ffmpeg failed with exit status {}".format(self._process.wait())) from None
+
+    def close(self):
+        try:
+            self._process.stdin.close()
+        except BrokenPipeError:
+            pass
+        if self._process.wait():
+            raise OSError("ffmpeg failed with exit status {}".format(self._process.returncode))
+
+    def abort(self):
+        """
+        Stops ffmpeg after an error (the output is incomplete).
+        """
+        self._process.kill()
+        try:
+            self._process.stdin.close()
+        except BrokenPipeError:
+            pass
+        self._process.wait()
+
+
+class _GIFWriter:
+    """
+    Collects raw RGBA frames and saves them as an animated GIF with Pillow.
+
+    Pillow writes a GIF at once, so every distinct frame is kept (as a palette image with
+    one byte per pixel) until close; a repeated frame is one frame with a longer duration.
+    """
+
+    def __init__(self, path, fps, size):
+        self._path = path
+        self._fps = fps
+        self._size = size
+        self._frames = []
+        self._durations = []
+
+    def write(self, frame, count=1):
+        """
+        Adds a frame that is shown for count frame periods.
+        """
+        self._frames.append(Image.frombytes('RGBA', self._size, frame).convert('RGB').quantize())
+        self._durations.append(1000 * count / self._fps)
+
+    def close(self):
+        if self._frames:
+            self._frames[0].save(self._path, save_all=True, append_images=self._frames[1:],
+                                 duration=self._durations, loop=0)
+        self.abort()
+
+    def abort(self):
+        """
+        Drops the collected frames.
+        """
+        self._frames = []
+        self._durations = []
+
+
+def export(signal, output, start_frequency=6, end_frequency=13, frequency_step=0.004, stop_frequencies=(7, 12),
+           pause=5, fps=30, a=0, b=3, step=0.0025, size=(12.8, 7.2), dpi=100, workers=None, batch_size=16):
+    """
+    Renders the winding sweep of a signal.
+
+    Args:
+        signal: Any actor with data(x1, x2, step), e.g. fourier.actors.MultiSineWave.
+        output: Directory of the PNG sequence or a .gif / video file name (see video_formats).
+        (optional)
+        start_frequency, end_frequency, frequency_step, stop_frequencies, pause, fps: See frame_plan.
+        a, b, step, size, dpi: See make_scene.
+        workers: Number of processes (os.cpu_count() by default, 1 renders in this process).
+        batch_size: Number of distinct frames computed and rendered together.
+
+    Returns: Tuple(number of output frames, seconds).
+
+    Raises:
+        ValueError: Batch size has to be positive.
+        ValueError: Too many distinct frames for a GIF (see max_gif_frames).
+        OSError: ffmpeg is needed but not found or failed.
+    """
+    if batch_size <= 0:
+        raise ValueError("Batch size has to be positive: {}".format(batch_size))
+    begin = time.perf_counter()
+    frequencies, repeats = frame_plan(start_frequency, end_frequency, frequency_step, stop_frequencies,
+                                      pause, fps)
+    extension = os.path.splitext(output)[1].lower()
+    if extension == '.gif' and len(frequencies) > max_gif_frames:
+        raise ValueError("A GIF can have at most {} distinct frames, not {}: increase the frequency step "
+                         "or export a video or PNG sequence".format(max_gif_frames, len(frequencies)))
+    starts = np.concatenate(([0], np.cumsum(repeats)[:-1]))
+    scene = make_scene(signal, a, b, step, (min(1, start_frequency), max(10, end_frequency)), size, dpi)
+    workers = workers or os.cpu_count() or 1
+
+    if extension in video_formats or extension == '.gif':
+        pattern = None
+        # the size of the Agg canvas (see FigureCanvasAgg.get_width_height)
+        width, height = int(size[0] * dpi), int(size[1] * dpi)
+        writer = (_GIFWriter if extension == '.gif' else _FFmpegWriter)(output, fps, (width, height))
+    else:
+        os.makedirs(output, exist_ok=True)
+        pattern = os.path.join(output, 'frame_{:05d}.png')
+        writer = None
+
+    tasks = ((frequencies[i:i + batch_size], starts[i:i + batch_size], repeats[i:i + batch_size], pattern)
+             for i in range(0, len(frequencies), batch_size))
+    batch_repeats = (repeats[i:i + batch_size] for i in range(0, len(frequencies), batch_size))
+    try:
+        for result, counts in zip(_results(tasks, scene, workers, 2 * workers), batch_repeats):
+            if writer is None:
+                continue
+            for frame, count in zip(result, counts):
+                writer.write(frame, int(count))
+    except BaseException:
+        if writer is not None:
+            writer.abort()
+        raise
+    if writer is not None:
+        writer.close()
+    return int(repeats.sum()), time.perf_counter() - begin
+
+
+def main(argv=None):
+    """
+    Command line interface, see the module documentation.
+
+    Returns: Exit status.
+    """
+    parser = argparse.ArgumentParser(prog='python -m fourier export', description=__doc__.strip().splitlines()[0])
+    parser.add_argument('output', help='directory of the PNG sequence or a .gif/.mp4/... file')
+    parser.add_argument('--signal', default='3,1', help="signal in the 'freq,amp;freq,amp' syntax of the GUI")
+    parser.add_argument('--start', type=float, default=6, help='first winding frequency')
+    parser.add_argument('--end', type=float, default=13, help='last winding frequency')
+    parser.add_argument('--frequency-step', type=float, default=0.004, help='winding frequency step per frame')
+    parser.add_argument('--stops', type=float, nargs='*', default=[7, 12], help='frequencies to pause at')
+    parser.add_argument('--pause', type=float, default=5, help='seconds of a pause')
+    parser.add_argument('--fps', type=int, default=30)
+    parser.add_argument('--dpi', type=int, default=100)
+    parser.add_argument('--workers', type=int, default=None, help='number of processes')
+    args = parser.parse_args(argv)
+
+    try:
+        signal = MultiSineWave.parse(args.signal)
+        frames, seconds = export(signal, args.output, args.start, args.end, args.frequency_step, args.stops,
+                                 args.pause, args.fps, dpi=args.dpi, workers=args.workers)
+    except (OSError, ValueError) as error:
+        print('error: {}'.format(error), file=sys.stderr)
+        return 1
+    print('{} frames ({:.1f} s at {} fps) in {:.3f} s -> {}'.format(
+        frames, frames / args.fps, args.fps, seconds, args.output))
+    return 0
@@ -1,14 +1,18 @@
 import numpy as np
 
+from fourier.grid import SampleGrid
+from fourier.memory import profiler
+from fourier.numeric import as_array, as_float, block_rows
 # from fourier.actors import Circle, LineAxes, SineWave
 
 
-def average_point_location(x, y):
+def average_point_location(x, y=None):
     """
     Calculates an average location of points.
 
     Args:
-        x: X values.
+        x: X values or complex values (x + iy) when y is not given.
+        (optional)
         y: Y values.
 
     Returns: Tuple - X_avg, Y_avg.
@@ -16,24 +20,132 @@ def average_point_location(x, y):
     Raises:
         ValueError: The length of x-values != length of y-values.
     """
+    if y is None:
+        avg = np.mean(x)
+        return avg.real, avg.imag
     if len(x) != len(y):
         raise ValueError("The length of x-values != length of y-values.")
-    return sum(x) / len(x), sum(y) / len(y)
+    return np.mean(x), np.mean(y)
 
 
-def get_shape(sine_wave, winding_frequency, a, b, step=0.1):
+@profiler.profiled('get_shape')
+def get_shape(sine_wave, winding_frequency, a, b=None, step=0.1, max_block_bytes=None):
     """
     Winds a part of a sine wave around a circle with a winding frequency.
+    The samples are processed in chunks that fit into max_block_bytes.
 
     Args:
         sine_wave: Instance of fourier.actors.SineWave
         winding_frequency: Winding frequency.
-        a: Left boundary.
-        b: Right boundary.
+        a: Left boundary or an instance of fourier.grid.SampleGrid.
+        b: Right boundary (not used with a SampleGrid).
         (optional)
-        step: Step of the calculation.
+        step: Step of the calculation (not used with a SampleGrid).
+        max_block_bytes: See fourier.numeric.block_rows.
     
-    Returns: Instance of numpy.ndarray with imaginary part.
+    Returns: Tuple(x values, y values) of the wound shape.
+
+    Raises:
+        ValueError: Winding Frequency must be positive.
+        ValueError: The following condition must be true: a < b.
+    """
+    if winding_frequency <= 0:
+        raise ValueError("Winding Frequency must be positive.")
+    grid = interval_grid(a, b, step)
+    x = grid.values
+    omega = 2 * np.pi * as_float(winding_frequency)
+    y = as_array(sine_wave.data(grid.start, grid.stop, step=grid.step)[1])
+    real = np.empty(len(y), dtype=np.result_type(x, y))
+    imag = np.empty_like(real)
+    # phase, sin and cos of a chunk are alive at the same time
+    rows = block_rows(len(y), 1, real.itemsize, arrays=3, max_block_bytes=max_block_bytes)
+    for i in range(0, len(y), rows):
+        chunk = slice(i, i + rows)
+        phase = omega * x[chunk]
+        sin = np.sin(phase)
+        cos = np.cos(phase)
+        profiler.track(phase, sin, cos)
+        np.multiply(y[chunk], sin, out=real[chunk])
+        np.multiply(y[chunk], cos, out=imag[chunk])
+    return real, imag
+
+
+summations = ('dot', 'pairwise', 'compensated')
+
+
+@profiler.profiled('winding_centroid')
+def winding_centroid(signal, winding_frequencies, a, b=None, step=0.1, summation='dot',
+                     max_block_bytes=None):
+    """
+    Average point of the wound shape (get_shape followed by average_point_location)
+    without creating the shape arrays.
+
+    Summations:
+        dot: Matrix-vector product (fastest).
+        pairwise: numpy pairwise summation of the products.
+        compensated: Dot products of short chunks combined with Neumaier summation (most accurate).
+
+    Args:
+        signal: Any actor with data(x1, x2, step), e.g. fourier.actors.MultiSineWave.
+        winding_frequencies: Winding frequency or an array of them.
+        a: Left boundary or an instance of fourier.grid.SampleGrid.
+        b: Right boundary (not used with a SampleGrid).
+        (optional)
+        step: Step of the calculation (not used with a SampleGrid).
+        summation: Name of the summation, see above.
+        max_block_bytes: See fourier.numeric.block_rows.
+
+    Returns: Tuple - X_avg, Y_avg (arrays shaped like winding_frequencies).
+
+    Raises:
+        ValueError: Winding Frequency must be positive.
+        ValueError: The following condition must be true: a < b.
+        ValueError: The signal has no samples.
+        ValueError: Unknown summation.
+    """
+    if summation not in summations:
+        raise ValueError("Unknown summation: {}".format(summation))
+    winding_frequencies = winding_frequency_array(winding_frequencies)
+    x, y = sample_signal(signal, a, b, step)
+    x_avg, y_avg = centroid_from_samples(x, y, winding_frequencies.reshape(-1), summation, max_block_bytes)
+    return x_avg.reshape(winding_frequencies.shape), y_avg.reshape(winding_frequencies.shape)
+
+
+def iter_chunks(signal, a, b=None, step=0.1, chunk_size=65536):
+    """
+    Samples a signal on the interval [a, b] in chunks of at most chunk_size samples.
+    The chunks are read with data(..., cache=False), so they do not fill (and evict
+    the entries of) fourier.cache.data_cache and only one chunk is alive at a time.
+
+    Args:
+        signal: Any actor with data(x1, x2, step, cache), e.g. fourier.actors.MultiSineWave.
+        a: Left boundary or an instance of fourier.grid.SampleGrid.
+        b: Right boundary (not used with a SampleGrid).
+        (optional)
+        step: Step of the calculation (not used with a SampleGrid).
+        chunk_size: Maximal number of samples of a chunk.
+
+    Yields: Tuple(x_values, y_values) as arrays (see fourier.numeric.as_array).
+
+    Raises:
+        ValueError: The following condition must be true: a < b.
+        ValueError: Chunk size has to be positive.
+    """
+    if chunk_size <= 0:
+        raise ValueError("Chunk size has to be positive: {}".format(chunk_size))
+    grid = interval_grid(a, b, step)
+    for i in range(0, len(grid), chunk_size):
+        last = min(i + chunk_size, len(grid)) - 1
+        chunk = SampleGrid(grid.start + i * grid.step, grid.start + last * grid.step, grid.step)
+        x, y = signal.data(chunk.start, chunk.stop, step=chunk.step, cache=False)
+        yield as_array(x), as_array(y)
+
+
+def iter_shape(signal, winding_frequency, a, b=None, step=0.1, chunk_size=65536):
+    """
+    get_shape in chunks of at most chunk_size points (see iter_chunks).
+
+    Yields: Tuple(x values, y values) of the wound shape.
 
     Raises:
         ValueError: Winding Frequency must be positive.
@@ -41,9 +153,252 @@ def get_shape(sine_wave, winding_frequency, a, b, step=0.1):
     """
     if winding_frequency <= 0:
         raise ValueError("Winding Frequency must be positive.")
+    omega = 2 * np.pi * as_float(winding_frequency)
+    for x, y in iter_chunks(signal, a, b, step, chunk_size):
+        yield y * np.sin(omega * x), y * np.cos(omega * x)
+
+
+def streaming_centroid(signal, winding_frequencies, a, b=None, step=0.1, chunk_size=65536,
+                       shape_points=None, max_block_bytes=None):
+    """
+    winding_centroid that walks [a, b] in chunks (see iter_chunks), so the memory use
+    depends on chunk_size but not on the length of the interval.
+
+    Args:
+        signal: Any actor with data(x1, x2, step, cache), e.g. fourier.actors.MultiSineWave.
+        winding_frequencies: Winding frequency or an array of them.
+        a: Left boundary or an instance of fourier.grid.SampleGrid.
+        b: Right boundary (not used with a SampleGrid).
+        (optional)
+        step: Step of the calculation (not used with a SampleGrid).
+        chunk_size: Maximal number of samples of a chunk.
+        shape_points: Also return the wound shape of a single winding frequency,
+            decimated to at most about shape_points points for display.
+        max_block_bytes: See fourier.numeric.block_rows.
+
+    Returns: Tuple - X_avg, Y_avg (arrays shaped like winding_frequencies)
+        and with shape_points also Tuple(x values, y values) of the decimated shape.
+
+    Raises:
+        ValueError: Winding Frequency must be positive.
+        ValueError: The following condition must be true: a < b.
+        ValueError: The signal has no samples.
+        ValueError: shape_points needs a single winding frequency.
+    """
+    winding_frequencies = winding_frequency_array(winding_frequencies)
+    flat = winding_frequencies.reshape(-1)
+    if shape_points is not None and len(flat) != 1:
+        raise ValueError("shape_points needs a single winding frequency.")
+    grid = interval_grid(a, b, step)
+    stride = -(-len(grid) // shape_points) if shape_points else None
+    x_sum = np.zeros(len(flat))
+    y_sum = np.zeros(len(flat))
+    x_avg, y_avg = np.empty(len(flat)), np.empty(len(flat))
+    shape_parts = []
+    count = 0
+    for x, y in iter_chunks(signal, grid, chunk_size=chunk_size):
+        if len(y) == 0:
+            continue
+        centroid_from_samples(x, y, flat, max_block_bytes=max_block_bytes, out=(x_avg, y_avg))
+        x_sum += x_avg * len(y)
+        y_sum += y_avg * len(y)
+        if stride:
+            # every stride-th point of the whole shape
+            keep = slice((-count) % stride, None, stride)
+            omega = 2 * np.pi * flat[0]
+            shape_parts.append((y[keep] * np.sin(omega * x[keep]), y[keep] * np.cos(omega * x[keep])))
+        count += len(y)
+    if count == 0:
+        raise ValueError("The signal has no samples.")
+    centroid = (x_sum / count).reshape(winding_frequencies.shape), (y_sum / count).reshape(winding_frequencies.shape)
+    if stride:
+        return centroid + ((np.concatenate([part[0] for part in shape_parts]),
+                            np.concatenate([part[1] for part in shape_parts])),)
+    return centroid
+
+
+def dominant_frequencies(frequencies, x_avg, y_avg, k=3):
+    """
+    Finds the k highest peaks of the magnitude of a spectrum (e.g. the result of
+    fourier.sweep.sweep). Each peak is refined between the grid points with a parabola
+    through the peak and its neighbours, so the frequencies need not be evenly spaced.
+    Runs in linear time.
+
+    Args:
+        frequencies: Increasing winding frequencies.
+        x_avg: X_avg values of the frequencies.
+        y_avg: Y_avg values of the frequencies.
+        (optional)
+        k: Maximal number of peaks.
+
+    Returns: Tuple(frequencies, magnitudes, phases) of the peaks sorted by decreasing
+        magnitude. The magnitude is the distance of the average point from the origin
+        (half the amplitude of a component), the phase is its angle.
+
+    Raises:
+        ValueError: The spectrum arrays have different lengths.
+    """
+    frequencies = as_array(frequencies, dtype=float)
+    z = as_array(x_avg, dtype=float) + 1j * as_array(y_avg, dtype=float)
+    if len(frequencies) != len(z):
+        raise ValueError("The spectrum arrays have different lengths.")
+    magnitude = np.abs(z)
+    peaks = np.flatnonzero((magnitude[1:-1] > magnitude[:-2]) & (magnitude[1:-1] >= magnitude[2:])) + 1
+    if len(peaks) > k > 0:
+        peaks = peaks[np.argpartition(-magnitude[peaks], k - 1)[:k]]
+    elif k <= 0:
+        peaks = peaks[:0]
+    peaks = peaks[np.argsort(-magnitude[peaks])]
+
+    f0, f1, f2 = frequencies[peaks - 1], frequencies[peaks], frequencies[peaks + 1]
+    m0, m1, m2 = magnitude[peaks - 1], magnitude[peaks], magnitude[peaks + 1]
+    # vertex of the parabola through (f0, m0), (f1, m1), (f2, m2)
+    numerator = (f1 - f0) ** 2 * (m1 - m2) - (f1 - f2) ** 2 * (m1 - m0)
+    denominator = (f1 - f0) * (m1 - m2) - (f1 - f2) * (m1 - m0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        offset = np.where(denominator != 0, 0.5 * numerator / denominator, 0.0)
+    peak_frequencies = f1 - offset
+    # Lagrange form of the parabola evaluated at its vertex
+    with np.errstate(divide='ignore', invalid='ignore'):
+        peak_magnitudes = (m0 * (peak_frequencies - f1) * (peak_frequencies - f2) / ((f0 - f1) * (f0 - f2))
+                           + m1 * (peak_frequencies - f0) * (peak_frequencies - f2) / ((f1 - f0) * (f1 - f2))
+                           + m2 * (peak_frequencies - f0) * (peak_frequencies - f1) / ((f2 - f0) * (f2 - f1)))
+    # the average point between the grid points, by linear interpolation
+    right = peak_frequencies > f1
+    neighbour = np.where(right, peaks + 1, peaks - 1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        weight = np.nan_to_num((peak_frequencies - f1) / (frequencies[neighbour] - f1))
+    phases = np.angle(z[peaks] + weight * (z[neighbour] - z[peaks]))
+    return peak_frequencies, peak_magnitudes, phases
+
+
+def winding_frequency_array(winding_frequencies):
+    """
+    Returns: winding_frequencies as a float array.
+
+    Raises:
+        ValueError: Winding Frequency must be positive.
+    """
+    winding_frequencies = as_array(winding_frequencies, dtype=float)
+    if np.any(winding_frequencies <= 0):
+        raise ValueError("Winding Frequency must be positive.")
+    return winding_frequencies
+
+
+def sample_signal(signal, a, b=None, step=0.1):
+    """
+    Samples a signal on the interval [a, b].
+
+    Args:
+        signal: Any actor with data(x1, x2, step), e.g. fourier.actors.MultiSineWave.
+        a: Left boundary or an instance of fourier.grid.SampleGrid.
+        b: Right boundary (not used with a SampleGrid).
+        (optional)
+        step: Step of the calculation (not used with a SampleGrid).
+
+    Returns: Tuple(x_values, y_values) as arrays (see fourier.numeric.as_array).
+
+    Raises:
+        ValueError: The following condition must be true: a < b.
+        ValueError: The signal has no samples.
+    """
+    grid = interval_grid(a, b, step)
+    x, y = signal.data(grid.start, grid.stop, step=grid.step)
+    x = as_array(x)
+    y = as_array(y)
+    if len(y) == 0:
+        raise ValueError("The signal has no samples.")
+    return x, y
+
+
+def centroid_from_samples(x, y, frequencies, summation='dot', max_block_bytes=None, out=None):
+    """
+    winding_centroid for already sampled x, y and a 1-d array of (checked) frequencies.
+
+    Args:
+        out: Tuple of two float arrays as long as frequencies to write the result into.
+
+    Returns: Tuple - X_avg, Y_avg arrays (out if given).
+    """
+    if out is None:
+        out = np.empty(len(frequencies)), np.empty(len(frequencies))
+    x_sum, y_sum = out
+    rows = centroid_block_rows(len(frequencies), x, max_block_bytes)
+    # shorter than x only when a single frequency exceeds the budget
+    columns = block_rows(len(x), 1, x.itemsize, arrays=3, max_block_bytes=max_block_bytes)
+    for i in range(0, len(frequencies), rows):
+        block = slice(i, i + rows)
+        n = len(frequencies[block])
+        # the compensation of the compensated summation continues across the column chunks
+        x_carry = np.zeros(n), np.zeros(n)
+        y_carry = np.zeros(n), np.zeros(n)
+        x_sum[block] = 0
+        y_sum[block] = 0
+        for j in range(0, len(x), columns):
+            chunk = slice(j, j + columns)
+            phase = np.multiply.outer(2 * np.pi * frequencies[block], x[chunk])
+            sin = np.sin(phase)
+            cos = np.cos(phase)
+            profiler.track(phase, sin, cos)
+            if summation == 'compensated':
+                x_sum[block] = _reduce(sin, y[chunk], summation, carry=x_carry)
+                y_sum[block] = _reduce(cos, y[chunk], summation, carry=y_carry)
+            else:
+                x_sum[block] += _reduce(sin, y[chunk], summation)
+                y_sum[block] += _reduce(cos, y[chunk], summation)
+    x_sum /= len(y)
+    y_sum /= len(y)
+    return x_sum, y_sum
+
+
+def centroid_block_rows(n_frequencies, x, max_block_bytes=None):
+    """
+    Returns: Number of frequencies that centroid_from_samples processes in one block.
+    """
+    # phase, sin and cos arrays are alive at the same time
+    return block_rows(n_frequencies, len(x), x.itemsize, arrays=3, max_block_bytes=max_block_bytes)
+
+
+def _reduce(matrix, vector, summation, chunk=256, carry=None):
+    """
+    Args:
+        (optional)
+        carry: Tuple(total, compensation) arrays of the compensated summation of earlier
+            columns, updated in place (the result includes them).
+
+    Returns: matrix @ vector computed with the summation.
+    """
+    if summation == 'dot':
+        return matrix @ vector
+    if summation == 'pairwise':
+        return (matrix * vector).sum(axis=1)
+    if carry is None:
+        carry = np.zeros(len(matrix)), np.zeros(len(matrix))
+    total, compensation = carry
+    for i in range(0, len(vector), chunk):
+        value = matrix[:, i:i + chunk] @ vector[i:i + chunk]
+        new_total = total + value
+        compensation += np.where(np.abs(total) >= np.abs(value),
+                                 (total - new_total) + value, (value - new_total) + total)
+        total[...] = new_total
+    return total + compensation
+
+
+def interval_grid(a, b=None, step=0.1):
+    """
+    Args:
+        a: Left boundary or an instance of fourier.grid.SampleGrid.
+        b: Right boundary (not used with a SampleGrid).
+        (optional)
+        step: Step of the grid (not used with a SampleGrid).
+
+    Returns: SampleGrid of the interval [a, b].
+
+    Raises:
+        ValueError: The following condition must be true: a < b.
+    """
+    if isinstance(a, SampleGrid):
+        a, b, step = a.start, a.stop, a.step
     if a >= b:
         raise ValueError("The following condition must be true: a < b.")
-    x = np.arange(a, b + step, step)
-    omega = 2 * np.pi * winding_frequency
-    shape = sine_wave.data(a, b, step=step)[1] * (np.sin(omega * x) + 1j * np.cos(omega * x))
-    return shape.real, shape.imag
+    return SampleGrid(a, b, step)
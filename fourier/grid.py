@@ -0,0 +1,122 @@
+import threading
+import weakref
+
+import numpy as np
+
+from fourier import numeric
+
+
+class SampleGrid:
+    """
+    Immutable, interned grid of evenly spaced sample locations start, start + step, ..., stop.
+
+    Grids with the same boundaries and step are the same object, so they share the
+    sample buffer and can be used as (cache) keys.
+    """
+
+    __slots__ = ('_start', '_stop', '_step', '_length', '_buffers', '__weakref__')
+
+    _instances = weakref.WeakValueDictionary()
+    _lock = threading.Lock()
+
+    def __new__(cls, start, stop, step):
+        """
+        Args:
+            start: First sample location.
+            stop: Last sample location (included if it lies on the grid).
+            step: Distance between two samples.
+
+        Raises:
+            ValueError: Step has to be positive.
+            ValueError: The left boundary is greater than the right boundary.
+        """
+        start, stop, step = float(start), float(stop), float(step)
+        if step <= 0:
+            raise ValueError("Step has to be positive: {}".format(step))
+        if start > stop:
+            raise ValueError("The left boundary is greater than the right boundary.")
+        key = (start, stop, step)
+        with cls._lock:
+            grid = cls._instances.get(key)
+            if grid is None:
+                grid = super().__new__(cls)
+                object.__setattr__(grid, '_start', start)
+                object.__setattr__(grid, '_stop', stop)
+                object.__setattr__(grid, '_step', step)
+                # the tolerance keeps stop on the grid despite rounding of (stop - start) / step
+                object.__setattr__(grid, '_length', int(np.floor((stop - start) / step + 1e-9)) + 1)
+                object.__setattr__(grid, '_buffers', {})
+                cls._instances[key] = grid
+            return grid
+
+    def __repr__(self):  # pragma: no cover
+        return "SampleGrid(start={}, stop={}, step={})".format(self.start, self.stop, self.step)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("SampleGrid is immutable.")
+
+    def __reduce__(self):
+        return SampleGrid, (self.start, self.stop, self.step)
+
+    def __len__(self):
+        return self._length
+
+    def __eq__(self, other):
+        if not isinstance(other, SampleGrid):
+            return NotImplemented
+        return (self.start, self.stop, self.step) == (other.start, other.stop, other.step)
+
+    def __hash__(self):
+        return hash((SampleGrid, self.start, self.stop, self.step))
+
+    @property
+    def start(self):
+        """
+        Returns: First sample location.
+        """
+        return self._start
+
+    @property
+    def stop(self):
+        """
+        Returns: Right boundary.
+        """
+        return self._stop
+
+    @property
+    def step(self):
+        """
+        Returns: Distance between two samples.
+        """
+        return self._step
+
+    @property
+    def values(self):
+        """
+        Returns: Read-only array of the sample locations (fourier.numeric.default_dtype).
+        """
+        return self.array(numeric.default_dtype)
+
+    def array(self, dtype):
+        """
+        Args:
+            dtype: Floating point type.
+
+        Returns: Read-only array of the sample locations, computed once per dtype.
+        """
+        dtype = np.dtype(dtype)
+        buffer = self._buffers.get(dtype)
+        if buffer is None:
+            buffer = (self.start + self.step * np.arange(len(self))).astype(dtype, copy=False)
+            buffer.flags.writeable = False
+            self._buffers[dtype] = buffer
+        return buffer
+
+
+def as_grid(x1, x2=None, step=None):
+    """
+    Returns x1 if it is a SampleGrid, otherwise SampleGrid(x1, x2, step).
+    """
+    if isinstance(x1, SampleGrid):
+        return x1
+    return SampleGrid(x1, x2, step)
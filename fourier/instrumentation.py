@@ -0,0 +1,206 @@
+import contextlib
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+
+class _Span:
+    """
+    Context manager that records the duration of one stage.
+    """
+
+    __slots__ = ('_tracer', '_name', '_start')
+
+    def __init__(self, tracer, name):
+        self._tracer = tracer
+        self._name = name
+
+    def __enter__(self):
+        self._start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._tracer.record(self._name, self._start, time.perf_counter_ns() - self._start)
+        return False
+
+
+_disabled_span = contextlib.nullcontext()
+
+
+class Tracer:
+    """
+    Timing spans of named stages (e.g. 'parse', 'compute_spectrum', 'draw').
+
+    Keeps the latest durations of every stage for rolling percentiles, the times of the
+    latest frames for the frame rate and the latest spans for export as a Chrome trace
+    (chrome://tracing, Perfetto). A disabled tracer records nothing; its span is a shared
+    no-op context manager.
+    """
+
+    def __init__(self, enabled=False, window=256, max_events=100000):
+        """
+        Args:
+            (optional)
+            enabled: Record spans.
+            window: Number of durations per stage for the percentiles.
+            max_events: Number of spans kept for the trace export.
+        """
+        self.enabled = enabled
+        self.window = window
+        self._durations = {}
+        self._frames = deque(maxlen=window)
+        self._events = deque(maxlen=max_events)
+        self._lock = threading.Lock()
+
+    def __repr__(self):  # pragma: no cover
+        return "Tracer(enabled={}, window={})".format(self.enabled, self.window)
+
+    def span(self, name):
+        """
+        Returns: Context manager that records its duration as the stage name.
+        """
+        if not self.enabled:
+            return _disabled_span
+        return _Span(self, name)
+
+    def wrap(self, name, function):
+        """
+        Returns: function recorded as the stage name while the tracer is enabled.
+        """
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not self.enabled:
+                return function(*args, **kwargs)
+            with _Span(self, name):
+                return function(*args, **kwargs)
+        return wrapper
+
+    def record(self, name, start, duration):
+        """
+        Records a span.
+
+        Args:
+            name: Name of the stage.
+            start: Start in nanoseconds (time.perf_counter_ns).
+            duration: Duration in nanoseconds.
+        """
+        with self._lock:
+            durations = self._durations.get(name)
+            if durations is None:
+                durations = self._durations[name] = deque(maxlen=self.window)
+            durations.append(duration)
+            self._events.append((name, start, duration, threading.get_ident()))
+
+    def mark_frame(self):
+        """
+        Records that a frame was shown.
+        """
+        if self.enabled:
+            self._frames.append(time.perf_counter())
+
+    def fps(self):
+        """
+        Returns: Frames per second over the latest frames (0 with less than two).
+        """
+        frames = list(self._frames)
+        if len(frames) < 2 or frames[-1] == frames[0]:
+            return 0.0
+        return (len(frames) - 1) / (frames[-1] - frames[0])
+
+    def percentiles(self, name, q=(50, 95)):
+        """
+        Returns: Array of the percentiles q of the latest durations of the stage in milliseconds
+            (None if the stage has no spans).
+        """
+        with self._lock:
+            durations = self._durations.get(name)
+            durations = None if not durations else np.array(durations)
+        if durations is None:
+            return None
+        return np.percentile(durations, q) / 1e6
+
+    def stats(self):
+        """
+        Returns: Dictionary of stage names and (number of latest spans, p50 ms, p95 ms).
+        """
+        with self._lock:
+            names = sorted(self._durations)
+        result = {}
+        for name in names:
+            p50, p95 = self.percentiles(name)
+            result[name] = (len(self._durations[name]), p50, p95)
+        return result
+
+    def summary(self):
+        """
+        Returns: Text with the frame rate and the p50/p95 of every stage.
+        """
+        lines = ['FPS {:.1f}'.format(self.fps())]
+        for name, (count, p50, p95) in self.stats().items():
+            lines.append('{} p50 {:.2f} ms p95 {:.2f} ms'.format(name, p50, p95))
+        return '\n'.join(lines)
+
+    def export_chrome_trace(self, path):
+        """
+        Writes the recorded spans as Chrome trace JSON (complete events, microseconds).
+
+        Returns: Number of written spans.
+        """
+        with self._lock:
+            events = list(self._events)
+        pid = os.getpid()
+        trace = {
+            'traceEvents': [{'name': name, 'ph': 'X', 'ts': start / 1000, 'dur': duration / 1000,
+                             'pid': pid, 'tid': tid} for name, start, duration, tid in events],
+            'displayTimeUnit': 'ms',
+        }
+        with open(path, 'w') as file:
+            json.dump(trace, file)
+        return len(events)
+
+    def reset(self):
+        """
+        Removes all recorded spans and frames.
+        """
+        with self._lock:
+            self._durations.clear()
+            self._frames.clear()
+            self._events.clear()
+
+
+class LatencyOverlay:
+    """
+    Text in the corner of a matplotlib figure with the summary of a tracer.
+    """
+
+    def __init__(self, figure, tracer):
+        """
+        Args:
+            figure: matplotlib figure.
+            tracer: Instance of Tracer.
+        """
+        self.tracer = tracer
+        self.text = figure.text(0.005, 0.995, '', va='top', ha='left', family='monospace', fontsize=7,
+                                visible=False, bbox={'facecolor': 'white', 'alpha': 0.7, 'edgecolor': 'none'})
+
+    def update(self):
+        """
+        Shows the current summary of the tracer (hidden while it is disabled).
+
+        Returns: The text artist.
+        """
+        self.text.set_visible(self.tracer.enabled)
+        if self.tracer.enabled:
+            self.text.set_text(self.tracer.summary())
+        return self.text
+
+
+tracer = Tracer(enabled=bool(os.environ.get('FOURIER_TRACE')))
+"""
+Tracer of the GUI stages, enabled by a non-empty FOURIER_TRACE environment variable.
+"""
@@ -0,0 +1,62 @@
+"""
+Computations of the GUI (run on the worker threads of fourier.scheduler) that the
+batch CLI shares.
+"""
+import numpy as np
+
+from fourier.disk_cache import cache_key, spectrum_cache
+from fourier.fourier import average_point_location, get_shape
+from fourier.spectrogram import spectrogram
+from fourier.sweep import adaptive_sweep, frequency_range, sweep
+
+
+def compute_shape(multi_sine_wave, winding_frequency):
+    """
+    Returns: Tuple(shape, average point) for the circle axes.
+    """
+    shape = get_shape(multi_sine_wave, winding_frequency, 0, 10, step=0.01)
+    return shape, average_point_location(*shape)
+
+
+def compute_spectrum(multi_sine_wave, start, end, backend, ideal, adaptive=False, step=0.01):
+    """
+    Spectrum of the signal, read from the disk cache when it was computed before.
+
+    Returns: Tuple(frequencies, x_avg values, y_avg values, ideal (x_avg, y_avg) values or None).
+    """
+    key = cache_key('spectrum', multi_sine_wave.parameters(), start, end, step, backend, ideal, adaptive)
+
+    def compute():
+        if adaptive:
+            x, y1, y2 = adaptive_sweep(multi_sine_wave, start, end, start, end, step=step, backend=backend)
+        else:
+            x, y1, y2 = sweep(multi_sine_wave, frequency_range(start, end, step), start, end, step=step,
+                              backend=backend)
+        ideal_values = multi_sine_wave.centroid(x, start, end) if ideal else ()
+        return (x, y1, y2) + tuple(ideal_values)
+
+    rows = spectrum_cache.get_or_compute(key, compute)
+    return rows[0], rows[1], rows[2], rows[3:] if ideal else None
+
+
+def compute_all(multi_sine_wave, winding_frequency, start, end, backend, ideal, adaptive=False):
+    """
+    Returns: Tuple(sound values, compute_shape result, compute_spectrum result).
+    """
+    sound_values = multi_sine_wave.data(x1=0, x2=10, step=0.01)
+    return (sound_values, compute_shape(multi_sine_wave, winding_frequency),
+            compute_spectrum(multi_sine_wave, start, end, backend, ideal, adaptive))
+
+
+def compute_spectrogram(multi_sine_wave, t0, t1, start, end, window_length, max_windows=400,
+                        n_frequencies=200, step=0.01):
+    """
+    Spectrogram of the time range [t0, t1] (e.g. the visible part of the sound axes).
+    The hop grows with the range, so there are at most about max_windows windows.
+
+    Returns: Tuple(times, frequencies, magnitudes (frequencies x windows)).
+    """
+    hop = max(window_length / 4, (t1 - t0 - window_length) / max_windows)
+    times, frequencies, x_avg, y_avg = spectrogram(multi_sine_wave, np.linspace(start, end, n_frequencies),
+                                                   t0, t1, step=step, window_length=window_length, hop=hop)
+    return times, frequencies, np.hypot(x_avg, y_avg).T
@@ -0,0 +1,106 @@
+import numpy as np
+
+from fourier.numeric import as_array
+
+
+def minmax_decimate(x, y, x_min, x_max, columns):
+    """
+    Reduces a line with increasing x values to its minimum and maximum in each of columns
+    equally wide columns between x_min and x_max. Drawn with one column per pixel,
+    the result looks like the full line.
+
+    Args:
+        x: Increasing x values.
+        y: Y values.
+        x_min: Left boundary of the visible range.
+        x_max: Right boundary of the visible range.
+        columns: Number of columns (pixels).
+
+    Returns: Tuple(x values, y values); views of the input when it is not longer than 2 * columns.
+    """
+    x = as_array(x)
+    y = as_array(y)
+    # one point beyond each boundary, so that the line reaches the edges of the view
+    start = max(np.searchsorted(x, x_min, side='left') - 1, 0)
+    stop = min(np.searchsorted(x, x_max, side='right') + 1, len(x))
+    x = x[start:stop]
+    y = y[start:stop]
+    columns = max(int(columns), 1)
+    if len(x) <= 2 * columns or x_max <= x_min:
+        return x, y
+
+    edges = np.linspace(x_min, x_max, columns + 1)
+    starts = np.searchsorted(x, edges[:-1], side='left')
+    ends = np.searchsorted(x, edges[1:], side='left')
+    ends[-1] = np.searchsorted(x, x_max, side='right')
+    filled = ends > starts
+    if not filled.any():
+        return x, y
+    starts = starts[filled]
+    centers = ((edges[:-1] + edges[1:]) / 2)[filled]
+    minimums = np.minimum.reduceat(y, starts)
+    maximums = np.maximum.reduceat(y, starts)
+    # reduceat reduces up to the next start; the points past the last column are cut off
+    last = ends[filled][-1]
+    if last < len(y):
+        minimums[-1] = y[starts[-1]:last].min()
+        maximums[-1] = y[starts[-1]:last].max()
+
+    x_out = np.repeat(centers, 2)
+    y_out = np.empty(len(x_out))
+    y_out[0::2] = minimums
+    y_out[1::2] = maximums
+    return (np.concatenate(([x[0]], x_out, [x[-1]])), np.concatenate(([y[0]], y_out, [y[-1]])))
+
+
+class LODLine:
+    """
+    Level of detail for a matplotlib line with increasing x values.
+
+    Keeps the full data and shows its min-max envelope (see minmax_decimate) with one
+    column per pixel of the axes. The envelope is recomputed when the x limits change,
+    e.g. when zooming with the navigation toolbar.
+    """
+
+    def __init__(self, line, x=(), y=()):
+        """
+        Args:
+            line: Instance of matplotlib.lines.Line2D.
+            (optional)
+            x: Increasing x values.
+            y: Y values.
+        """
+        self.line = line
+        self.axes = line.axes
+        self._x = as_array(x)
+        self._y = as_array(y)
+        self._connection = self.axes.callbacks.connect('xlim_changed', lambda axes: self.refresh())
+        self.set_data(x, y)
+
+    def set_data(self, x, y):
+        """
+        Sets new full data and shows its envelope over the whole data range.
+        """
+        self._x = as_array(x)
+        self._y = as_array(y)
+        if len(self._x):
+            self._show(self._x[0], self._x[-1])
+        else:
+            self.line.set_data(self._x, self._y)
+
+    def refresh(self):
+        """
+        Shows the envelope of the data in the current x limits of the axes.
+        """
+        if len(self._x):
+            self._show(*sorted(self.axes.get_xlim()))
+
+    def disconnect(self):
+        """
+        Stops following the x limits of the axes.
+        """
+        self.axes.callbacks.disconnect(self._connection)
+
+    def _show(self, x_min, x_max):
+        columns = self.axes.get_window_extent().width
+        self.line.set_data(*minmax_decimate(self._x, self._y, x_min, x_max, columns))
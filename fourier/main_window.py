@@ -1,10 +1,15 @@
-import time
-
+import numpy as np
 from matplotlib import pyplot as plt
 from matplotlib.animation import FuncAnimation
 
 from fourier.actors import Circle, LineAxes, SineWave, MultiSineWave
+from fourier.disk_cache import cache_key, spectrum_cache
+from fourier.export import frame_plan
 from fourier.fourier import average_point_location, get_shape
+from fourier.instrumentation import LatencyOverlay, tracer
+from fourier.lod import LODLine
+from fourier.sweep import frequency_range, sweep
+from fourier.winding import IncrementalWinding
 
 def main_window(show=True):
     fig = plt.figure()
@@ -30,7 +35,17 @@ def main_window(show=True):
     # wave.append(wave2)
     # wave.append(wave3)
 
-    sound_graph.plot(*wave.data(x1=0, x2=5, step=0.01))
+    sound_line = LODLine(sound_graph.plot([], [])[0], *wave.data(x1=0, x2=5, step=0.01))
+    sound_graph.relim()
+    sound_graph.autoscale_view()
+
+    # read from the disk cache when the same wave was shown before
+    spectrum = spectrum_cache.get_or_compute(
+        cache_key('spectrum', wave.parameters(), 1, 10, 0.01, 0, 3, 0.0025, 'czt'),
+        lambda: sweep(wave, frequency_range(1, 10, 0.01), 0, 3, step=0.0025, backend='czt'))
+    fourier_lines = [LODLine(fourier_graph.plot([], [])[0], spectrum[0], values) for values in spectrum[1:]]
+    fourier_graph.relim()
+    fourier_graph.autoscale_view()
 
     shape = get_shape(wave, 1, 0, 2, step=0.005)
     avg_point = average_point_location(*shape)
@@ -43,29 +58,36 @@ def main_window(show=True):
     fourier_graph.axis('equal')
 
     stop_freqs = [7, 12]
+    d = 250
+    interval = 10
+    winding = IncrementalWinding(wave, 6, 1 / d, 0, 3, step=0.0025)
+    # the sweep holds the stop frequencies for 5 s by repeating their frames;
+    # python -m fourier export renders the same sweep into a video
+    frequencies, repeats = frame_plan(6, 13, 1 / d, stop_freqs, pause=5, fps=1000 / interval)
+    frame_indices = np.repeat(np.arange(len(frequencies)), repeats)
+
+    # FOURIER_TRACE=1 shows the frame rate and the stage latencies
+    overlay = LatencyOverlay(fig, tracer)
 
     def animate(i):  # pragma: no cover
         nonlocal shape_g, avg_point_g
-        d = 250
-        winding_freq = 6 + i / d
-
-        if winding_freq - 1 / d % 1 == 0:
-            time.sleep(5)
-
-        new_shape = get_shape(wave, winding_freq, 0, 3, step=0.0025)
-        new_avg_point = average_point_location(*new_shape)
 
-        shape_g.set_data(new_shape[0], new_shape[1])
-        avg_point_g.set_data([new_avg_point[0]], [new_avg_point[1]])
+        with tracer.span('winding'):
+            winding.frame(frame_indices[i % len(frame_indices)])
+            new_shape = winding.shape
+            new_avg_point = winding.centroid
 
-        if winding_freq in stop_freqs:
-            print(winding_freq)
-            plt.savefig("D:\\img_{!r}_{!r}.png".format(wave, winding_freq))
+        with tracer.span('set_data'):
+            shape_g.set_data(new_shape[0], new_shape[1])
+            avg_point_g.set_data([new_avg_point[0]], [new_avg_point[1]])
+        tracer.mark_frame()
 
+        if tracer.enabled:
+            return shape_g, avg_point_g, overlay.update()
         return shape_g, avg_point_g
 
 
-    ani = FuncAnimation(fig, animate, interval=10, blit=True)
+    ani = FuncAnimation(fig, animate, interval=interval, blit=True)
     if show:  # pragma: no cover
         plt.show()
     
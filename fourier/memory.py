@@ -0,0 +1,233 @@
+import functools
+import os
+import threading
+import tracemalloc
+
+
+class _Call:
+    """
+    Memory use of one running profiled call.
+    """
+
+    __slots__ = ('name', 'start', 'outermost', 'child_peak', 'temporaries', 'temporary_bytes')
+
+    def __init__(self, name, start, outermost):
+        self.name = name
+        self.start = start
+        self.outermost = outermost
+        self.child_peak = 0
+        self.temporaries = 0
+        self.temporary_bytes = 0
+
+
+class _Profile:
+    """
+    Context manager that records the memory use of one call.
+    """
+
+    __slots__ = ('_profiler', '_name', '_call')
+
+    def __init__(self, profiler, name):
+        self._profiler = profiler
+        self._name = name
+        self._call = None
+
+    def __enter__(self):
+        self._call = self._profiler._enter(self._name)
+        return self
+
+    def __exit__(self, *exc_info):
+        self._profiler._exit(self._call)
+        return False
+
+
+class _Disabled:
+    """
+    Shared no-op context manager of a disabled profiler.
+    """
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_disabled = _Disabled()
+
+
+class MemoryProfiler:
+    """
+    Opt-in memory accounting of actor and kernel calls.
+
+    A profiled call records its peak of traced allocations above the memory in use when
+    it started (tracemalloc, which also sees numpy buffers) and the number and bytes of the
+    temporary arrays the kernels report with track. Nested calls are counted in the peak of
+    the enclosing call. tracemalloc counts the allocations of all threads and has a single
+    peak, so profiled calls of different threads run one after another (the outermost
+    profiled call of a thread waits for the one of another thread to finish). Allocations
+    of threads without profiled calls still count in the peaks.
+    """
+
+    def __init__(self):
+        self._enabled = False
+        self._local = threading.local()
+        self._stats = {}
+        self._lock = threading.Lock()
+        # held by the outermost running profiled call
+        self._running = threading.Lock()
+        self._started_tracing = False
+
+    def __repr__(self):  # pragma: no cover
+        return "MemoryProfiler(enabled={})".format(self.enabled)
+
+    @property
+    def enabled(self):
+        """
+        Returns: True if calls are profiled.
+        """
+        return self._enabled
+
+    @enabled.setter
+    def enabled(self, value):
+        """
+        Starts (or stops) tracemalloc with the profiler, unless it was started elsewhere.
+        """
+        value = bool(value)
+        if value and not self._enabled:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started_tracing = True
+        elif not value and self._enabled:
+            if self._started_tracing:
+                tracemalloc.stop()
+                self._started_tracing = False
+            self._local = threading.local()
+        self._enabled = value
+
+    def profile(self, name):
+        """
+        Returns: Context manager that records the memory use of its body as the call name.
+        """
+        if not self._enabled:
+            return _disabled
+        return _Profile(self, name)
+
+    def profiled(self, name):
+        """
+        Returns: Decorator that records the calls of a function as the call name while
+            the profiler is enabled.
+        """
+        def decorator(function):
+            @functools.wraps(function)
+            def wrapper(*args, **kwargs):
+                if not self._enabled:
+                    return function(*args, **kwargs)
+                with _Profile(self, name):
+                    return function(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def track(self, *arrays):
+        """
+        Counts arrays as temporaries of the innermost profiled call.
+        """
+        stack = self._stack() if self._enabled else None
+        if not stack:
+            return
+        call = stack[-1]
+        call.temporaries += len(arrays)
+        call.temporary_bytes += sum(array.nbytes for array in arrays)
+
+    def stats(self):
+        """
+        Returns: Dictionary of call names and dictionaries with
+            calls, peak_bytes (maximum of all calls), temporaries and temporary_bytes
+            (maxima per call).
+        """
+        with self._lock:
+            return {name: dict(values) for name, values in self._stats.items()}
+
+    def merge(self, stats):
+        """
+        Adds the stats of another profiler (e.g. of a worker process).
+        """
+        with self._lock:
+            for name, values in stats.items():
+                self._add(name, values['calls'], values['peak_bytes'], values['temporaries'],
+                          values['temporary_bytes'])
+
+    def report(self):
+        """
+        Returns: Text table of the stats.
+        """
+        lines = ['{:<28} {:>7} {:>12} {:>6} {:>12}'.format('call', 'calls', 'peak KiB', 'temps', 'temps KiB')]
+        for name, values in sorted(self.stats().items()):
+            lines.append('{:<28} {:>7} {:>12.1f} {:>6} {:>12.1f}'.format(
+                name, values['calls'], values['peak_bytes'] / 1024, values['temporaries'],
+                values['temporary_bytes'] / 1024))
+        return '\n'.join(lines)
+
+    def reset(self):
+        """
+        Removes the stats.
+        """
+        with self._lock:
+            self._stats.clear()
+
+    def _stack(self):
+        """
+        Returns: List of the running profiled calls of the current thread.
+        """
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _enter(self, name):
+        """
+        Returns: _Call of the started call.
+        """
+        stack = self._stack()
+        if not stack:
+            self._running.acquire()
+        current, peak = tracemalloc.get_traced_memory()
+        if stack:
+            # the peak so far belongs to the enclosing call
+            stack[-1].child_peak = max(stack[-1].child_peak, peak)
+        tracemalloc.reset_peak()
+        call = _Call(name, current, not stack)
+        stack.append(call)
+        return call
+
+    def _exit(self, call):
+        stack = self._stack()
+        try:
+            if not stack or stack[-1] is not call:
+                # the profiler was disabled inside the call
+                return
+            stack.pop()
+            peak = max(tracemalloc.get_traced_memory()[1], call.child_peak)
+            if stack:
+                stack[-1].child_peak = max(stack[-1].child_peak, peak)
+            with self._lock:
+                self._add(call.name, 1, max(peak - call.start, 0), call.temporaries, call.temporary_bytes)
+        finally:
+            if call.outermost:
+                self._running.release()
+
+    def _add(self, name, calls, peak_bytes, temporaries, temporary_bytes):
+        values = self._stats.setdefault(name, {'calls': 0, 'peak_bytes': 0, 'temporaries': 0,
+                                               'temporary_bytes': 0})
+        values['calls'] += calls
+        values['peak_bytes'] = max(values['peak_bytes'], peak_bytes)
+        values['temporaries'] = max(values['temporaries'], temporaries)
+        values['temporary_bytes'] = max(values['temporary_bytes'], temporary_bytes)
+
+
+profiler = MemoryProfiler()
+"""
+Profiler of the actors and kernels, enabled by a non-empty FOURIER_MEMORY environment variable.
+"""
+if os.environ.get('FOURIER_MEMORY'):
+    profiler.enabled = True
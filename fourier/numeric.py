@@ -0,0 +1,117 @@
+from fractions import Fraction
+from math import gcd
+
+import numpy as np
+
+
+default_dtype = np.float64
+default_max_block_bytes = 2 ** 24
+
+
+def set_default_dtype(dtype):
+    """
+    Sets the floating point type of the arrays fed into the compute kernels.
+
+    Args:
+        dtype: numpy.float64 or numpy.float32.
+
+    Raises:
+        ValueError: Unsupported dtype.
+    """
+    global default_dtype
+    dtype = np.dtype(dtype).type
+    if dtype not in (np.float64, np.float32):
+        raise ValueError("Unsupported dtype: {}".format(dtype))
+    default_dtype = dtype
+
+
+def set_memory_budget(max_block_bytes=None):
+    """
+    Sets the memory limit of the temporary arrays of one block of the compute kernels
+    (see block_rows). Kernel calls that would exceed it are evaluated in chunks.
+
+    Args:
+        (optional)
+        max_block_bytes: Budget in bytes, 2 ** 24 by default.
+
+    Raises:
+        ValueError: The budget is not positive.
+    """
+    global default_max_block_bytes
+    if max_block_bytes is None:
+        max_block_bytes = 2 ** 24
+    if max_block_bytes <= 0:
+        raise ValueError("The memory budget has to be positive: {}".format(max_block_bytes))
+    default_max_block_bytes = int(max_block_bytes)
+
+
+def as_array(values, dtype=None):
+    """
+    Converts values (lists, Fraction object arrays, ...) to a contiguous floating point array.
+
+    Args:
+        values: Array-like.
+        (optional)
+        dtype: Floating point type, default_dtype by default.
+
+    Returns: Instance of numpy.ndarray.
+    """
+    return np.asarray(values, dtype=default_dtype if dtype is None else dtype, order='C')
+
+
+def as_float(value):
+    """
+    Converts a scalar (int, Fraction, numpy scalar, ...) to float.
+    """
+    return float(value)
+
+
+def as_exact(value):
+    """
+    Converts a scalar or a string like '3/2' or '0.25' to Fraction, e.g. for display.
+
+    Raises:
+        ValueError: The value is not a rational number.
+    """
+    if isinstance(value, float):
+        return Fraction(value).limit_denominator()
+    return Fraction(value)
+
+
+def common_period(frequencies):
+    """
+    Finds the shortest period of a sum of sine waves with rational frequencies.
+
+    Args:
+        frequencies: Frequencies (anything as_exact accepts).
+
+    Returns: Fraction period or None if there are no (non-zero) frequencies.
+    """
+    frequencies = [as_exact(freq) for freq in frequencies if freq]
+    if not frequencies:
+        return None
+    numerator = 0
+    denominator = 1
+    for freq in frequencies:
+        numerator = gcd(numerator, freq.numerator)
+        denominator = denominator * freq.denominator // gcd(denominator, freq.denominator)
+    return 1 / Fraction(numerator, denominator)
+
+
+def block_rows(n_rows, n_columns, itemsize, arrays=1, max_block_bytes=None):
+    """
+    Number of rows of a (rows x n_columns) computation that fit into the memory budget.
+
+    Args:
+        n_rows: Total number of rows.
+        n_columns: Number of columns.
+        itemsize: Bytes per element.
+        (optional)
+        arrays: How many temporary arrays of that size are alive at the same time.
+        max_block_bytes: Budget, default_max_block_bytes by default.
+
+    Returns: Number of rows (at least 1).
+    """
+    if max_block_bytes is None:
+        max_block_bytes = default_max_block_bytes
+    return max(1, min(n_rows, max_block_bytes // max(1, arrays * itemsize * n_columns)))
@@ -0,0 +1,136 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from fourier.fourier import centroid_block_rows, centroid_from_samples, sample_signal, winding_frequency_array
+
+
+def parallel_sweep(signal, frequencies, a, b=None, step=0.1, executor='thread', workers=None,
+                   chunks_per_worker=4, max_block_bytes=None):
+    """
+    fourier.sweep.sweep with the direct backend, with the frequencies split across workers.
+
+    Every worker runs fourier.fourier.centroid_from_samples on its part of the frequencies
+    and writes into its part of a preallocated output. The parts consist of whole blocks
+    of the serial calculation, so the result is identical to the serial one.
+    Executors:
+        thread: Threads sharing the arrays; the numpy kernels release the GIL.
+        process: Processes attached to the samples and the output in
+            multiprocessing.shared_memory (no pickled arrays).
+
+    Args:
+        signal: Any actor with data(x1, x2, step), e.g. fourier.actors.MultiSineWave.
+        frequencies: Winding frequencies.
+        a: Left boundary or an instance of fourier.grid.SampleGrid.
+        b: Right boundary (not used with a SampleGrid).
+        (optional)
+        step: Step of the calculation (not used with a SampleGrid).
+        executor: Name of the executor, see above.
+        workers: Number of workers (os.cpu_count() by default).
+        chunks_per_worker: Parts of the frequencies per worker, for load balancing.
+        max_block_bytes: Memory limit of the temporary arrays of one block of one worker.
+
+    Returns: Tuple(frequencies, x_avg values, y_avg values).
+
+    Raises:
+        ValueError: Winding Frequency must be positive.
+        ValueError: The following condition must be true: a < b.
+        ValueError: The signal has no samples.
+        ValueError: Unknown executor.
+    """
+    if executor not in executors:
+        raise ValueError("Unknown executor: {}".format(executor))
+    frequencies = winding_frequency_array(frequencies).reshape(-1)
+    x, y = sample_signal(signal, a, b, step)
+    workers = workers or os.cpu_count() or 1
+    rows = centroid_block_rows(len(frequencies), x, max_block_bytes)
+    parts = _partition(len(frequencies), rows, workers * chunks_per_worker)
+    real, imag = executors[executor](x, y, frequencies, parts, workers, max_block_bytes)
+    return frequencies, real, imag
+
+
+def _partition(length, rows, count):
+    """
+    Returns: List of (start, stop) of at most count nonempty, nearly equal parts of range(length)
+        that start at multiples of rows.
+    """
+    n_blocks = -(-length // rows)
+    bounds = np.linspace(0, n_blocks, min(count, n_blocks) + 1).astype(int) * rows
+    bounds = np.minimum(bounds, length)
+    return [(int(start), int(stop)) for start, stop in zip(bounds[:-1], bounds[1:]) if stop > start]
+
+
+def _thread_sweep(x, y, frequencies, parts, workers, max_block_bytes):
+    out = np.empty((2, len(frequencies)))
+
+    def compute(part):
+        block = slice(*part)
+        centroid_from_samples(x, y, frequencies[block], max_block_bytes=max_block_bytes,
+                              out=(out[0, block], out[1, block]))
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        # list() re-raises the exceptions of the workers
+        list(pool.map(compute, parts))
+    return out[0], out[1]
+
+
+def _process_sweep(x, y, frequencies, parts, workers, max_block_bytes):
+    blocks = []
+    shared = out = None
+    try:
+        inputs = []
+        for array in (x, y, frequencies):
+            block, shared = _shared_array(array.shape)
+            blocks.append(block)
+            shared[...] = array
+            inputs.append((block.name, array.shape))
+        block, out = _shared_array((2, len(frequencies)))
+        blocks.append(block)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(_process_part, [(inputs, (block.name, out.shape), part, max_block_bytes)
+                                          for part in parts]))
+        return out[0].copy(), out[1].copy()
+    finally:
+        # the arrays must not use the buffers when they are closed
+        shared = out = None
+        for block in blocks:
+            block.close()
+            block.unlink()
+
+
+def _shared_array(shape, name=None):
+    """
+    Returns: Tuple(SharedMemory, float array in it); a new block unless name is given.
+    """
+    size = max(int(np.prod(shape)) * np.dtype(float).itemsize, 1)
+    block = shared_memory.SharedMemory(name=name, create=name is None, size=0 if name else size)
+    return block, np.ndarray(shape, dtype=float, buffer=block.buf)
+
+
+def _process_part(job):
+    """
+    Computes one part of the frequencies in a worker process.
+    """
+    inputs, (out_name, out_shape), (start, stop), max_block_bytes = job
+    blocks = []
+    try:
+        arrays = []
+        for name, shape in inputs + [(out_name, out_shape)]:
+            block, array = _shared_array(shape, name)
+            blocks.append(block)
+            arrays.append(array)
+        x, y, frequencies, out = arrays
+        centroid_from_samples(x, y, frequencies[start:stop], max_block_bytes=max_block_bytes,
+                              out=(out[0, start:stop], out[1, start:stop]))
+        del x, y, frequencies, out, arrays
+    finally:
+        for block in blocks:
+            block.close()
+
+
+executors = {
+    'thread': _thread_sweep,
+    'process': _process_sweep,
+}
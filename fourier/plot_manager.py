@@ -0,0 +1,335 @@
+import os
+from tkinter import *
+
+from fourier.actors import Circle, MultiSineWave
+from fourier.jobs import compute_all, compute_shape, compute_spectrogram, compute_spectrum
+from fourier.fourier import dominant_frequencies
+from fourier.instrumentation import LatencyOverlay, tracer
+from fourier.lod import LODLine
+from fourier.memory import profiler
+from fourier.numeric import common_period
+from fourier.rendering import BlitRenderer
+from fourier.scheduler import ComputeScheduler
+from fourier.sweep import backends
+
+
+class PlotManager:
+    peak_count = 3
+    # milliseconds between two updates of the latency overlay
+    overlay_interval = 500
+
+    def __init__(self, canvas, figure, side_panel):
+        self.canvas = canvas
+        self.scheduler = ComputeScheduler(canvas.get_tk_widget())
+        self.renderer = BlitRenderer(canvas, schedule=canvas.get_tk_widget().after_idle)
+        # full redraws, including those requested by the navigation toolbar
+        canvas.draw = tracer.wrap('draw', canvas.draw)
+        self.overlay = LatencyOverlay(figure, tracer)
+        grid = figure.add_gridspec(3, 10)
+        self.circle_axes = figure.add_subplot(grid[0, 0:4])
+        self.sound_axes = figure.add_subplot(grid[0, 5:10])
+        self.freq_axes = figure.add_subplot(grid[1, :])
+        self.spectrogram_axes = figure.add_subplot(grid[2, :])
+        #self.circle_axes = figure.add_subplot(211)
+        #self.freq_axes = figure.add_subplot(212)
+
+        self.circle_axes.format_coord = lambda x, y: ''
+        self.sound_axes.format_coord = lambda x, y: ''
+        self.freq_axes.format_coord = lambda x, y: ''
+        self.spectrogram_axes.format_coord = lambda x, y: ''
+
+        input_freq_strength = StringVar()
+        input_freq_strength_entry = Entry(side_panel, textvariable=input_freq_strength)
+        input_freq_strength_entry.bind('<Return>',
+                    lambda event: self._freq_amplitude_update(event, input_freq_strength.get()))
+        input_freq_strength_entry.grid(row=side_panel.next_row(), column=0)
+
+        self.winding_frequency = DoubleVar()
+        winding_frequency_slider = Scale(side_panel, from_=1, to=100, orient=HORIZONTAL,
+                                       variable=self.winding_frequency, length=180)
+        winding_frequency_slider.bind('<B1-Motion>', lambda event: self._winding_frequency_update(event, self.winding_frequency.get()))
+        winding_frequency_slider.grid(row=side_panel.next_row(), column=0)
+
+        winding_frequency_entry = Entry(side_panel, textvariable=self.winding_frequency)
+        winding_frequency_entry.bind('<Return>',
+                    lambda event: self._winding_frequency_update(event, self.winding_frequency.get()))
+        winding_frequency_entry.grid(row=side_panel.next_row(), column=0)
+
+        self.freqs_start = DoubleVar()
+        self.freqs_start.set(1)
+        freqs_start_entry = Entry(side_panel, textvariable=self.freqs_start)
+        freqs_start_entry.bind('<Return>', lambda event: self._set_freqs())
+        freqs_start_entry.grid(row=side_panel.next_row(), column=0)
+
+        
+        self.freqs_end = DoubleVar()
+        self.freqs_end.set(10)
+        freqs_end_entry = Entry(side_panel, textvariable=self.freqs_end)
+        freqs_end_entry.bind('<Return>', lambda event: self._set_freqs())
+        freqs_end_entry.grid(row=side_panel.next_row(), column=0)
+
+        self.backend = StringVar()
+        self.backend.set('direct')
+        backend_menu = OptionMenu(side_panel, self.backend, *backends,
+                                  command=lambda value: self._set_freqs())
+        backend_menu.grid(row=side_panel.next_row(), column=0)
+
+        self.ideal_spectrum = BooleanVar()
+        ideal_spectrum_check = Checkbutton(side_panel, text='Ideal spectrum', variable=self.ideal_spectrum,
+                                           command=self._set_freqs)
+        ideal_spectrum_check.grid(row=side_panel.next_row(), column=0)
+
+        self.adaptive_sweep = BooleanVar()
+        adaptive_sweep_check = Checkbutton(side_panel, text='Adaptive sweep', variable=self.adaptive_sweep,
+                                           command=self._set_freqs)
+        adaptive_sweep_check.grid(row=side_panel.next_row(), column=0)
+
+        self.show_spectrogram = BooleanVar()
+        spectrogram_check = Checkbutton(side_panel, text='Spectrogram', variable=self.show_spectrogram,
+                                        command=self._set_spectrogram)
+        spectrogram_check.grid(row=side_panel.next_row(), column=0)
+
+        self.window_length = DoubleVar()
+        self.window_length.set(1)
+        window_length_entry = Entry(side_panel, textvariable=self.window_length)
+        window_length_entry.bind('<Return>', lambda event: self._set_spectrogram())
+        window_length_entry.grid(row=side_panel.next_row(), column=0)
+
+        self.show_overlay = BooleanVar()
+        self.show_overlay.set(tracer.enabled)
+        overlay_check = Checkbutton(side_panel, text='Latency overlay', variable=self.show_overlay,
+                                    command=self._toggle_overlay)
+        overlay_check.grid(row=side_panel.next_row(), column=0)
+
+        export_trace_button = Button(side_panel, text='Export trace', command=self._export_trace)
+        export_trace_button.grid(row=side_panel.next_row(), column=0)
+
+        self.profile_memory = BooleanVar()
+        self.profile_memory.set(profiler.enabled)
+        memory_check = Checkbutton(side_panel, text='Memory profile', variable=self.profile_memory,
+                                   command=lambda: setattr(profiler, 'enabled', self.profile_memory.get()))
+        memory_check.grid(row=side_panel.next_row(), column=0)
+
+        memory_report_button = Button(side_panel, text='Memory report', command=self._memory_report)
+        memory_report_button.grid(row=side_panel.next_row(), column=0)
+
+        self.period = StringVar()
+        period_label = Label(side_panel, textvariable=self.period)
+        period_label.grid(row=side_panel.next_row(), column=0)
+
+        self.status = StringVar()
+        status_label = Label(side_panel, textvariable=self.status, wraplength=180)
+        status_label.grid(row=side_panel.next_row(), column=0)
+
+        self.peak = StringVar()
+        self.peak.set('Peaks')
+        self.peak_menu = OptionMenu(side_panel, self.peak, 'Peaks')
+        self.peak_menu.grid(row=side_panel.next_row(), column=0)
+
+        self.sound_graph = self.sound_axes.plot([0], [0])[0]
+
+        circle = Circle(radius=1)
+        self.circle_axes.plot(*circle.data())
+        self.shape_graph = self.circle_axes.plot([0], [0])[0]
+        self.avg_point = self.circle_axes.plot([0], [0], 'ro')[0]
+
+        self.fourier_graph1 = self.freq_axes.plot([0], [0])[0]
+        self.fourier_graph2 = self.freq_axes.plot([0], [0])[0]
+        self.ideal_graph1 = self.freq_axes.plot([], [], '--')[0]
+        self.ideal_graph2 = self.freq_axes.plot([], [], '--')[0]
+        self.peak_graph = self.freq_axes.plot([], [], 'kv')[0]
+        self.peak_labels = [self.freq_axes.text(0, 0, '', visible=False, ha='center', va='bottom')
+                            for _ in range(self.peak_count)]
+        self.spectrogram_image = self.spectrogram_axes.imshow([[0]], aspect='auto', origin='lower',
+                                                              extent=(0, 1, 0, 1), visible=False)
+        self.renderer.add(self.sound_graph, self.shape_graph, self.avg_point, self.fourier_graph1,
+                          self.fourier_graph2, self.ideal_graph1, self.ideal_graph2, self.peak_graph,
+                          *self.peak_labels, self.spectrogram_image, self.overlay.text)
+        # the spectrogram covers the visible part of the sound axes
+        self.sound_axes.callbacks.connect('xlim_changed', lambda axes: self._set_spectrogram())
+        # the shape is parametric (x is not increasing), so it is drawn with all its points
+        self.sound_lod = LODLine(self.sound_graph)
+        self.fourier_lod1 = LODLine(self.fourier_graph1)
+        self.fourier_lod2 = LODLine(self.fourier_graph2)
+        self.ideal_lod1 = LODLine(self.ideal_graph1)
+        self.ideal_lod2 = LODLine(self.ideal_graph2)
+
+        self.circle_axes.axis('equal')
+        self.sound_axes.axis('equal')
+        self.freq_axes.axis('equal')
+
+        self.circle_axes.grid()
+        self.sound_axes.grid()
+        self.freq_axes.grid()
+
+        self.shape = None
+        self.multi_sine_wave = None
+        if tracer.enabled:
+            self._refresh_overlay()
+    
+    def _set_sound_graph(self, x, y):
+        self.sound_lod.set_data(x, y)
+        self.renderer.autoscale(self.sound_axes)
+    
+    def _set_shape_avg_point_graphs(self, shape, avg_point):
+        self.shape = shape
+
+        self.shape_graph.set_xdata(self.shape[0])
+        self.shape_graph.set_ydata(self.shape[1])
+        self.avg_point.set_xdata([avg_point[0]])
+        self.avg_point.set_ydata([avg_point[1]])
+
+        self.renderer.autoscale(self.circle_axes)
+    
+    def _set_fourier_graphs(self, spectrum):
+        x, y1, y2, ideal_values = spectrum
+        self.fourier_lod1.set_data(x, y1)
+        self.fourier_lod2.set_data(x, y2)
+
+        if ideal_values is not None:
+            self.ideal_lod1.set_data(x, ideal_values[0])
+            self.ideal_lod2.set_data(x, ideal_values[1])
+        else:
+            self.ideal_lod1.set_data([], [])
+            self.ideal_lod2.set_data([], [])
+
+        self._set_peaks(*dominant_frequencies(x, y1, y2, k=self.peak_count))
+        self.renderer.autoscale(self.freq_axes)
+
+    def _set_peaks(self, frequencies, magnitudes, phases):
+        self.peak_graph.set_data(frequencies, magnitudes)
+        for label, frequency, magnitude in zip(self.peak_labels, frequencies, magnitudes):
+            label.set_position((frequency, magnitude))
+            label.set_text('{:.3f}'.format(frequency))
+            label.set_visible(True)
+        for label in self.peak_labels[len(frequencies):]:
+            label.set_visible(False)
+
+        menu = self.peak_menu['menu']
+        menu.delete(0, 'end')
+        for frequency, magnitude in zip(frequencies, magnitudes):
+            menu.add_command(label='{:.3f} ({:.3f})'.format(frequency, magnitude),
+                             command=lambda frequency=frequency: self._jump_to_peak(frequency))
+
+    def _jump_to_peak(self, frequency):
+        self.winding_frequency.set(round(float(frequency), 3))
+        self._winding_frequency_update(None, self.winding_frequency.get())
+
+    def _set_freqs(self):
+        if not self.multi_sine_wave:
+            return
+        self.scheduler.submit('spectrum', compute_spectrum, self.multi_sine_wave, self.freqs_start.get(),
+                              self.freqs_end.get(), self.backend.get(), self.ideal_spectrum.get(),
+                              self.adaptive_sweep.get(),
+                              callback=self._spectrum_computed, error_callback=self._report_error)
+
+    def _spectrum_computed(self, spectrum):
+        self.status.set('')
+        self._set_fourier_graphs(spectrum)
+        self.renderer.request_update()
+    
+    def _winding_frequency_update(self, event, value):
+        if not self.multi_sine_wave:
+            return
+        self.scheduler.submit('shape', compute_shape, self.multi_sine_wave, value,
+                              callback=self._shape_computed, error_callback=self._report_error)
+
+    def _shape_computed(self, result):
+        self.status.set('')
+        self._set_shape_avg_point_graphs(*result)
+        self.renderer.request_update()
+    
+    def _freq_amplitude_update(self, event, values):
+        with tracer.span('parse'):
+            components = MultiSineWave.parse_components(values)
+            self.multi_sine_wave = MultiSineWave.from_components(components)
+        period = common_period(freq for freq, amplitude in components)
+        self.period.set('Period: {}'.format(period))
+        if not self.multi_sine_wave:
+            return
+
+        # the complete update supersedes the partial ones submitted before it
+        self.scheduler.cancel('shape')
+        self.scheduler.cancel('spectrum')
+        generations = self.scheduler.generation('shape'), self.scheduler.generation('spectrum')
+        self.scheduler.submit('signal', compute_all, self.multi_sine_wave, self.winding_frequency.get(),
+                              self.freqs_start.get(), self.freqs_end.get(), self.backend.get(),
+                              self.ideal_spectrum.get(), self.adaptive_sweep.get(),
+                              callback=lambda result: self._signal_computed(result, *generations),
+                              error_callback=self._report_error)
+        self._set_spectrogram()
+
+    def _signal_computed(self, result, shape_generation, spectrum_generation):
+        self.status.set('')
+        self.sound_values, shape_result, spectrum = result
+        self._set_sound_graph(self.sound_values[0], self.sound_values[1])
+        # a shape or spectrum submitted after this job is newer than its parts
+        if self.scheduler.generation('shape') == shape_generation:
+            self._set_shape_avg_point_graphs(*shape_result)
+        if self.scheduler.generation('spectrum') == spectrum_generation:
+            self._set_fourier_graphs(spectrum)
+
+        self.renderer.request_update()
+
+    def _set_spectrogram(self):
+        if not self.show_spectrogram.get():
+            self.spectrogram_image.set_visible(False)
+            self.renderer.request_update()
+            return
+        if not self.multi_sine_wave:
+            return
+        t0, t1 = sorted(self.sound_axes.get_xlim())
+        self.scheduler.submit('spectrogram', compute_spectrogram, self.multi_sine_wave, t0, t1,
+                              self.freqs_start.get(), self.freqs_end.get(), self.window_length.get(),
+                              callback=self._spectrogram_computed, error_callback=self._report_error)
+
+    def _spectrogram_computed(self, result):
+        self.status.set('')
+        times, frequencies, magnitudes = result
+        extent = (times[0], times[-1], frequencies[0], frequencies[-1])
+        self.spectrogram_image.set_data(magnitudes)
+        self.spectrogram_image.set_extent(extent)
+        self.spectrogram_image.set_clim(0, magnitudes.max() or 1)
+        self.spectrogram_image.set_visible(True)
+        self.spectrogram_axes.set_xlim(extent[:2])
+        self.spectrogram_axes.set_ylim(extent[2:])
+        self.renderer.invalidate()
+        self.renderer.request_update()
+
+    def _toggle_overlay(self):
+        tracer.enabled = self.show_overlay.get()
+        self._refresh_overlay()
+
+    def _refresh_overlay(self):
+        self.overlay.update()
+        self.renderer.request_update()
+        if tracer.enabled:
+            self.canvas.get_tk_widget().after(self.overlay_interval, self._refresh_overlay)
+
+    def _export_trace(self):
+        path = os.path.abspath('fourier_trace.json')
+        try:
+            count = tracer.export_chrome_trace(path)
+        except OSError as error:
+            self._report_error(error)
+            return
+        self.status.set('{} spans written to {}'.format(count, path))
+
+    def _memory_report(self):
+        stats = profiler.stats()
+        if not stats:
+            self.status.set('No profiled calls')
+            return
+        path = os.path.abspath('fourier_memory.txt')
+        try:
+            with open(path, 'w') as file:
+                file.write(profiler.report() + '\n')
+        except OSError as error:
+            self._report_error(error)
+            return
+        name = max(stats, key=lambda name: stats[name]['peak_bytes'])
+        self.status.set('Peak {:.1f} MiB in {}, report written to {}'.format(
+            stats[name]['peak_bytes'] / 2 ** 20, name, path))
+
+    def _report_error(self, error):
+        self.status.set('Error: {}'.format(error))
@@ -0,0 +1,145 @@
+import numpy as np
+
+from fourier.instrumentation import tracer
+
+
+class BlitRenderer:
+    """
+    Redraws only the changing artists of a matplotlib figure.
+
+    The static part of the figure (axes, grids, the unit circle, ...) is rendered by a
+    full draw and cached as a background. An update restores the background, draws the
+    registered (animated) artists on top of it and blits the result. A full draw is
+    requested through draw_idle only when the axes limits change.
+    """
+
+    def __init__(self, canvas, schedule=None):
+        """
+        Args:
+            canvas: matplotlib canvas that supports blitting (e.g. FigureCanvasTkAgg).
+            (optional)
+            schedule: Function that calls its argument later, e.g. Tk after_idle.
+                Update requests made before that are coalesced into one repaint.
+                Without it, request_update repaints immediately.
+        """
+        self.canvas = canvas
+        self._schedule = schedule
+        self._artists = []
+        self._background = None
+        self._bounds = {}
+        self._full_redraw = True
+        self._pending = False
+        self.full_draws = 0
+        self.blits = 0
+        self._draw_connection = canvas.mpl_connect('draw_event', self._on_draw)
+
+    def add(self, *artists):
+        """
+        Registers artists that change between repaints.
+
+        Returns: The first artist.
+        """
+        for artist in artists:
+            artist.set_animated(True)
+            self._artists.append(artist)
+        return artists[0]
+
+    def autoscale(self, axes, shrink=0.5):
+        """
+        Rescales axes (relim and autoscale_view) only when its data bounds changed so much
+        that the data leaves the current view or fills less than shrink of it.
+
+        Returns: True if the axes were rescaled.
+        """
+        bounds = _data_bounds(axes)
+        if bounds == self._bounds.get(axes) or not _needs_rescale(axes, bounds, shrink):
+            return False
+        self._bounds[axes] = bounds
+        axes.relim()
+        axes.autoscale_view()
+        self._full_redraw = True
+        return True
+
+    def invalidate(self):
+        """
+        Makes the next repaint a full draw.
+        """
+        self._full_redraw = True
+
+    def request_update(self):
+        """
+        Repaints now or, with a schedule function, once for all requests made until then.
+        """
+        if self._schedule is None:
+            self.update()
+        elif not self._pending:
+            self._pending = True
+            self._schedule(self.update)
+
+    def update(self):
+        """
+        Repaints the registered artists by blitting, or the whole figure when needed.
+        """
+        self._pending = False
+        if self._full_redraw or self._background is None:
+            self._full_redraw = False
+            self.canvas.draw_idle()
+            return
+        with tracer.span('blit'):
+            self.canvas.restore_region(self._background)
+            self._draw_artists()
+            self.canvas.blit(self.canvas.figure.bbox)
+        self.blits += 1
+        tracer.mark_frame()
+
+    def disconnect(self):
+        """
+        Stops listening to the draw events of the canvas.
+        """
+        self.canvas.mpl_disconnect(self._draw_connection)
+
+    def _on_draw(self, event):
+        # animated artists are skipped by a full draw, so this is the static background
+        self._background = self.canvas.copy_from_bbox(self.canvas.figure.bbox)
+        self._full_redraw = False
+        self._draw_artists()
+        self.full_draws += 1
+        tracer.mark_frame()
+
+    def _draw_artists(self):
+        figure = self.canvas.figure
+        for artist in self._artists:
+            figure.draw_artist(artist)
+
+
+def _data_bounds(axes):
+    """
+    Returns: Tuple(x_min, x_max, y_min, y_max) of the data of the lines of axes (None without data).
+    """
+    bounds = None
+    for line in axes.get_lines():
+        x = np.asarray(line.get_xdata(), dtype=float)
+        y = np.asarray(line.get_ydata(), dtype=float)
+        if x.size == 0 or y.size == 0:
+            continue
+        line_bounds = (np.nanmin(x), np.nanmax(x), np.nanmin(y), np.nanmax(y))
+        if bounds is None:
+            bounds = line_bounds
+        else:
+            bounds = (min(bounds[0], line_bounds[0]), max(bounds[1], line_bounds[1]),
+                      min(bounds[2], line_bounds[2]), max(bounds[3], line_bounds[3]))
+    return bounds
+
+
+def _needs_rescale(axes, bounds, shrink):
+    """
+    Returns: True if bounds do not fit into the view of axes or are much smaller than it.
+    """
+    if bounds is None:
+        return False
+    x_min, x_max = sorted(axes.get_xlim())
+    y_min, y_max = sorted(axes.get_ylim())
+    if bounds[0] < x_min or bounds[1] > x_max or bounds[2] < y_min or bounds[3] > y_max:
+        return True
+    return (bounds[1] - bounds[0] < shrink * (x_max - x_min)
+            and bounds[3] - bounds[2] < shrink * (y_max - y_min))
@@ -0,0 +1,164 @@
+import queue
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+from fourier.instrumentation import tracer
+
+
+class _Channel:
+    """
+    State of one stream of jobs where only the latest job matters.
+    """
+
+    def __init__(self):
+        self.generation = 0
+        self.running = False
+        self.pending = None
+
+
+class ComputeScheduler:
+    """
+    Runs computations on worker threads and applies their results on the Tk main loop.
+
+    Jobs are submitted to named channels (e.g. 'shape', 'spectrum'). Every submission
+    gets a new generation number. A channel runs at most one job and keeps at most
+    one pending job, so a newer submission replaces the pending one. Results of
+    superseded generations are dropped instead of being applied.
+
+    Jobs and callbacks are traced as the stages compute_<channel> and apply_<channel>
+    (see fourier.instrumentation.tracer).
+    """
+
+    def __init__(self, root, max_workers=2, poll_interval=10):
+        """
+        Args:
+            root: Tk widget used for after() calls (None to call process_results manually).
+            (optional)
+            max_workers: Number of worker threads.
+            poll_interval: Milliseconds between two checks for finished jobs.
+        """
+        self._root = root
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._poll_interval = poll_interval
+        self._channels = {}
+        self._results = queue.Queue()
+        # re-entrant: a job that is already done runs its done callback in _start
+        self._lock = threading.RLock()
+        self._polling = False
+
+    def submit(self, channel, function, *args, callback=None, error_callback=None):
+        """
+        Schedules function(*args) and supersedes the earlier jobs of the channel.
+
+        Args:
+            channel: Name of the channel.
+            function: Function to run on a worker thread.
+            *args: Arguments of the function.
+            (optional)
+            callback: Called on the main loop with the result.
+            error_callback: Called on the main loop with the raised exception
+                (the traceback is printed when it is not given).
+
+        Returns: Generation number of the job.
+        """
+        with self._lock:
+            state = self._channels.setdefault(channel, _Channel())
+            state.generation += 1
+            generation = state.generation
+            job = (generation, function, args, callback, error_callback)
+            if state.running:
+                state.pending = job
+            else:
+                self._start(channel, state, job)
+        self._ensure_polling()
+        return generation
+
+    def cancel(self, channel):
+        """
+        Drops the pending job and the result of the running job of the channel.
+        """
+        with self._lock:
+            state = self._channels.get(channel)
+            if state is not None:
+                state.generation += 1
+                state.pending = None
+
+    def generation(self, channel):
+        """
+        Returns: Generation number of the latest job of the channel.
+        """
+        state = self._channels.get(channel)
+        return 0 if state is None else state.generation
+
+    def busy(self):
+        """
+        Returns: True if a job is running or waiting.
+        """
+        with self._lock:
+            return any(state.running or state.pending for state in self._channels.values())
+
+    def process_results(self):
+        """
+        Applies the results of finished jobs that were not superseded. Runs on the main loop.
+
+        Returns: Number of applied results.
+        """
+        applied = 0
+        while True:
+            try:
+                channel, generation, result, error, callback, error_callback = self._results.get_nowait()
+            except queue.Empty:
+                return applied
+            if generation != self.generation(channel):
+                continue
+            if error is not None:
+                # raising here would abort the poll with other results still queued
+                if error_callback is None:
+                    traceback.print_exception(type(error), error, error.__traceback__)
+                else:
+                    error_callback(error)
+            elif callback is not None:
+                with tracer.span('apply_' + channel):
+                    callback(result)
+            applied += 1
+
+    def shutdown(self, wait=False):
+        """
+        Stops the worker threads.
+        """
+        with self._lock:
+            for state in self._channels.values():
+                state.generation += 1
+                state.pending = None
+        self._executor.shutdown(wait=wait)
+
+    def _start(self, channel, state, job):
+        generation, function, args, callback, error_callback = job
+        state.running = True
+        future = self._executor.submit(tracer.wrap('compute_' + channel, function), *args)
+        future.add_done_callback(
+            lambda future: self._finished(channel, generation, future, callback, error_callback))
+
+    def _finished(self, channel, generation, future, callback, error_callback):
+        error = future.exception()
+        result = None if error is not None else future.result()
+        self._results.put((channel, generation, result, error, callback, error_callback))
+        with self._lock:
+            state = self._channels[channel]
+            state.running = False
+            if state.pending is not None:
+                job, state.pending = state.pending, None
+                self._start(channel, state, job)
+
+    def _ensure_polling(self):
+        if self._root is None or self._polling:
+            return
+        self._polling = True
+        self._root.after(self._poll_interval, self._poll)
+
+    def _poll(self):
+        self._polling = False
+        self.process_results()
+        if self.busy() or not self._results.empty():
+            self._ensure_polling()
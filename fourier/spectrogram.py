@@ -0,0 +1,83 @@
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from fourier.fourier import interval_grid, sample_signal, winding_frequency_array
+from fourier.memory import profiler
+from fourier.numeric import block_rows
+
+
+window_functions = {
+    'rect': np.ones,
+    'hann': np.hanning,
+    'hamming': np.hamming,
+    'blackman': np.blackman,
+}
+
+
+@profiler.profiled('spectrogram')
+def spectrogram(signal, frequencies, a, b=None, step=0.01, window_length=1.0, hop=None, window='hann',
+                max_block_bytes=None):
+    """
+    Average points of the wound shapes (see fourier.fourier.winding_centroid) of windows
+    sliding over the signal on [a, b].
+
+    The windows are a view of the samples (numpy sliding_window_view). Blocks of windows
+    are weighted by the window function and multiplied with one precomputed
+    (window samples x frequencies) kernel, so every block is a single matrix product.
+    The weighted average uses the sum of the window function, so a sine wave of
+    amplitude A still gives a peak of A / 2.
+
+    Args:
+        signal: Any actor with data(x1, x2, step), e.g. fourier.actors.MultiSineWave.
+        frequencies: Winding frequencies.
+        a: Left boundary or an instance of fourier.grid.SampleGrid.
+        b: Right boundary (not used with a SampleGrid).
+        (optional)
+        step: Step of the calculation (not used with a SampleGrid).
+        window_length: Length of a window.
+        hop: Distance between the starts of two windows, window_length / 4 by default.
+        window: Name of the window function, see window_functions.
+        max_block_bytes: See fourier.numeric.block_rows.
+
+    Returns: Tuple(times of the window centers, frequencies, x_avg values, y_avg values);
+        the values are (windows x frequencies) arrays.
+
+    Raises:
+        ValueError: Winding Frequency must be positive.
+        ValueError: The following condition must be true: a < b.
+        ValueError: The signal has no samples.
+        ValueError: Unknown window function.
+        ValueError: The interval is shorter than the window.
+        ValueError: The window is too short for the window function.
+    """
+    if window not in window_functions:
+        raise ValueError("Unknown window function: {}".format(window))
+    frequencies = winding_frequency_array(frequencies).reshape(-1)
+    grid = interval_grid(a, b, step)
+    x, y = sample_signal(signal, grid)
+    length = max(int(round(window_length / grid.step)), 1)
+    hop_length = max(int(round((window_length / 4 if hop is None else hop) / grid.step)), 1)
+    if length > len(y):
+        raise ValueError("The interval is shorter than the window: {} > {}".format(
+            window_length, grid.stop - grid.start))
+
+    windows = sliding_window_view(y, length)[::hop_length]
+    starts = x[:len(x) - length + 1:hop_length]
+    weights = window_functions[window](length)
+    if weights.sum() <= 0:
+        raise ValueError("The window is too short for {}: {} samples".format(window, length))
+    # winding relative to the window start; the phase of the start is applied per window
+    kernel = np.exp(2j * np.pi * np.multiply.outer(np.arange(length) * grid.step, frequencies))
+    kernel *= (weights / weights.sum())[:, None]
+
+    averages = np.empty((len(windows), len(frequencies)), dtype=complex)
+    # the complex copy of the window block, the result block and the start phases are alive at the same time
+    rows = block_rows(len(windows), 2 * length + 4 * len(frequencies), x.itemsize,
+                      max_block_bytes=max_block_bytes)
+    for i in range(0, len(windows), rows):
+        block = slice(i, i + rows)
+        averages[block] = windows[block] @ kernel
+        averages[block] *= np.exp(2j * np.pi * np.multiply.outer(starts[block], frequencies))
+    # mean of y exp(i w x) = y_avg + i x_avg
+    times = starts + (length - 1) * grid.step / 2
+    return times, frequencies, averages.imag, averages.real
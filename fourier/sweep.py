@@ -0,0 +1,201 @@
+import numpy as np
+
+from fourier.fourier import centroid_from_samples, sample_signal, winding_frequency_array
+from fourier.grid import SampleGrid
+from fourier.memory import profiler
+
+
+def frequency_range(start, end, step=0.01):
+    """
+    Winding frequencies between start and end (both inclusive).
+
+    Args:
+        start: First frequency.
+        end: Last frequency.
+        (optional)
+        step: Distance between two frequencies.
+
+    Returns: Read-only instance of numpy.ndarray (shared with fourier.grid.SampleGrid).
+    """
+    return SampleGrid(start, end, step).values
+
+
+@profiler.profiled('sweep')
+def sweep(signal, frequencies, a, b=None, step=0.1, backend='direct', max_block_bytes=None):
+    """
+    Calculates the average point of the wound shape (see fourier.fourier.get_shape)
+    for a whole array of winding frequencies at once.
+
+    The signal is evaluated only once. Backends:
+        direct: Sums every frequency x sample product. The frequencies are processed
+            in blocks so that the temporary arrays stay under max_block_bytes.
+        czt: Chirp-z transform computed with FFTs, O((F + N) log(F + N)).
+            The frequencies must be evenly spaced.
+
+    Args:
+        signal: Any actor with data(x1, x2, step), e.g. fourier.actors.MultiSineWave.
+        frequencies: Winding frequencies.
+        a: Left boundary or an instance of fourier.grid.SampleGrid.
+        b: Right boundary (not used with a SampleGrid).
+        (optional)
+        step: Step of the calculation (not used with a SampleGrid).
+        backend: Name of the backend, see above.
+        max_block_bytes: Memory limit of the temporary arrays of one block,
+            fourier.numeric.default_max_block_bytes by default.
+
+    Returns: Tuple(frequencies, x_avg values, y_avg values).
+
+    Raises:
+        ValueError: Winding Frequency must be positive.
+        ValueError: The following condition must be true: a < b.
+        ValueError: The signal has no samples.
+        ValueError: Unknown backend.
+    """
+    if backend not in backends:
+        raise ValueError("Unknown backend: {}".format(backend))
+    frequencies = winding_frequency_array(frequencies)
+    x, y = sample_signal(signal, a, b, step)
+    real, imag = backends[backend](x, y, frequencies, max_block_bytes)
+    return frequencies, real, imag
+
+
+@profiler.profiled('adaptive_sweep')
+def adaptive_sweep(signal, start, end, a, b=None, step=0.1, backend='direct', coarse_step=None,
+                   tolerance=1e-2, peak_fraction=0.1, max_points=1000, max_block_bytes=None):
+    """
+    sweep on a non-uniform grid of winding frequencies that is dense only where the
+    average point changes quickly, i.e. around the peaks of the spectrum.
+
+    The band [start, end] is swept coarsely with the backend first. Intervals with a large
+    curvature or magnitude are split at their midpoints. A split is repeated for the halves
+    as long as the midpoint differs from the linear interpolation of its neighbours by more
+    than tolerance * the largest magnitude, until max_points frequencies are calculated.
+
+    Args:
+        signal: Any actor with data(x1, x2, step), e.g. fourier.actors.MultiSineWave.
+        start: First winding frequency.
+        end: Last winding frequency.
+        a: Left boundary or an instance of fourier.grid.SampleGrid.
+        b: Right boundary (not used with a SampleGrid).
+        (optional)
+        step: Step of the calculation (not used with a SampleGrid).
+        backend: Backend of the coarse sweep (see sweep); the refinement uses direct.
+        coarse_step: Step of the coarse sweep; by default 1 / (2 * (b - a)), a quarter of the
+            width 2 / (b - a) of the main lobe of a peak, so that no peak falls between two
+            frequencies. It is widened when the coarse sweep would exceed max_points.
+        tolerance: Relative interpolation error that stops the refinement.
+        peak_fraction: Intervals with a larger relative magnitude are always refined once.
+        max_points: Maximal number of frequencies (at least 3), including the coarse sweep.
+        max_block_bytes: See sweep.
+
+    Returns: Tuple(frequencies, x_avg values, y_avg values); the frequencies are increasing.
+
+    Raises:
+        ValueError: Winding Frequency must be positive.
+        ValueError: The following condition must be true: start < end.
+        ValueError: The following condition must be true: a < b.
+        ValueError: The signal has no samples.
+        ValueError: Unknown backend.
+        ValueError: max_points is smaller than 3.
+    """
+    if backend not in backends:
+        raise ValueError("Unknown backend: {}".format(backend))
+    if max_points < 3:
+        raise ValueError("max_points has to be at least 3: {}".format(max_points))
+    winding_frequency_array([start])
+    if start >= end:
+        raise ValueError("The following condition must be true: start < end.")
+    x, y = sample_signal(signal, a, b, step)
+    if coarse_step is None:
+        coarse_step = 1 / (2 * (x[-1] - x[0])) if len(x) > 1 else (end - start) / 16
+    intervals = min(max(int(np.ceil((end - start) / coarse_step)), 2), max_points - 1)
+    frequencies = np.linspace(start, end, intervals + 1)
+    coarse_step = (end - start) / intervals
+    z = _complex(*backends[backend](x, y, frequencies, max_block_bytes))
+
+    magnitude = np.abs(z)
+    threshold = tolerance * max(magnitude.max(), np.finfo(float).tiny)
+    curvature = np.zeros(len(z))
+    curvature[1:-1] = np.abs(z[:-2] - 2 * z[1:-1] + z[2:])
+    curvature = np.maximum(curvature[:-1], curvature[1:])
+    magnitude = np.maximum(magnitude[:-1], magnitude[1:])
+    candidates = np.flatnonzero((curvature > threshold) | (magnitude > peak_fraction * magnitude.max()))
+    scores = np.maximum(curvature, magnitude)[candidates]
+    min_width = coarse_step / 2 ** 12
+
+    while len(candidates) and len(frequencies) < max_points:
+        left = frequencies[candidates]
+        right = frequencies[candidates + 1]
+        wide = right - left > 2 * min_width
+        candidates, scores, left, right = candidates[wide], scores[wide], left[wide], right[wide]
+        budget = max_points - len(frequencies)
+        if len(candidates) > budget:
+            keep = np.sort(np.argpartition(-scores, budget - 1)[:budget])
+            candidates, scores, left, right = candidates[keep], scores[keep], left[keep], right[keep]
+        if not len(candidates):
+            break
+        middle = (left + right) / 2
+        z_middle = _complex(*centroid_from_samples(x, y, middle, max_block_bytes=max_block_bytes))
+        errors = np.abs(z_middle - (z[candidates] + z[candidates + 1]) / 2)
+
+        # the midpoints go after the left ends of their intervals
+        positions = candidates + 1
+        frequencies = np.insert(frequencies, positions, middle)
+        z = np.insert(z, positions, z_middle)
+        split = errors > threshold
+        middle_indices = positions[split] + np.flatnonzero(split)
+        candidates = np.repeat(middle_indices, 2) - np.tile([1, 0], len(middle_indices))
+        scores = np.repeat(errors[split], 2)
+    return frequencies, z.real, z.imag
+
+
+def _complex(x_avg, y_avg):
+    return x_avg + 1j * y_avg
+
+
+def _direct(x, y, frequencies, max_block_bytes):
+    """
+    Direct summation backend of sweep (see fourier.fourier.winding_centroid).
+    """
+    return centroid_from_samples(x, y, frequencies, max_block_bytes=max_block_bytes)
+
+
+def _czt(x, y, frequencies, max_block_bytes):
+    """
+    Chirp-z transform backend of sweep (Bluestein's algorithm).
+
+    sum_n y_n exp(i 2 pi f_k x_n) is a convolution of chirps when
+    f_k = f_0 + k * df and x_n = x_0 + n * h, because nk = (n^2 + k^2 - (k - n)^2) / 2.
+
+    Raises:
+        ValueError: The frequencies are not evenly spaced.
+    """
+    n_samples = len(x)
+    n_freqs = len(frequencies)
+    if n_freqs == 0:
+        return np.empty(0), np.empty(0)
+    h = x[1] - x[0] if n_samples > 1 else 0.0
+    df = frequencies[1] - frequencies[0] if n_freqs > 1 else 0.0
+    if not np.allclose(np.diff(frequencies), df, rtol=1e-6, atol=1e-12):
+        raise ValueError("The czt backend requires evenly spaced frequencies.")
+
+    theta = 2 * np.pi * df * h
+    n = np.arange(n_samples)
+    k = np.arange(n_freqs)
+    length = 1 << (n_samples + n_freqs - 2).bit_length()
+
+    a = y * np.exp(1j * (2 * np.pi * frequencies[0] * h * n + theta / 2 * n * n))
+    chirp = np.zeros(length, dtype=complex)
+    chirp[:n_freqs] = np.exp(-1j * theta / 2 * k * k)
+    m = np.arange(1, n_samples)
+    chirp[length - m] = np.exp(-1j * theta / 2 * m * m)
+
+    conv = np.fft.ifft(np.fft.fft(a, length) * np.fft.fft(chirp))[:n_freqs]
+    z = conv * np.exp(1j * (theta / 2 * k * k + 2 * np.pi * frequencies * x[0]))
+    return z.imag / n_samples, z.real / n_samples
+
+
+backends = {
+    'direct': _direct,
+    'czt': _czt,
+}
@@ -0,0 +1,120 @@
+import numpy as np
+
+from fourier.fourier import sample_signal
+from fourier.numeric import as_float
+
+
+class IncrementalWinding:
+    """
+    Wound shape (see fourier.fourier.get_shape) for the evenly spaced winding frequencies
+    start_frequency + index * frequency_step.
+
+    The signal is sampled once. Moving to the next frequency multiplies the shape by a
+    precomputed phase increment, one complex multiplication per sample. The shape is
+    recomputed directly every reanchor_interval frames, so rounding errors do not build up.
+    """
+
+    def __init__(self, signal, start_frequency, frequency_step, a, b=None, step=0.1,
+                 reanchor_interval=256):
+        """
+        Args:
+            signal: Any actor with data(x1, x2, step), e.g. fourier.actors.MultiSineWave.
+            start_frequency: Winding frequency of the frame 0.
+            frequency_step: Difference of the winding frequencies of two following frames.
+            a: Left boundary or an instance of fourier.grid.SampleGrid.
+            b: Right boundary (not used with a SampleGrid).
+            (optional)
+            step: Step of the calculation (not used with a SampleGrid).
+            reanchor_interval: Number of frames between two direct calculations.
+
+        Raises:
+            ValueError: The following condition must be true: a < b.
+            ValueError: The signal has no samples.
+            ValueError: Re-anchor interval has to be positive.
+        """
+        if reanchor_interval <= 0:
+            raise ValueError("Re-anchor interval has to be positive: {}".format(reanchor_interval))
+        self.start_frequency = as_float(start_frequency)
+        self.frequency_step = as_float(frequency_step)
+        self.reanchor_interval = reanchor_interval
+        self._x, self._y = sample_signal(signal, a, b, step)
+        # sin(w x) + i cos(w x) = i exp(-i w x)
+        self._increment = np.exp(-2j * np.pi * self.frequency_step * self._x)
+        self._shape = None
+        self._index = None
+
+    def __repr__(self):  # pragma: no cover
+        return "IncrementalWinding(start_frequency={}, frequency_step={}, index={})".format(
+            self.start_frequency, self.frequency_step, self.index)
+
+    @property
+    def index(self):
+        """
+        Returns: Index of the current frame (None before the first frame).
+        """
+        return self._index
+
+    @property
+    def frequency(self):
+        """
+        Returns: Winding frequency of the current frame.
+        """
+        return self.frequency_at(self.index)
+
+    def frequency_at(self, index):
+        """
+        Returns: Winding frequency of the frame index.
+        """
+        return self.start_frequency + index * self.frequency_step
+
+    @property
+    def shape(self):
+        """
+        Returns: Tuple(x values, y values) of the current wound shape.
+        """
+        return self._shape.real, self._shape.imag
+
+    @property
+    def centroid(self):
+        """
+        Returns: Tuple(X_avg, Y_avg) of the current wound shape.
+        """
+        avg = self._shape.mean()
+        return avg.real, avg.imag
+
+    def seek(self, index):
+        """
+        Calculates the shape of the frame index directly.
+
+        Raises:
+            ValueError: Winding Frequency must be positive.
+        """
+        frequency = self.frequency_at(index)
+        if frequency <= 0:
+            raise ValueError("Winding Frequency must be positive.")
+        omega = 2 * np.pi * frequency
+        self._shape = self._y * (np.sin(omega * self._x) + 1j * np.cos(omega * self._x))
+        self._index = index
+        return self
+
+    def advance(self):
+        """
+        Moves to the next frame.
+        """
+        if self._index is None:
+            return self.seek(0)
+        if (self._index + 1) % self.reanchor_interval == 0 or self.frequency_at(self._index + 1) <= 0:
+            return self.seek(self._index + 1)
+        self._shape *= self._increment
+        self._index += 1
+        return self
+
+    def frame(self, index):
+        """
+        Moves to the frame index; incrementally when it is the next frame.
+        """
+        if index == self._index:
+            return self
+        if self._index is not None and index == self._index + 1:
+            return self.advance()
+        return self.seek(index)
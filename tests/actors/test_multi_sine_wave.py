@@ -1,3 +1,5 @@
+from fractions import Fraction
+
 from fourier.actors import SineWave, MultiSineWave
 from tests.fixtures import multi_sine_wave
 import numpy as np
@@ -40,3 +42,74 @@ def test_multi_sine_wave_indexing(multi_sine_wave):
 
 def test_multi_sine_wave_slicing(multi_sine_wave):
     assert 1 == len(multi_sine_wave[1:])
+
+
+def test_multi_sine_wave_centroid(multi_sine_wave):
+    freqs = np.array([0.5, 1, 2])
+    x_avg, y_avg = multi_sine_wave.centroid(freqs, 0, 3)
+    x1, y1 = multi_sine_wave[0].centroid(freqs, 0, 3)
+    x2, y2 = multi_sine_wave[1].centroid(freqs, 0, 3)
+    assert np.allclose(x1 + x2, x_avg)
+    assert np.allclose(y1 + y2, y_avg)
+
+
+def test_multi_sine_wave_from_arrays():
+    ms = MultiSineWave.from_arrays([1, 2, 3], amplitudes=[3, 2, 1])
+    assert 3 == len(ms)
+    assert 2 == ms[1].angular_velocity
+    assert 1 == ms[2].amplitude
+    assert 0 == ms[0].x0
+
+
+def test_multi_sine_wave_parameters(multi_sine_wave):
+    angular_velocities, amplitudes, x0, y0 = multi_sine_wave.parameters()
+    assert np.allclose([2 * np.pi, 4 * np.pi], angular_velocities)
+    assert np.array_equal([1, 1], amplitudes)
+    assert np.array_equal([0, 0], x0)
+    assert np.array_equal([0, 0], y0)
+
+
+def test_multi_sine_wave_tiled_many_components(monkeypatch):
+    ms = MultiSineWave.from_arrays(np.linspace(1, 50, 200), amplitudes=np.linspace(1, 0.1, 200),
+                                   y0=np.linspace(0, 1, 200))
+    expected = ms.data(0, 2, 0.01)[1]
+    monkeypatch.setattr('fourier.numeric.default_max_block_bytes', 1000)
+    tiled = ms.data(0, 2, 0.01)[1]
+    by_wave = sum(wave.data(0, 2, 0.01)[1] for wave in ms)
+    assert np.allclose(expected, tiled)
+    assert np.allclose(expected, by_wave)
+
+
+def test_multi_sine_wave_parameters_follow_list_changes(multi_sine_wave):
+    assert 2 == len(multi_sine_wave.parameters()[0])
+    multi_sine_wave.append(SineWave(3, amplitude=2))
+    assert np.array_equal([1, 1, 2], multi_sine_wave.parameters()[1])
+    del multi_sine_wave[0]
+    assert np.array_equal([1, 2], multi_sine_wave.parameters()[1])
+    multi_sine_wave[0] = SineWave(5)
+    assert 5 == multi_sine_wave.parameters()[0][0]
+
+
+def test_multi_sine_wave_parameters_follow_wave_changes(multi_sine_wave):
+    before = multi_sine_wave.data(0, 1)[1]
+    multi_sine_wave[0].amplitude = 0
+    assert 0 == multi_sine_wave.parameters()[1][0]
+    assert not np.array_equal(before, multi_sine_wave.data(0, 1)[1])
+
+
+def test_multi_sine_wave_parameters_read_only(multi_sine_wave):
+    with pytest.raises(ValueError):
+        multi_sine_wave.parameters()[0][0] = 1
+
+
+def test_multi_sine_wave_parse():
+    assert [(1, Fraction(1, 2)), (Fraction(5, 2), 1)] == MultiSineWave.parse_components('1,1/2;2.5,1;junk')
+    msw = MultiSineWave.parse('1,1/2;2.5,1')
+    assert 2 == len(msw)
+    assert np.allclose([2 * np.pi, 5 * np.pi], msw.parameters()[0])
+    assert np.allclose([0.5, 1], msw.parameters()[1])
+
+
+def test_multi_sine_wave_parse_error():
+    with pytest.raises(ValueError):
+        MultiSineWave.parse('1,x')
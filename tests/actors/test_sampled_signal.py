@@ -0,0 +1,127 @@
+import struct
+import tracemalloc
+import wave
+
+import numpy as np
+import pytest
+
+from fourier.actors import SampledSignal
+from fourier.audio import read_wav_format
+from fourier.fourier import winding_centroid
+
+
+rate = 1000
+
+
+def write_pcm_wav(path, samples, channels=1):
+    with wave.open(str(path), 'wb') as file:
+        file.setnchannels(channels)
+        file.setsampwidth(2)
+        file.setframerate(rate)
+        file.writeframes(samples.astype('<i2').tobytes())
+
+
+def write_float_wav(path, samples):
+    data = samples.astype('<f4').tobytes()
+    fmt = struct.pack('<HHIIHH', 3, 1, rate, rate * 4, 4, 32)
+    with open(str(path), 'wb') as file:
+        file.write(b'RIFF' + struct.pack('<I', 4 + 8 + len(fmt) + 8 + 5 + 1 + 8 + len(data)) + b'WAVE')
+        file.write(b'fmt ' + struct.pack('<I', len(fmt)) + fmt)
+        # odd sized chunk with padding
+        file.write(b'LIST' + struct.pack('<I', 5) + b'abcde\0')
+        file.write(b'data' + struct.pack('<I', len(data)) + data)
+
+
+@pytest.fixture
+def sine_samples():
+    t = np.arange(3 * rate) / rate
+    return 0.5 * np.sin(2 * np.pi * 5 * t)
+
+
+def test_from_wav_view(tmp_path, sine_samples):
+    path = tmp_path / 'signal.wav'
+    write_pcm_wav(path, sine_samples * 32768)
+    signal = SampledSignal.from_wav(str(path), normalize=False)
+    assert isinstance(signal.samples, np.memmap)
+    assert 3 == signal.duration
+    x, y = signal.data(0.5, 1, step=1 / rate)
+    assert 501 == len(x) == len(y)
+    assert np.shares_memory(y, signal.samples)
+    assert np.allclose(0.5 + np.arange(501) / rate, x)
+
+
+def test_from_wav_normalized(tmp_path, sine_samples):
+    path = tmp_path / 'signal.wav'
+    write_pcm_wav(path, sine_samples * 32768)
+    signal = SampledSignal.from_wav(str(path))
+    x, y = signal.data(0, 2)
+    assert np.allclose(sine_samples[:2001], y, atol=1e-4)
+    x_avg, y_avg = winding_centroid(signal, 5, 0, 2, step=1 / rate)
+    assert np.isclose(0.25, x_avg, atol=1e-3)
+
+
+def test_resampled(tmp_path, sine_samples):
+    path = tmp_path / 'signal.wav'
+    write_float_wav(path, sine_samples)
+    signal = SampledSignal.from_wav(str(path))
+    x, y = signal.data(0.1, 0.2, step=0.0001)
+    assert 1001 == len(y)
+    assert np.allclose(0.5 * np.sin(2 * np.pi * 5 * x), y, atol=1e-3)
+    # zero outside the recording
+    x, y = signal.data(2.5, 4, step=0.5)
+    assert np.allclose([0, 0, 0], y[1:])
+
+
+def test_resampled_matches_interp():
+    samples = np.array([0, 100, -200, 300, 50], dtype='<i2')
+    signal = SampledSignal(samples, rate, offset=0, scale=1 / 32768)
+    x, y = signal.data(-0.001, 0.0045, step=0.00025)
+    times = np.arange(len(samples)) / rate
+    assert np.allclose(np.interp(x, times, samples / 32768, left=0, right=0), y)
+
+
+def test_resampled_large_file_reads_only_neighbours(tmp_path):
+    path = tmp_path / 'signal.raw'
+    count = 10 ** 7
+    # 20 MB of 16 bit samples, written without holding them in memory
+    with open(str(path), 'wb') as file:
+        file.truncate(2 * count)
+    signal = SampledSignal.from_raw(str(path), rate)
+    tracemalloc.start()
+    try:
+        x, y = signal.data(0, count / rate - 1, step=10)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    assert count // (10 * rate) == len(y)
+    # a few arrays of the output length, not a float copy of the 20 MB window (80 MB)
+    assert peak < 100 * len(y) * 8
+
+
+def test_stereo_channel(tmp_path, sine_samples):
+    path = tmp_path / 'signal.wav'
+    write_pcm_wav(path, np.stack([sine_samples, -sine_samples], axis=1) * 32768, channels=2)
+    signal = SampledSignal.from_wav(str(path), channel=1)
+    assert np.allclose(-sine_samples[:11], signal.data(0, 0.01)[1], atol=1e-4)
+
+
+def test_from_raw(tmp_path, sine_samples):
+    path = tmp_path / 'signal.raw'
+    path.write_bytes(b'head' + (sine_samples * 32768).astype('<i2').tobytes())
+    signal = SampledSignal.from_raw(str(path), rate, header_bytes=4)
+    assert np.allclose(sine_samples[:101], signal.data(0, 0.1)[1], atol=1e-4)
+
+
+def test_read_wav_format_errors(tmp_path):
+    path = tmp_path / 'signal.wav'
+    path.write_bytes(b'RIFF\0\0\0\0AVI ')
+    with pytest.raises(ValueError):
+        read_wav_format(str(path))
+    path.write_bytes(b'RIFF\0\0\0\0WAVE')
+    with pytest.raises(ValueError):
+        read_wav_format(str(path))
+
+
+def test_error_rate():
+    with pytest.raises(ValueError):
+        SampledSignal(np.zeros(3), 0)
@@ -1,7 +1,9 @@
+import numpy as np
 import pytest
 from numpy import pi
 
 from fourier.actors import SineWave
+from fourier.fourier import average_point_location, get_shape
 from tests.fixtures import sine_wave
 
 
@@ -50,7 +52,7 @@ def test_sine_wave_setter_with_frequency(sine_wave):
     assert 1 / (2 * pi) == sine_wave.frequency
 
 
-setter_errors_test_cases = ("sine_wave", "value"), [(sine_wave(), 0), (sine_wave(), -1)]
+setter_errors_test_cases = "value", [0, -1]
 
 @pytest.mark.parametrize(*setter_errors_test_cases)
 def test_sine_wave_angular_velocity_error(sine_wave, value):
@@ -78,3 +80,26 @@ def test_sine_wave_data_equal_length(sine_wave):
 def test_sine_wave_data_error_invalid_interval(sine_wave):
     with pytest.raises(ValueError):
         sine_wave.data(x1=1, x2=0)
+
+
+def test_sine_wave_centroid_close_to_sampled():
+    sine_wave = SineWave.init_frequency(3, amplitude=2, x0=0.1, y0=0.5)
+    freqs = np.array([1, 2.5, 3, 4])
+    x_avg, y_avg = sine_wave.centroid(freqs, 0, 2)
+    for fq, x, y in zip(freqs, x_avg, y_avg):
+        avg_point = average_point_location(*get_shape(sine_wave, fq, 0, 2, step=0.0001))
+        assert abs(avg_point[0] - x) < 1e-3
+        assert abs(avg_point[1] - y) < 1e-3
+
+
+def test_sine_wave_centroid_scalar(sine_wave):
+    x_avg, y_avg = sine_wave.centroid(1, 0, 1)
+    assert np.ndim(x_avg) == 0
+    assert np.ndim(y_avg) == 0
+
+
+def test_sine_wave_centroid_error(sine_wave):
+    with pytest.raises(ValueError):
+        sine_wave.centroid(0, 0, 1)
+    with pytest.raises(ValueError):
+        sine_wave.centroid(1, 1, 0)
@@ -0,0 +1,9 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def disk_cache_directory(tmp_path_factory, monkeypatch):
+    """
+    Keeps the disk cache of every test in a temporary directory instead of ~/.cache/fourier.
+    """
+    monkeypatch.setenv('FOURIER_CACHE_DIR', str(tmp_path_factory.mktemp('fourier_cache')))
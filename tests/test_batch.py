@@ -0,0 +1,99 @@
+import csv
+
+import numpy as np
+import pytest
+
+from fourier.actors import MultiSineWave
+from fourier.batch import main, read_specs, run
+
+
+@pytest.fixture
+def specs_file(tmp_path, monkeypatch):
+    monkeypatch.setenv('FOURIER_CACHE_DIR', '')
+    path = tmp_path / 'specs.txt'
+    path.write_text('# comment\n1,1;2,1/2\n\n3,0.5  # third\n')
+    return path
+
+
+def test_read_specs(specs_file):
+    specs = read_specs(str(specs_file))
+    assert ['1,1;2,1/2', '3,0.5'] == [text for text, components in specs]
+    assert 2 == len(specs[0][1])
+
+
+def test_read_specs_error(tmp_path):
+    path = tmp_path / 'specs.txt'
+    path.write_text('1,1\nnothing\n')
+    with pytest.raises(ValueError, match=':2:'):
+        read_specs(str(path))
+
+
+def test_read_specs_non_positive_frequency(tmp_path, capsys):
+    path = tmp_path / 'specs.txt'
+    path.write_text('1,1\n2,1;0,1\n')
+    with pytest.raises(ValueError, match=':2: Frequencies'):
+        read_specs(str(path))
+    assert 1 == main([str(path), '-o', str(tmp_path / 'out'), '--workers', '1'])
+    assert ':2:' in capsys.readouterr().err
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_run_npz(specs_file, tmp_path, workers):
+    output = tmp_path / 'out'
+    count, written, seconds = run(read_specs(str(specs_file)), str(output), start=1, end=4, workers=workers)
+    assert 2 == count
+    assert 0 < written
+    with np.load(str(output / '00000.npz')) as arrays:
+        assert (2, 1001) == arrays['sound'].shape
+        assert (2, ) == arrays['avg_point'].shape
+        frequencies, x_avg, y_avg = arrays['spectrum']
+        assert np.isclose(1, frequencies[0]) and np.isclose(4, frequencies[-1])
+    with open(str(output / 'index.csv')) as file:
+        assert ['1', '3,0.5'] == list(csv.reader(file))[2]
+
+
+def test_run_csv(specs_file, tmp_path):
+    output = tmp_path / 'out'
+    run(read_specs(str(specs_file)), str(output), output_format='csv', start=1, end=4, workers=1)
+    spectrum = np.loadtxt(str(output / '00001_spectrum.csv'), delimiter=',', skiprows=1)
+    assert 3 == spectrum.shape[1]
+
+
+def test_run_errors(specs_file, tmp_path):
+    with pytest.raises(ValueError):
+        run([], str(tmp_path), output_format='nope')
+    with pytest.raises(ValueError):
+        run([], str(tmp_path), backend='nope')
+
+
+def test_main(specs_file, tmp_path, capsys):
+    assert 0 == main([str(specs_file), '-o', str(tmp_path / 'out'), '--workers', '1', '--end', '3'])
+    assert '2 specs' in capsys.readouterr().out
+    assert 1 == main([str(tmp_path / 'missing.txt')])
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_run_memory(specs_file, tmp_path, workers):
+    from fourier import numeric
+    from fourier.memory import profiler
+    budget = numeric.default_max_block_bytes
+    try:
+        run(read_specs(str(specs_file)), str(tmp_path / 'out'), start=1, end=4, workers=workers,
+            profile_memory=True, memory_budget=4096)
+        stats = profiler.stats()
+    finally:
+        profiler.enabled = False
+        profiler.reset()
+    assert 2 == stats['get_shape']['calls']
+    assert 0 < stats['sweep']['peak_bytes']
+    assert budget == numeric.default_max_block_bytes
+
+
+def test_main_memory(specs_file, tmp_path, capsys):
+    from fourier.memory import profiler
+    try:
+        assert 0 == main([str(specs_file), '-o', str(tmp_path / 'out'), '--workers', '1', '--end', '3',
+                          '--memory', '--memory-budget', '65536'])
+    finally:
+        profiler.reset()
+    assert 'get_shape' in capsys.readouterr().out
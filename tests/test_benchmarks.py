@@ -0,0 +1,30 @@
+import json
+import timeit
+
+from benchmarks.suite import calls_per_measurement, compare, main
+
+
+def test_compare():
+    baseline = {'a': 1.0, 'b': 1.0, 'c': 1.0}
+    results = {'a': 1.1, 'b': 1.5, 'd': 9.0}
+    assert [('b', 1.0, 1.5)] == compare(results, baseline, tolerance=0.2)
+
+
+def test_main_save_and_compare(tmp_path, monkeypatch):
+    monkeypatch.setenv('FOURIER_CACHE_DIR', '')
+    baseline = tmp_path / 'baseline.json'
+    assert 0 == main(['--quick', '--filter', 'circle_data', '--repeat', '1', '--min-time', '0',
+                      '--save', str(baseline)])
+    assert baseline.read_text().endswith('\n')
+    data = json.loads(baseline.read_text())
+    assert {'circle_data[step=0.1]', 'circle_data[step=0.001]'} == set(data['results'])
+    data['results'] = {name: 1e-12 for name in data['results']}
+    baseline.write_text(json.dumps(data))
+    assert 1 == main(['--quick', '--filter', 'circle_data', '--repeat', '1', '--min-time', '0',
+                      '--compare', str(baseline)])
+    assert 2 == main(['--quick', '--filter', 'circle_data', '--compare', str(tmp_path / 'missing.json')])
+
+
+def test_calls_per_measurement():
+    assert 1 == calls_per_measurement(timeit.Timer(lambda: None), min_time=0)
+    assert 4 <= calls_per_measurement(timeit.Timer(lambda: None), min_time=1e-5)
@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+
+from fourier.actors import MultiSineWave, SineWave
+from fourier.cache import LRUCache, data_cache
+
+
+def test_lru_cache_hit_miss():
+    cache = LRUCache(maxsize=2)
+    assert cache.get('a') is None
+    cache.put('a', (np.zeros(3),))
+    assert cache.get('a') is not None
+    info = cache.info()
+    assert 1 == info.hits
+    assert 1 == info.misses
+    assert 1 == info.currsize
+    assert 24 == info.nbytes
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(maxsize=2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    cache.get('a')
+    cache.put('c', 3)
+    assert 'a' in cache
+    assert 'b' not in cache
+    assert 'c' in cache
+
+
+def test_lru_cache_max_bytes():
+    cache = LRUCache(maxsize=10, max_bytes=100)
+    cache.put('a', np.zeros(10))
+    cache.put('b', np.zeros(10))
+    assert 'a' not in cache
+    assert 'b' in cache
+    cache.put('c', np.zeros(100))
+    assert 'c' not in cache
+
+
+def test_lru_cache_values_read_only():
+    cache = LRUCache()
+    value = cache.put('a', (np.zeros(3), np.ones(3)))
+    with pytest.raises(ValueError):
+        value[0][0] = 1
+
+
+def test_lru_cache_resize_error():
+    with pytest.raises(ValueError):
+        LRUCache(maxsize=-1)
+
+
+def test_sine_wave_data_key_includes_step():
+    sine_wave = SineWave(2)
+    assert len(sine_wave.data(0, 1, 0.1)[0]) != len(sine_wave.data(0, 1, 0.01)[0])
+
+
+def test_sine_wave_data_key_includes_parameters():
+    sine_wave = SineWave(2)
+    before = sine_wave.data(0, 1)[1]
+    sine_wave.amplitude = 2
+    assert np.allclose(2 * before, sine_wave.data(0, 1)[1])
+
+
+def test_data_cache_shared():
+    data_cache.clear()
+    ms = MultiSineWave([SineWave(1), SineWave(2)])
+    sound = ms.data(0, 10, 0.01)
+    sweep_range = ms.data(1, 5, 0.01)
+    assert sound is MultiSineWave([SineWave(1), SineWave(2)]).data(0, 10, 0.01)
+    assert sweep_range is ms.data(1, 5, 0.01)
+    assert 2 == data_cache.info().hits
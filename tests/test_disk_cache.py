@@ -0,0 +1,83 @@
+import os
+from fractions import Fraction
+
+import numpy as np
+import pytest
+
+from fourier.disk_cache import DiskCache, cache_key, default_directory
+
+
+def test_cache_key_normalized():
+    assert cache_key('a', 2, (1, 0.5)) == cache_key('a', 2.0, (Fraction(1), Fraction(1, 2)))
+    assert cache_key('a', 2) != cache_key('a', 3)
+    assert cache_key(np.arange(3.0)) == cache_key(np.arange(3.0))
+    assert cache_key(np.arange(3.0)) != cache_key(np.arange(4.0))
+
+
+def test_cache_key_error_type():
+    with pytest.raises(TypeError):
+        cache_key(object())
+
+
+def test_default_directory(monkeypatch, tmp_path):
+    monkeypatch.setenv('FOURIER_CACHE_DIR', str(tmp_path))
+    assert str(tmp_path) == default_directory()
+    monkeypatch.setenv('FOURIER_CACHE_DIR', '')
+    assert default_directory() is None
+
+
+def test_disk_cache_round_trip(tmp_path):
+    cache = DiskCache(str(tmp_path))
+    assert cache.get('key') is None
+    cache.put('key', (np.arange(3.0), np.ones(3)))
+    x, y = cache.get('key')
+    assert isinstance(x, np.memmap)
+    assert not x.flags.writeable
+    assert np.array_equal(np.arange(3.0), x)
+    assert np.array_equal(np.ones(3), y)
+    assert (1, 1) == (cache.hits, cache.misses)
+    # no temporary files are left
+    assert ['key.npy'] == os.listdir(str(tmp_path))
+
+
+def test_disk_cache_get_or_compute(tmp_path):
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return np.arange(4.0), np.arange(4.0)
+
+    cache = DiskCache(str(tmp_path))
+    cache.get_or_compute('key', compute)
+    # another session
+    values = DiskCache(str(tmp_path)).get_or_compute('key', compute)
+    assert 1 == len(calls)
+    assert np.array_equal(np.arange(4.0), values[1])
+
+
+def test_disk_cache_evicts_least_recently_used(tmp_path):
+    cache = DiskCache(str(tmp_path), max_bytes=None)
+    for i, key in enumerate('abc'):
+        cache.put(key, (np.zeros(100),))
+        os.utime(cache.path(key), (i, i))
+    cache.get('a')
+    cache.max_bytes = cache.nbytes() - 1
+    cache.put('d', (np.zeros(100),))
+    assert cache.get('b') is None
+    assert cache.get('a') is not None
+    assert cache.get('d') is not None
+
+
+def test_disk_cache_damaged_file(tmp_path):
+    cache = DiskCache(str(tmp_path))
+    with open(cache.path('key'), 'wb') as file:
+        file.write(b'nope')
+    assert cache.get('key') is None
+    assert not os.path.exists(cache.path('key'))
+
+
+def test_disk_cache_disabled(monkeypatch):
+    monkeypatch.setenv('FOURIER_CACHE_DIR', '')
+    cache = DiskCache()
+    assert cache.put('key', (np.zeros(2),)) is not None
+    assert cache.get('key') is None
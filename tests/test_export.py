@@ -0,0 +1,146 @@
+import shutil
+import sys
+
+import numpy as np
+import pytest
+
+from fourier.actors import MultiSineWave
+from fourier import export as export_module
+from fourier.export import export, frame_plan, main, wound_shapes
+from fourier.fourier import get_shape, sample_signal
+from tests.fixtures import multi_sine_wave
+
+
+def test_frame_plan():
+    frequencies, repeats = frame_plan(6, 8, 0.25, stop_frequencies=(7, 20), pause=2, fps=10)
+    assert np.allclose(np.arange(6, 8.25, 0.25), frequencies)
+    assert 21 == repeats[4]
+    assert 9 + 20 == repeats.sum()
+
+
+def test_frame_plan_errors():
+    with pytest.raises(ValueError):
+        frame_plan(6, 8, 0)
+    with pytest.raises(ValueError):
+        frame_plan(8, 6, 0.1)
+    with pytest.raises(ValueError):
+        frame_plan(0, 6, 0.1)
+
+
+def test_wound_shapes_match_get_shape(multi_sine_wave):
+    x, y = sample_signal(multi_sine_wave, 0, 3, step=0.01)
+    shape_x, shape_y, x_avg, y_avg = wound_shapes(x, y, [1.5, 2])
+    expected = get_shape(multi_sine_wave, 2, 0, 3, step=0.01)
+    assert np.allclose(expected[0], shape_x[1])
+    assert np.allclose(expected[1], shape_y[1])
+    assert np.allclose([shape_x[0].mean(), shape_y[0].mean()], [x_avg[0], y_avg[0]])
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_export_png_sequence(tmp_path, workers):
+    output = tmp_path / 'frames'
+    frames, seconds = export(MultiSineWave.parse('3,1'), str(output), 6, 7, 0.25, stop_frequencies=(6.5,),
+                             pause=0.5, fps=4, size=(3.2, 1.8), dpi=50, workers=workers, batch_size=2)
+    assert 5 + 2 == frames
+    files = sorted(output.glob('frame_*.png'))
+    assert 7 == len(files)
+    # the pause repeats the frame of 6.5
+    assert files[2].read_bytes() == files[3].read_bytes() == files[4].read_bytes()
+    assert files[1].read_bytes() != files[2].read_bytes()
+
+
+def test_export_gif(tmp_path):
+    from PIL import Image
+    path = tmp_path / 'sweep.gif'
+    frames, seconds = export(MultiSineWave.parse('3,1'), str(path), 6, 7, 0.5, stop_frequencies=(), fps=10,
+                             size=(3.2, 1.8), dpi=50, workers=1)
+    with Image.open(str(path)) as image:
+        assert (160, 90) == image.size
+        assert frames == image.n_frames
+
+
+def test_export_gif_holds_paused_frames(tmp_path):
+    from PIL import Image
+    path = tmp_path / 'sweep.gif'
+    frames, seconds = export(MultiSineWave.parse('3,1'), str(path), 6, 7, 0.5, stop_frequencies=(6.5,), pause=2,
+                             fps=10, size=(3.2, 1.8), dpi=50, workers=1)
+    assert 3 + 20 == frames
+    with Image.open(str(path)) as image:
+        durations = []
+        for index in range(image.n_frames):
+            image.seek(index)
+            durations.append(image.info['duration'])
+    assert [100, 2100, 100] == durations
+
+
+def test_export_gif_frame_limit(tmp_path, monkeypatch):
+    monkeypatch.setattr(export_module, 'max_gif_frames', 2)
+    with pytest.raises(ValueError, match='at most 2'):
+        export(MultiSineWave.parse('3,1'), str(tmp_path / 'sweep.gif'), 6, 7, 0.5, workers=1)
+    assert not (tmp_path / 'sweep.gif').exists()
+
+
+@pytest.fixture
+def fake_ffmpeg(tmp_path, monkeypatch):
+    """
+    ffmpeg replacement that writes its arguments and the number of bytes it read into the output file.
+    """
+    script = tmp_path / 'ffmpeg'
+    script.write_text('#!{}\n'
+                      'import sys\n'
+                      'size = len(sys.stdin.buffer.read())\n'
+                      'with open(sys.argv[-1], "w") as file:\n'
+                      '    file.write(" ".join(sys.argv[1:]) + "\\n" + str(size))\n'.format(sys.executable))
+    script.chmod(0o755)
+    monkeypatch.setattr(export_module.shutil, 'which', lambda name: str(script))
+
+
+def test_export_video_pipe(tmp_path, fake_ffmpeg):
+    path = tmp_path / 'sweep.mp4'
+    frames, seconds = export(MultiSineWave.parse('3,1'), str(path), 6, 7, 0.5, stop_frequencies=(6.5,), pause=1,
+                             fps=4, size=(1.01, 0.75), dpi=100, workers=1)
+    arguments, size = path.read_text().splitlines()
+    assert '-s 101x75' in arguments
+    assert 'pad=ceil(iw/2)*2:ceil(ih/2)*2' in arguments
+    assert frames * 101 * 75 * 4 == int(size)
+
+
+def test_export_video_stops_ffmpeg_on_errors(tmp_path, fake_ffmpeg, monkeypatch):
+    processes = []
+    popen = export_module.subprocess.Popen
+
+    def record(*args, **kwargs):
+        processes.append(popen(*args, **kwargs))
+        return processes[-1]
+
+    def fail(*args):
+        raise RuntimeError('rendering failed')
+        yield
+
+    monkeypatch.setattr(export_module.subprocess, 'Popen', record)
+    monkeypatch.setattr(export_module, '_results', fail)
+    with pytest.raises(RuntimeError):
+        export(MultiSineWave.parse('3,1'), str(tmp_path / 'sweep.mp4'), 6, 7, 0.5, workers=1)
+    assert 1 == len(processes)
+    assert processes[0].returncode is not None
+    assert processes[0].stdin.closed
+
+
+@pytest.mark.skipif(shutil.which('ffmpeg') is None, reason='needs ffmpeg')
+def test_export_video_odd_size(tmp_path):
+    path = tmp_path / 'sweep.mp4'
+    export(MultiSineWave.parse('3,1'), str(path), 6, 7, 0.5, fps=4, size=(1.01, 0.75), dpi=100, workers=1)
+    assert 0 < path.stat().st_size
+
+
+@pytest.mark.skipif(shutil.which('ffmpeg') is not None, reason='ffmpeg is installed')
+def test_export_video_needs_ffmpeg(tmp_path):
+    with pytest.raises(OSError, match='ffmpeg'):
+        export(MultiSineWave.parse('3,1'), str(tmp_path / 'sweep.mp4'), 6, 7, 0.5, workers=1)
+
+
+def test_main(tmp_path, capsys):
+    assert 0 == main([str(tmp_path / 'frames'), '--end', '6.02', '--frequency-step', '0.01', '--stops',
+                      '--dpi', '20', '--workers', '1'])
+    assert '3 frames' in capsys.readouterr().out
+    assert 1 == main([str(tmp_path / 'frames'), '--signal', 'nope'])
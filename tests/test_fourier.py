@@ -1,6 +1,12 @@
+import tracemalloc
+
+import numpy as np
 import pytest
-from fourier.fourier import average_point_location, get_shape
-from tests.fixtures import sine_wave
+from fourier.actors import MultiSineWave, SineWave
+from fourier.cache import data_cache
+from fourier.fourier import (average_point_location, centroid_from_samples, dominant_frequencies, get_shape,
+                             iter_chunks, iter_shape, streaming_centroid, winding_centroid)
+from tests.fixtures import multi_sine_wave, sine_wave
 
 
 def test_average_point_location():
@@ -11,6 +17,18 @@ def test_average_point_location():
     assert 3 == avg_loc[1]
 
 
+def test_average_point_location_arrays():
+    avg_loc = average_point_location(np.array([0, 4, 0, 0]), np.array([1, 2, 3, 6]))
+    assert 1 == avg_loc[0]
+    assert 3 == avg_loc[1]
+
+
+def test_average_point_location_complex():
+    avg_loc = average_point_location(np.array([0 + 1j, 4 + 2j, 3j, 6j]))
+    assert 1 == avg_loc[0]
+    assert 3 == avg_loc[1]
+
+
 def test_average_length_error():
     x = [1, 2, 3]
     y = [1, 2, 3, 4]
@@ -33,3 +51,124 @@ def test_get_shape_error_a_b(sine_wave):
 def test_get_shape_equal_len(sine_wave):
     real, imag = get_shape(sine_wave, 2, -1, 5)
     assert len(real) == len(imag)
+
+
+@pytest.mark.parametrize("summation", ['dot', 'pairwise', 'compensated'])
+def test_winding_centroid_matches_get_shape(multi_sine_wave, summation):
+    freqs = np.array([0.5, 1, 1.5, 2])
+    x_avg, y_avg = winding_centroid(multi_sine_wave, freqs, 0, 3, step=0.001, summation=summation)
+    for fq, x, y in zip(freqs, x_avg, y_avg):
+        avg_loc = average_point_location(*get_shape(multi_sine_wave, fq, 0, 3, step=0.001))
+        assert np.isclose(avg_loc[0], x, atol=1e-12)
+        assert np.isclose(avg_loc[1], y, atol=1e-12)
+
+
+def test_compensated_summation_continues_across_column_chunks():
+    x = np.linspace(0, 30, 30001)
+    y = np.random.default_rng(1).normal(size=len(x)) * 1e8 + 1
+    frequencies = np.array([0.5, 1, 3])
+    # a budget of 512 columns, one frequency at a time
+    x_avg, y_avg = centroid_from_samples(x, y, frequencies, summation='compensated', max_block_bytes=3 * 8 * 512)
+    for i, frequency in enumerate(frequencies):
+        expected = centroid_from_samples(x, y, frequencies[i:i + 1], summation='compensated')
+        assert expected[0][0] == x_avg[i]
+        assert expected[1][0] == y_avg[i]
+
+
+def test_winding_centroid_scalar(multi_sine_wave):
+    x_avg, y_avg = winding_centroid(multi_sine_wave, 2, 0, 3)
+    assert np.ndim(x_avg) == 0
+    assert np.ndim(y_avg) == 0
+
+
+def test_winding_centroid_errors(multi_sine_wave):
+    with pytest.raises(ValueError):
+        winding_centroid(multi_sine_wave, [1, 0], 0, 1)
+    with pytest.raises(ValueError):
+        winding_centroid(multi_sine_wave, 1, 1, 0)
+    with pytest.raises(ValueError):
+        winding_centroid(multi_sine_wave, 1, 0, 1, summation='nope')
+
+
+def test_dominant_frequencies():
+    freqs = np.linspace(1, 5, 81)
+    x_avg, y_avg = winding_centroid(MultiSineWave([SineWave.init_frequency(2.02),
+                                                   SineWave.init_frequency(3.51, amplitude=0.5)]),
+                                    freqs, 0, 10, step=0.001)
+    peaks, magnitudes, phases = dominant_frequencies(freqs, x_avg, y_avg, k=2)
+    # between the grid points
+    assert np.allclose(peaks, [2.02, 3.51], atol=0.01)
+    assert np.allclose(magnitudes, [0.5, 0.25], atol=0.02)
+    assert phases.shape == (2,)
+
+
+def test_dominant_frequencies_k():
+    freqs = np.arange(10.0)
+    magnitude = np.array([0, 3, 0, 1, 0, 2, 0, 5, 0, 0])
+    peaks, magnitudes, _ = dominant_frequencies(freqs, magnitude, np.zeros(10), k=3)
+    assert np.array_equal([7, 1, 5], peaks)
+    assert np.array_equal([5, 3, 2], magnitudes)
+    assert 0 == len(dominant_frequencies(freqs, magnitude, np.zeros(10), k=0)[0])
+
+
+def test_dominant_frequencies_error_length():
+    with pytest.raises(ValueError):
+        dominant_frequencies([1, 2, 3], [1, 2], [1, 2, 3])
+
+
+def test_iter_chunks(multi_sine_wave):
+    chunks = list(iter_chunks(multi_sine_wave, 0, 1, step=0.01, chunk_size=30))
+    assert [30, 30, 30, 11] == [len(x) for x, y in chunks]
+    x = np.concatenate([x for x, y in chunks])
+    assert np.allclose(multi_sine_wave.data(0, 1, step=0.01)[0], x)
+
+
+def test_iter_shape(multi_sine_wave):
+    parts = list(iter_shape(multi_sine_wave, 2, 0, 1, step=0.01, chunk_size=7))
+    shape = get_shape(multi_sine_wave, 2, 0, 1, step=0.01)
+    assert np.allclose(shape[0], np.concatenate([x for x, y in parts]))
+    assert np.allclose(shape[1], np.concatenate([y for x, y in parts]))
+
+
+@pytest.mark.parametrize('chunk_size', [1, 64, 10 ** 6])
+def test_streaming_centroid_matches_winding_centroid(multi_sine_wave, chunk_size):
+    freqs = np.array([[0.5, 1], [2, 3]])
+    x_avg, y_avg = streaming_centroid(multi_sine_wave, freqs, 0, 3, step=0.01, chunk_size=chunk_size)
+    expected = winding_centroid(multi_sine_wave, freqs, 0, 3, step=0.01)
+    assert freqs.shape == x_avg.shape
+    assert np.allclose(expected[0], x_avg)
+    assert np.allclose(expected[1], y_avg)
+
+
+def test_streaming_centroid_decimated_shape(multi_sine_wave):
+    x_avg, y_avg, shape = streaming_centroid(multi_sine_wave, 2, 0, 10, step=0.01, chunk_size=77,
+                                             shape_points=100)
+    expected = get_shape(multi_sine_wave, 2, 0, 10, step=0.01)
+    assert np.allclose(expected[0][::11], shape[0])
+    assert np.allclose(expected[1][::11], shape[1])
+
+
+def test_streaming_centroid_memory_depends_on_chunk_size(multi_sine_wave):
+    chunk_size = 8192
+    entries = len(data_cache)
+    tracemalloc.start()
+    try:
+        streaming_centroid(multi_sine_wave, [1, 2, 3], 0, 1000, step=0.001, chunk_size=chunk_size)
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    # 10 ** 6 samples, but only about a dozen chunk sized arrays at a time and none kept afterwards
+    assert peak < 16 * chunk_size * 8
+    assert current < chunk_size * 8
+    assert entries == len(data_cache)
+
+
+def test_streaming_centroid_errors(multi_sine_wave):
+    with pytest.raises(ValueError):
+        streaming_centroid(multi_sine_wave, [1, 2], 0, 1, shape_points=10)
+    with pytest.raises(ValueError):
+        streaming_centroid(multi_sine_wave, 0, 0, 1)
+    with pytest.raises(ValueError):
+        streaming_centroid(multi_sine_wave, 1, 0, 1, chunk_size=0)
+    with pytest.raises(ValueError):
+        streaming_centroid(MultiSineWave(), 1, 0, 1)
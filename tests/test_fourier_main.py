@@ -1,5 +1,9 @@
 import fourier.main_window
 
 
-def test_main_window_no_errors():
+def test_main_window_no_errors(monkeypatch, tmp_path):
+    monkeypatch.setenv('FOURIER_CACHE_DIR', str(tmp_path))
     fourier.main_window.main_window(show=False)
+    # the second window reads the spectrum from the disk cache
+    fourier.main_window.main_window(show=False)
+    assert 1 == len(list(tmp_path.glob('*.npy')))
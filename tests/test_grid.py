@@ -0,0 +1,69 @@
+import pickle
+
+import numpy as np
+import pytest
+
+from fourier.actors import MultiSineWave, SineWave
+from fourier.fourier import get_shape
+from fourier.grid import SampleGrid, as_grid
+from tests.fixtures import multi_sine_wave
+
+
+def test_sample_grid_interned():
+    assert SampleGrid(0, 1, 0.1) is SampleGrid(0.0, 1, 0.1)
+    assert SampleGrid(0, 1, 0.1) is not SampleGrid(0, 1, 0.01)
+
+
+def test_sample_grid_hashable():
+    grids = {SampleGrid(0, 1, 0.1): 1}
+    assert 1 == grids[SampleGrid(0, 1, 0.1)]
+
+
+def test_sample_grid_immutable():
+    grid = SampleGrid(0, 1, 0.1)
+    with pytest.raises(AttributeError):
+        grid.step = 1
+
+
+def test_sample_grid_values():
+    grid = SampleGrid(0, 0.3, 0.1)
+    assert 4 == len(grid)
+    assert np.allclose([0, 0.1, 0.2, 0.3], grid.values)
+    assert grid.values is grid.values
+    assert not grid.values.flags.writeable
+
+
+def test_sample_grid_array_dtype():
+    assert np.float32 == SampleGrid(0, 1, 0.1).array(np.float32).dtype
+
+
+def test_sample_grid_errors():
+    with pytest.raises(ValueError):
+        SampleGrid(0, 1, 0)
+    with pytest.raises(ValueError):
+        SampleGrid(1, 0, 0.1)
+
+
+def test_sample_grid_pickle():
+    grid = SampleGrid(0, 1, 0.1)
+    assert grid is pickle.loads(pickle.dumps(grid))
+
+
+def test_as_grid():
+    grid = SampleGrid(0, 1, 0.1)
+    assert grid is as_grid(grid)
+    assert grid is as_grid(0, 1, 0.1)
+
+
+def test_actors_share_grid_buffer(multi_sine_wave):
+    grid = SampleGrid(0, 5, 0.01)
+    assert multi_sine_wave.data(grid)[0] is grid.values
+    assert SineWave(2).data(0, 5, 0.01)[0] is grid.values
+
+
+def test_get_shape_accepts_grid(multi_sine_wave):
+    grid = SampleGrid(0, 5, 0.01)
+    expected = get_shape(multi_sine_wave, 2, 0, 5, step=0.01)
+    shape = get_shape(multi_sine_wave, 2, grid)
+    assert np.array_equal(expected[0], shape[0])
+    assert np.array_equal(expected[1], shape[1])
@@ -0,0 +1,68 @@
+import json
+import time
+
+import numpy as np
+from matplotlib.figure import Figure
+
+from fourier.instrumentation import LatencyOverlay, Tracer
+
+
+def test_disabled_tracer_records_nothing():
+    tracer = Tracer()
+    with tracer.span('stage'):
+        pass
+    assert tracer.wrap('stage', lambda: 3)() == 3
+    tracer.mark_frame()
+    assert {} == tracer.stats()
+    assert tracer.percentiles('stage') is None
+    assert 0 == tracer.fps()
+
+
+def test_percentiles():
+    tracer = Tracer(enabled=True, window=100)
+    for duration in range(1, 201):
+        tracer.record('stage', 0, duration * 10 ** 6)
+    # only the latest window durations count
+    assert np.allclose([150.5, 195.05], tracer.percentiles('stage'))
+    count, p50, p95 = tracer.stats()['stage']
+    assert 100 == count
+
+
+def test_span_and_wrap():
+    tracer = Tracer(enabled=True)
+    with tracer.span('sleep'):
+        time.sleep(0.01)
+    assert tracer.percentiles('sleep', q=50) >= 10
+    wrapped = tracer.wrap('add', lambda a, b: a + b)
+    assert 5 == wrapped(2, 3)
+    assert ['add', 'sleep'] == list(tracer.stats())
+
+
+def test_fps():
+    tracer = Tracer(enabled=True)
+    for _ in range(3):
+        tracer.mark_frame()
+        time.sleep(0.01)
+    assert 0 < tracer.fps() < 110
+
+
+def test_export_chrome_trace(tmp_path):
+    tracer = Tracer(enabled=True)
+    tracer.record('stage', 2000, 5000)
+    path = tmp_path / 'trace.json'
+    assert 1 == tracer.export_chrome_trace(str(path))
+    event = json.loads(path.read_text())['traceEvents'][0]
+    assert ('stage', 'X', 2, 5) == (event['name'], event['ph'], event['ts'], event['dur'])
+    tracer.reset()
+    assert {} == tracer.stats()
+
+
+def test_latency_overlay():
+    tracer = Tracer()
+    overlay = LatencyOverlay(Figure(), tracer)
+    assert not overlay.update().get_visible()
+    tracer.enabled = True
+    tracer.record('draw', 0, 2 * 10 ** 6)
+    text = overlay.update()
+    assert text.get_visible()
+    assert 'draw p50 2.00 ms' in text.get_text()
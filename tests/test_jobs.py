@@ -0,0 +1,22 @@
+import numpy as np
+
+from fourier.actors import MultiSineWave
+from fourier.jobs import compute_all, compute_spectrogram
+
+
+def test_compute_all(monkeypatch, tmp_path):
+    monkeypatch.setenv('FOURIER_CACHE_DIR', str(tmp_path))
+    sound, (shape, avg_point), (frequencies, x_avg, y_avg, ideal) = compute_all(
+        MultiSineWave.parse('2,1'), 2, 1, 4, 'direct', True)
+    assert len(sound[0]) == len(shape[0])
+    assert np.allclose(1, frequencies[0]) and np.allclose(4, frequencies[-1])
+    assert 2 == len(ideal)
+    assert 1 == len(list(tmp_path.glob('*.npy')))
+
+
+def test_compute_spectrogram():
+    times, frequencies, magnitudes = compute_spectrogram(MultiSineWave.parse('2,1'), 0, 100, 1, 4, 1,
+                                                         max_windows=50, n_frequencies=31)
+    assert (31, len(times)) == magnitudes.shape
+    assert len(times) <= 51
+    assert np.allclose(2, frequencies[magnitudes.argmax(axis=0)])
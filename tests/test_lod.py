@@ -0,0 +1,50 @@
+import numpy as np
+from matplotlib.figure import Figure
+
+from fourier.lod import LODLine, minmax_decimate
+
+
+def test_minmax_decimate_short_line_unchanged():
+    x = np.arange(10.0)
+    y = np.sin(x)
+    x_out, y_out = minmax_decimate(x, y, 0, 9, 100)
+    assert np.array_equal(x, x_out)
+    assert np.array_equal(y, y_out)
+
+
+def test_minmax_decimate_keeps_envelope():
+    x = np.linspace(0, 10, 100001)
+    y = np.sin(7 * x) + 0.1 * np.sin(300 * x)
+    x_out, y_out = minmax_decimate(x, y, 0, 10, 200)
+    assert len(x_out) <= 2 * 200 + 2
+    assert y.max() == y_out.max()
+    assert y.min() == y_out.min()
+    assert np.all(np.diff(x_out) >= 0)
+
+
+def test_minmax_decimate_visible_range():
+    x = np.linspace(0, 10, 10001)
+    y = x.copy()
+    x_out, y_out = minmax_decimate(x, y, 2, 3, 50)
+    # one point beyond each boundary
+    assert x_out[0] < 2 <= x_out[1]
+    assert x_out[-2] <= 3 < x_out[-1]
+    assert np.isclose(y_out[1], 2)
+
+
+def test_lod_line_follows_xlim():
+    figure = Figure(figsize=(2, 1), dpi=100)
+    axes = figure.add_subplot(111)
+    x = np.linspace(0, 10, 100001)
+    lod = LODLine(axes.plot([], [])[0], x, np.sin(x))
+    full = lod.line.get_xdata()
+    assert len(full) < 1000
+    assert full[0] == 0 and full[-1] == 10
+
+    axes.set_xlim(4, 5)
+    zoomed = lod.line.get_xdata()
+    assert zoomed[0] < 4 and 5 < zoomed[-1] < 5.1
+
+    lod.disconnect()
+    axes.set_xlim(0, 1)
+    assert np.array_equal(zoomed, lod.line.get_xdata())
@@ -0,0 +1,186 @@
+import threading
+import time
+import tracemalloc
+
+import numpy as np
+import pytest
+
+from fourier import numeric
+from fourier.actors import MultiSineWave
+from fourier.cache import data_cache
+from fourier.fourier import get_shape, winding_centroid
+from fourier.memory import MemoryProfiler, profiler
+from tests.fixtures import multi_sine_wave
+
+
+@pytest.fixture
+def enabled_profiler():
+    data_cache.clear()
+    profiler.reset()
+    profiler.enabled = True
+    yield profiler
+    profiler.enabled = False
+    profiler.reset()
+
+
+@pytest.fixture
+def small_budget():
+    previous = numeric.default_max_block_bytes
+    numeric.set_memory_budget(4096)
+    yield
+    numeric.set_memory_budget(previous)
+
+
+def test_disabled_profiler_records_nothing():
+    memory_profiler = MemoryProfiler()
+    with memory_profiler.profile('call'):
+        memory_profiler.track(np.zeros(10))
+    assert 3 == memory_profiler.profiled('call')(lambda: 3)()
+    assert {} == memory_profiler.stats()
+
+
+def test_profile_peak_and_temporaries():
+    memory_profiler = MemoryProfiler()
+    memory_profiler.enabled = True
+    try:
+        with memory_profiler.profile('outer'):
+            with memory_profiler.profile('inner'):
+                values = np.ones(100000)
+                memory_profiler.track(values, values)
+                del values
+            small = np.ones(10)
+            memory_profiler.track(small)
+    finally:
+        memory_profiler.enabled = False
+    stats = memory_profiler.stats()
+    assert 800000 <= stats['inner']['peak_bytes']
+    assert (2, 1600000) == (stats['inner']['temporaries'], stats['inner']['temporary_bytes'])
+    # the peak of the nested call counts for the enclosing call, its temporaries do not
+    assert stats['inner']['peak_bytes'] <= stats['outer']['peak_bytes']
+    assert (1, 80) == (stats['outer']['temporaries'], stats['outer']['temporary_bytes'])
+    assert not tracemalloc.is_tracing()
+
+
+def test_profile_threads():
+    memory_profiler = MemoryProfiler()
+    memory_profiler.enabled = True
+    try:
+        thread = threading.Thread(target=memory_profiler.profiled('worker')(lambda: np.ones(1000)))
+        thread.start()
+        thread.join()
+    finally:
+        memory_profiler.enabled = False
+    assert 1 == memory_profiler.stats()['worker']['calls']
+
+
+def test_profiled_calls_of_threads_do_not_overlap():
+    memory_profiler = MemoryProfiler()
+    started = threading.Event()
+
+    @memory_profiler.profiled('large')
+    def large():
+        started.set()
+        # the other thread tries to start its call in the meantime
+        time.sleep(0.1)
+        values = np.ones(1000000)
+        del values
+
+    @memory_profiler.profiled('small')
+    def small():
+        values = np.ones(10)
+        time.sleep(0.2)
+        del values
+
+    def other():
+        started.wait()
+        small()
+
+    memory_profiler.enabled = True
+    try:
+        thread = threading.Thread(target=other)
+        thread.start()
+        large()
+        thread.join()
+    finally:
+        memory_profiler.enabled = False
+    stats = memory_profiler.stats()
+    assert 8000000 <= stats['large']['peak_bytes']
+    assert stats['small']['peak_bytes'] < 1000000
+
+
+def test_disabling_inside_a_call_releases_the_profiler():
+    memory_profiler = MemoryProfiler()
+    memory_profiler.enabled = True
+    with memory_profiler.profile('call'):
+        memory_profiler.enabled = False
+    memory_profiler.enabled = True
+    try:
+        thread = threading.Thread(target=memory_profiler.profiled('worker')(lambda: None))
+        thread.start()
+        thread.join(timeout=5)
+        assert not thread.is_alive()
+    finally:
+        memory_profiler.enabled = False
+    assert {'worker'} == set(memory_profiler.stats())
+
+
+def test_merge_and_report():
+    memory_profiler = MemoryProfiler()
+    stats = {'get_shape': {'calls': 2, 'peak_bytes': 2048, 'temporaries': 3, 'temporary_bytes': 1024}}
+    memory_profiler.merge(stats)
+    memory_profiler.merge(stats)
+    assert {'calls': 4, 'peak_bytes': 2048, 'temporaries': 3, 'temporary_bytes': 1024} == \
+        memory_profiler.stats()['get_shape']
+    assert 'get_shape' in memory_profiler.report().splitlines()[1]
+
+
+def test_kernel_calls_are_profiled(enabled_profiler, multi_sine_wave):
+    get_shape(multi_sine_wave, 2, 0, 10, step=0.01)
+    stats = enabled_profiler.stats()
+    assert {'get_shape', 'MultiSineWave.data'} <= set(stats)
+    assert 3 == stats['get_shape']['temporaries']
+    assert 3 * 1001 * 8 == stats['get_shape']['temporary_bytes']
+    assert 0 < stats['MultiSineWave.data']['peak_bytes'] <= stats['get_shape']['peak_bytes']
+
+
+def test_memory_budget_chunks_the_kernels(enabled_profiler, multi_sine_wave):
+    expected_data = multi_sine_wave.data(0, 100, step=0.01)
+    expected_shape = get_shape(multi_sine_wave, 2, 0, 100, step=0.01)
+    expected_centroid = winding_centroid(multi_sine_wave, [1, 2, 3], 0, 100, step=0.01)
+    previous = numeric.default_max_block_bytes
+    data_cache.clear()
+    enabled_profiler.reset()
+    numeric.set_memory_budget(4096)
+    try:
+        data = multi_sine_wave.data(0, 100, step=0.01)
+        shape = get_shape(multi_sine_wave, 2, 0, 100, step=0.01)
+        centroid = winding_centroid(multi_sine_wave, [1, 2, 3], 0, 100, step=0.01)
+    finally:
+        numeric.set_memory_budget(previous)
+    assert np.array_equal(expected_data[1], data[1])
+    assert np.array_equal(expected_shape, shape)
+    assert np.allclose(expected_centroid, centroid, rtol=0, atol=1e-12)
+    stats = enabled_profiler.stats()
+    # 10001 samples in chunks of at most 4096 bytes
+    assert 10001 // 512 < stats['MultiSineWave.data']['temporaries']
+    assert 3 * 10001 * 8 // 4096 < stats['get_shape']['temporaries']
+    assert stats['winding_centroid']['peak_bytes'] < 3 * 10001 * 8
+
+
+def test_set_memory_budget():
+    previous = numeric.default_max_block_bytes
+    try:
+        numeric.set_memory_budget(1000)
+        assert 1000 == numeric.default_max_block_bytes
+        numeric.set_memory_budget()
+        assert 2 ** 24 == numeric.default_max_block_bytes
+        with pytest.raises(ValueError):
+            numeric.set_memory_budget(0)
+    finally:
+        numeric.set_memory_budget(previous)
+
+
+def test_small_budget_still_evaluates_everything(small_budget):
+    msw = MultiSineWave.parse('1,1;2,0.5;3,0.25')
+    x, y = msw.data(0, 20, step=0.001)
+    assert np.allclose(np.sin(2 * np.pi * x) + 0.5 * np.sin(4 * np.pi * x) + 0.25 * np.sin(6 * np.pi * x), y)
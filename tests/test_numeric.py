@@ -0,0 +1,52 @@
+from fractions import Fraction
+
+import numpy as np
+import pytest
+
+from fourier import numeric
+from fourier.actors import SineWave
+
+
+def test_as_array_fraction_objects():
+    values = np.array([Fraction(1, 2), Fraction(3, 4)], dtype=object)
+    array = numeric.as_array(values)
+    assert array.dtype == np.float64
+    assert array.flags.c_contiguous
+    assert np.array_equal(array, [0.5, 0.75])
+
+
+def test_as_array_contiguous():
+    array = numeric.as_array(np.arange(10.0)[::2])
+    assert array.flags.c_contiguous
+
+
+def test_as_exact():
+    assert Fraction(3, 2) == numeric.as_exact('3/2')
+    assert Fraction(1, 3) == numeric.as_exact(1 / 3)
+
+
+def test_common_period():
+    assert Fraction(10) == numeric.common_period([3, Fraction(3, 2), '2/5'])
+    assert Fraction(1, 3) == numeric.common_period([SineWave.init_frequency(3).frequency])
+    assert numeric.common_period([]) is None
+
+
+def test_sine_wave_data_fraction_amplitude_is_float():
+    sine_wave = SineWave.init_frequency(Fraction(3), amplitude=Fraction(1, 3))
+    x, y = sine_wave.data(0, 1)
+    assert x.dtype == np.float64
+    assert y.dtype == np.float64
+
+
+def test_set_default_dtype():
+    numeric.set_default_dtype(np.float32)
+    try:
+        x, y = SineWave(2).data(0, 1)
+        assert y.dtype == np.float32
+    finally:
+        numeric.set_default_dtype(np.float64)
+
+
+def test_set_default_dtype_error():
+    with pytest.raises(ValueError):
+        numeric.set_default_dtype(np.int32)
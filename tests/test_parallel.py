@@ -0,0 +1,33 @@
+import numpy as np
+import pytest
+
+from fourier.parallel import _partition, parallel_sweep
+from fourier.sweep import frequency_range, sweep
+from tests.fixtures import multi_sine_wave
+
+
+@pytest.mark.parametrize('executor', ['thread', 'process'])
+@pytest.mark.parametrize('max_block_bytes', [None, 20000])
+def test_parallel_sweep_identical_to_serial(multi_sine_wave, executor, max_block_bytes):
+    freqs = frequency_range(1, 5, 0.01)
+    expected = sweep(multi_sine_wave, freqs, 0, 3, step=0.01, max_block_bytes=max_block_bytes)
+    result = parallel_sweep(multi_sine_wave, freqs, 0, 3, step=0.01, executor=executor, workers=2,
+                            max_block_bytes=max_block_bytes)
+    for expected_values, values in zip(expected, result):
+        assert np.array_equal(expected_values, values)
+
+
+def test_partition():
+    parts = _partition(10, 3, 8)
+    assert [(0, 3), (3, 6), (6, 9), (9, 10)] == parts
+    assert [(0, 6), (6, 10)] == _partition(10, 3, 2)
+    assert [] == _partition(0, 3, 2)
+
+
+def test_parallel_sweep_errors(multi_sine_wave):
+    with pytest.raises(ValueError):
+        parallel_sweep(multi_sine_wave, [1], 0, 1, executor='nope')
+    with pytest.raises(ValueError):
+        parallel_sweep(multi_sine_wave, [1, 0], 0, 1)
+    with pytest.raises(ValueError):
+        parallel_sweep(multi_sine_wave, [1], 1, 0)
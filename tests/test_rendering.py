@@ -0,0 +1,46 @@
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from fourier.rendering import BlitRenderer
+
+
+def make_renderer(schedule=None):
+    figure = Figure()
+    canvas = FigureCanvasAgg(figure)
+    axes = figure.add_subplot(111)
+    line = axes.plot([0, 1], [0, 1])[0]
+    renderer = BlitRenderer(canvas, schedule=schedule)
+    renderer.add(line)
+    return renderer, axes, line
+
+
+def test_blit_after_first_full_draw():
+    renderer, axes, line = make_renderer()
+    renderer.canvas.draw()
+    assert 1 == renderer.full_draws
+    line.set_ydata([0.2, 0.8])
+    renderer.update()
+    assert 1 == renderer.blits
+    assert 1 == renderer.full_draws
+
+
+def test_autoscale_only_when_needed():
+    renderer, axes, line = make_renderer()
+    renderer.canvas.draw()
+    line.set_ydata([0.1, 0.9])
+    assert not renderer.autoscale(axes)
+    line.set_ydata([0, 10])
+    assert renderer.autoscale(axes)
+    renderer.update()
+    assert 0 == renderer.blits
+
+
+def test_request_update_coalesced():
+    scheduled = []
+    renderer, axes, line = make_renderer(schedule=scheduled.append)
+    renderer.canvas.draw()
+    for i in range(5):
+        renderer.request_update()
+    assert 1 == len(scheduled)
+    scheduled.pop()()
+    assert 1 == renderer.blits
@@ -0,0 +1,114 @@
+import threading
+import time
+
+import pytest
+
+from fourier.instrumentation import tracer
+from fourier.scheduler import ComputeScheduler
+
+
+def wait_idle(scheduler, timeout=5):
+    end = time.time() + timeout
+    while scheduler.busy():
+        assert time.time() < end
+        time.sleep(0.001)
+
+
+@pytest.fixture
+def scheduler():
+    scheduler = ComputeScheduler(None)
+    yield scheduler
+    scheduler.shutdown(wait=True)
+
+
+def test_scheduler_applies_result(scheduler):
+    results = []
+    scheduler.submit('a', pow, 2, 3, callback=results.append)
+    wait_idle(scheduler)
+    assert 1 == scheduler.process_results()
+    assert [8] == results
+
+
+def test_scheduler_drops_superseded_results(scheduler):
+    release = threading.Event()
+    started = []
+    results = []
+
+    def job(value):
+        started.append(value)
+        release.wait(5)
+        return value
+
+    for value in range(10):
+        scheduler.submit('a', job, value, callback=results.append)
+    release.set()
+    wait_idle(scheduler)
+    scheduler.process_results()
+    # only the running job and the latest pending one were computed
+    assert [0, 9] == started
+    assert [9] == results
+
+
+def test_scheduler_cancel(scheduler):
+    results = []
+    scheduler.submit('a', pow, 2, 3, callback=results.append)
+    scheduler.cancel('a')
+    wait_idle(scheduler)
+    scheduler.process_results()
+    assert [] == results
+
+
+def test_scheduler_channels_independent(scheduler):
+    results = []
+    scheduler.submit('a', pow, 2, 3, callback=results.append)
+    scheduler.submit('b', pow, 3, 2, callback=results.append)
+    wait_idle(scheduler)
+    scheduler.process_results()
+    assert [8, 9] == sorted(results)
+
+
+def test_scheduler_error_callback(scheduler):
+    errors = []
+    scheduler.submit('a', pow, 'x', 2, error_callback=errors.append)
+    wait_idle(scheduler)
+    scheduler.process_results()
+    assert isinstance(errors[0], TypeError)
+
+
+def test_scheduler_error_without_callback_does_not_abort(scheduler, capsys):
+    results = []
+    scheduler.submit('a', pow, 'x', 2)
+    scheduler.submit('b', pow, 2, 3, callback=results.append)
+    wait_idle(scheduler)
+    assert 2 == scheduler.process_results()
+    assert [8] == results
+    assert 'TypeError' in capsys.readouterr().err
+
+
+def test_scheduler_polls_with_after():
+    calls = []
+
+    class Root:
+        def after(self, ms, func):
+            calls.append(func)
+
+    scheduler = ComputeScheduler(Root())
+    results = []
+    scheduler.submit('a', pow, 2, 3, callback=results.append)
+    scheduler.submit('a', pow, 2, 4, callback=results.append)
+    assert 1 == len(calls)
+    wait_idle(scheduler)
+    calls.pop()()
+    assert [16] == results
+    assert [] == calls
+    scheduler.shutdown(wait=True)
+
+
+def test_scheduler_traces_stages(scheduler, monkeypatch):
+    monkeypatch.setattr(tracer, 'enabled', True)
+    tracer.reset()
+    scheduler.submit('a', pow, 2, 3, callback=lambda result: None)
+    wait_idle(scheduler)
+    scheduler.process_results()
+    assert {'compute_a', 'apply_a'} <= set(tracer.stats())
+    tracer.reset()
@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+from fourier.actors import MultiSineWave, SineWave
+from fourier.fourier import winding_centroid
+from fourier.spectrogram import spectrogram
+from tests.fixtures import multi_sine_wave
+
+
+def test_spectrogram_rect_matches_winding_centroid(multi_sine_wave):
+    freqs = np.linspace(0.5, 3, 26)
+    times, frequencies, x_avg, y_avg = spectrogram(multi_sine_wave, freqs, 0, 5, step=0.01, window_length=1,
+                                                   hop=0.5, window='rect', max_block_bytes=4000)
+    assert (len(times), len(freqs)) == x_avg.shape == y_avg.shape
+    assert np.allclose(0.495 + 0.5 * np.arange(len(times)), times)
+    for index, time in enumerate(times):
+        start = index * 0.5
+        expected = winding_centroid(multi_sine_wave, freqs, start, start + 0.99, step=0.01)
+        assert np.allclose(expected[0], x_avg[index])
+        assert np.allclose(expected[1], y_avg[index])
+
+
+def test_spectrogram_follows_frequency_change():
+    # 2 Hz during the first 5 s, 4 Hz afterwards
+    class Chirp:
+        def data(self, x1, x2, step):
+            x = np.arange(x1, x2 + step / 2, step)
+            return x, np.sin(2 * np.pi * np.where(x < 5, 2, 4) * x)
+
+    freqs = np.linspace(1, 5, 41)
+    times, _, x_avg, y_avg = spectrogram(Chirp(), freqs, 0, 10, step=0.01, window_length=2)
+    peaks = freqs[np.hypot(x_avg, y_avg).argmax(axis=1)]
+    assert np.allclose(2, peaks[times < 4])
+    assert np.allclose(4, peaks[times > 6])
+    # a windowed sine wave keeps its amplitude
+    assert np.isclose(0.5, np.hypot(x_avg, y_avg).max(), atol=0.02)
+
+
+def test_spectrogram_errors(multi_sine_wave):
+    with pytest.raises(ValueError):
+        spectrogram(multi_sine_wave, [1], 0, 5, window='nope')
+    with pytest.raises(ValueError):
+        spectrogram(multi_sine_wave, [1], 0, 0.5, window_length=1)
+    with pytest.raises(ValueError):
+        spectrogram(multi_sine_wave, [0], 0, 5)
+    with pytest.raises(ValueError):
+        spectrogram(multi_sine_wave, [1], 0, 5, window_length=0.02, window='hann')
@@ -0,0 +1,31 @@
+import subprocess
+import sys
+
+import pytest
+
+from benchmarks.bench_startup import budgets, over_budget, run
+
+
+def imported_modules(module):
+    """
+    Returns: Set of the top-level packages loaded by importing module in a fresh interpreter.
+    """
+    code = "import sys, {}; print(' '.join(sorted({{name.split('.')[0] for name in sys.modules}})))".format(module)
+    return set(subprocess.check_output([sys.executable, '-c', code], text=True).split())
+
+
+@pytest.mark.parametrize('module', ['fourier.actors', 'fourier.fourier', 'fourier.batch', 'fourier.sweep'])
+def test_compute_modules_do_not_import_gui_libraries(module):
+    assert not {'matplotlib', 'tkinter', '_tkinter'} & imported_modules(module)
+
+
+def test_gui_start_does_not_import_matplotlib():
+    assert 'matplotlib' not in imported_modules('fourier.gui_start')
+    assert 'matplotlib' not in imported_modules('fourier.plot_manager')
+
+
+def test_startup_benchmark():
+    results = run(['import fourier.actors'], repeat=1)
+    assert 0 < results['import fourier.actors']
+    assert [] == over_budget({'import fourier.actors': 0.0, 'first paint': None})
+    assert ['window ready'] == over_budget({'window ready': budgets['window ready'] + 1})
@@ -0,0 +1,103 @@
+import numpy as np
+import pytest
+
+from fourier.fourier import average_point_location, get_shape
+from fourier.sweep import adaptive_sweep, frequency_range, sweep
+from tests.fixtures import multi_sine_wave
+
+
+def test_sweep_matches_get_shape(multi_sine_wave):
+    freqs = frequency_range(1, 3, 0.1)
+    _, real, imag = sweep(multi_sine_wave, freqs, 1, 3, step=0.01)
+    for fq, r, i in zip(freqs, real, imag):
+        avg_point = average_point_location(*get_shape(multi_sine_wave, fq, 1, 3, step=0.01))
+        assert np.isclose(avg_point[0], r)
+        assert np.isclose(avg_point[1], i)
+
+
+def test_sweep_small_blocks(multi_sine_wave):
+    freqs = frequency_range(1, 3, 0.1)
+    expected = sweep(multi_sine_wave, freqs, 0, 2, step=0.01)
+    blocked = sweep(multi_sine_wave, freqs, 0, 2, step=0.01, max_block_bytes=1)
+    assert np.allclose(expected[1], blocked[1])
+    assert np.allclose(expected[2], blocked[2])
+
+
+def test_sweep_error_winding_frequency(multi_sine_wave):
+    with pytest.raises(ValueError):
+        sweep(multi_sine_wave, [1, 0], 0, 1)
+
+
+def test_sweep_error_a_b(multi_sine_wave):
+    with pytest.raises(ValueError):
+        sweep(multi_sine_wave, [1], 5, 0)
+
+
+def test_sweep_error_empty_signal(multi_sine_wave):
+    del multi_sine_wave[:]
+    with pytest.raises(ValueError):
+        sweep(multi_sine_wave, [1], 0, 1)
+
+
+@pytest.mark.parametrize("start, end", [(1, 10), (0.5, 2.5)])
+def test_sweep_czt_matches_direct(multi_sine_wave, start, end):
+    freqs = frequency_range(start, end, 0.01)
+    _, real, imag = sweep(multi_sine_wave, freqs, start, end, step=0.01)
+    _, czt_real, czt_imag = sweep(multi_sine_wave, freqs, start, end, step=0.01, backend='czt')
+    assert np.allclose(real, czt_real, atol=1e-9)
+    assert np.allclose(imag, czt_imag, atol=1e-9)
+
+
+def test_sweep_czt_single_frequency(multi_sine_wave):
+    direct = sweep(multi_sine_wave, [2], 0, 1, step=0.01)
+    czt = sweep(multi_sine_wave, [2], 0, 1, step=0.01, backend='czt')
+    assert np.allclose(direct[1:], czt[1:])
+
+
+def test_sweep_czt_error_uneven_frequencies(multi_sine_wave):
+    with pytest.raises(ValueError):
+        sweep(multi_sine_wave, [1, 2, 4], 0, 1, backend='czt')
+
+
+def test_sweep_error_backend(multi_sine_wave):
+    with pytest.raises(ValueError):
+        sweep(multi_sine_wave, [1], 0, 1, backend='nope')
+
+
+def test_adaptive_sweep_values_match_direct(multi_sine_wave):
+    freqs, real, imag = adaptive_sweep(multi_sine_wave, 0.5, 4, 0, 5, step=0.01)
+    assert np.all(np.diff(freqs) > 0)
+    _, expected_real, expected_imag = sweep(multi_sine_wave, freqs, 0, 5, step=0.01)
+    assert np.allclose(real, expected_real)
+    assert np.allclose(imag, expected_imag)
+
+
+def test_adaptive_sweep_resolves_peaks(multi_sine_wave):
+    freqs, real, imag = adaptive_sweep(multi_sine_wave, 0.5, 4, 0, 5, step=0.01)
+    fine, fine_real, fine_imag = sweep(multi_sine_wave, np.linspace(0.5, 4, 3501), 0, 5, step=0.01)
+    assert len(freqs) < len(fine) / 4
+    # denser than the coarse sweep around the peaks
+    assert np.diff(freqs).min() < np.diff(freqs).max() / 2
+    peak = freqs[np.argmax(np.hypot(real, imag))]
+    assert np.isclose(peak, fine[np.argmax(np.hypot(fine_real, fine_imag))], atol=0.005)
+
+
+@pytest.mark.parametrize('max_points', [10, 50])
+def test_adaptive_sweep_max_points(multi_sine_wave, max_points):
+    freqs, _, _ = adaptive_sweep(multi_sine_wave, 0.5, 4, 0, 5, step=0.01, coarse_step=0.5,
+                                 max_points=max_points)
+    assert len(freqs) <= max_points
+
+
+def test_adaptive_sweep_max_points_caps_the_coarse_sweep(multi_sine_wave):
+    # the default coarse step 0.1 alone would give 351 frequencies
+    freqs, _, _ = adaptive_sweep(multi_sine_wave, 0.5, 35.5, 0, 5, step=0.01, max_points=100)
+    assert len(freqs) <= 100
+    assert np.isclose(0.5, freqs[0]) and np.isclose(35.5, freqs[-1])
+    with pytest.raises(ValueError):
+        adaptive_sweep(multi_sine_wave, 0.5, 4, 0, 5, max_points=2)
+
+
+def test_adaptive_sweep_error_start_end(multi_sine_wave):
+    with pytest.raises(ValueError):
+        adaptive_sweep(multi_sine_wave, 4, 1, 0, 5)
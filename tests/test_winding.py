@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+from fourier.fourier import average_point_location, get_shape
+from fourier.winding import IncrementalWinding
+from tests.fixtures import multi_sine_wave
+
+
+def test_incremental_winding_matches_get_shape(multi_sine_wave):
+    winding = IncrementalWinding(multi_sine_wave, 1, 0.01, 0, 3, step=0.01, reanchor_interval=1000)
+    for i in range(300):
+        winding.advance()
+    assert 299 == winding.index
+    expected = get_shape(multi_sine_wave, winding.frequency, 0, 3, step=0.01)
+    assert np.allclose(expected[0], winding.shape[0], atol=1e-9)
+    assert np.allclose(expected[1], winding.shape[1], atol=1e-9)
+
+
+def test_incremental_winding_centroid(multi_sine_wave):
+    winding = IncrementalWinding(multi_sine_wave, 1, 0.01, 0, 3, step=0.01)
+    winding.frame(0)
+    winding.frame(1)
+    assert np.allclose(average_point_location(*get_shape(multi_sine_wave, 1.01, 0, 3, step=0.01)),
+                       winding.centroid)
+
+
+def test_incremental_winding_reanchor(multi_sine_wave):
+    winding = IncrementalWinding(multi_sine_wave, 1, 0.01, 0, 3, step=0.01, reanchor_interval=4)
+    for i in range(5):
+        winding.frame(i)
+    expected = get_shape(multi_sine_wave, winding.frequency, 0, 3, step=0.01)
+    assert np.array_equal(expected[0], winding.shape[0])
+
+
+def test_incremental_winding_seek(multi_sine_wave):
+    winding = IncrementalWinding(multi_sine_wave, 1, 0.01, 0, 3, step=0.01)
+    winding.frame(50)
+    assert 50 == winding.index
+    assert np.isclose(1.5, winding.frequency)
+
+
+def test_incremental_winding_errors(multi_sine_wave):
+    with pytest.raises(ValueError):
+        IncrementalWinding(multi_sine_wave, 1, 0.01, 3, 0)
+    with pytest.raises(ValueError):
+        IncrementalWinding(multi_sine_wave, 1, 0.01, 0, 3, reanchor_interval=0)
+    with pytest.raises(ValueError):
+        IncrementalWinding(multi_sine_wave, 1, -1, 0, 3).frame(1)